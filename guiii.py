@@ -1,9 +1,11 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-import test
+from scheduler import Problem, solve
+from scheduler.gantt import GanttRenderer
 
 # Modern color palette
 COLORS = {
@@ -86,6 +88,8 @@ class WelcomePage:
         ttk.Label(card, text='Optimize your workflow', style='Subtitle.TLabel').pack(pady=(0, 30))
         ModernButton(card, text='Backtracking', command=lambda: self.switch_callback('Backtracking')).pack(fill='x', pady=8)
         ModernButton(card, text='Genetic Algorithm', command=lambda: self.switch_callback('Genetic')).pack(fill='x', pady=8)
+        ModernButton(card, text='Local Search', command=lambda: self.switch_callback('Local Search')).pack(fill='x', pady=8)
+        ModernButton(card, text='Auto', command=lambda: self.switch_callback('Auto')).pack(fill='x', pady=8)
         ttk.Label(card, text='by Your Name', style='Subtitle.TLabel', font=('Segoe UI', 10), foreground=COLORS['accent']).pack(pady=(30,0))
 
 class SchedulerPage:
@@ -109,7 +113,7 @@ class SchedulerPage:
         header = ttk.Frame(self.root, style='Card.TFrame', padding=(30, 20))
         header.pack(fill='x', pady=(0, 10))
         ttk.Label(header, text='Configure Your Job Scheduling Problem', style='Title.TLabel').pack(side='left')
-        ModernButton(header, text='Back', command=self.back_callback, style='Modern.TButton').pack(side='right')
+        ModernButton(header, text='Back', command=self.go_back, style='Modern.TButton').pack(side='right')
         # Main content (now scrollable)
         scrollable = ScrollableFrame(self.root)
         scrollable.pack(fill='both', expand=True)
@@ -142,6 +146,10 @@ class SchedulerPage:
         # Auto-assign option
         self.auto_split = tk.BooleanVar(value=True)
         ttk.Checkbutton(input_card, text="Auto-assign jobs to machines", variable=self.auto_split, style='Modern.TCheckbutton').grid(row=5, column=0, columnspan=2, sticky="w", pady=4)
+        # Optional wall-clock budget; the best schedule found so far is shown when it runs out
+        ttk.Label(input_card, text='Time Limit (seconds, optional):', style='Subtitle.TLabel').grid(row=6, column=0, sticky='w', pady=4)
+        self.time_limit = ttk.Entry(input_card, width=10, style='Modern.TEntry')
+        self.time_limit.grid(row=6, column=1, pady=4, sticky='ew')
         # Constraints section
         constraints_card = ttk.Labelframe(content, text='Constraints', style='Section.TLabelframe', padding=20)
         constraints_card.grid(row=1, column=0, sticky='ew', padx=10, pady=10)
@@ -154,8 +162,13 @@ class SchedulerPage:
         ttk.Label(constraints_card, text='Temporal Constraints (job time per line):', style='Subtitle.TLabel').pack(anchor='w', pady=(8,2))
         self.temporal = scrolledtext.ScrolledText(constraints_card, width=30, height=2, font=FONT)
         self.temporal.pack(fill='x', pady=2)
-        # Solve button
-        ModernButton(content, text='Solve', command=self.solve, style='Modern.TButton').grid(row=2, column=0, pady=20, sticky='ew')
+        # Solve / Stop buttons
+        buttons = ttk.Frame(content, style='Card.TFrame')
+        buttons.grid(row=2, column=0, pady=20, sticky='ew')
+        buttons.grid_columnconfigure(0, weight=1)
+        buttons.grid_columnconfigure(1, weight=1)
+        ModernButton(buttons, text='Solve', command=self.solve, style='Modern.TButton').grid(row=0, column=0, padx=(0, 5), sticky='ew')
+        ModernButton(buttons, text='Stop', command=self.stop, style='Modern.TButton').grid(row=0, column=1, padx=(5, 0), sticky='ew')
         # Results area
         self.result_card = ttk.Labelframe(content, text='Schedule', style='Section.TLabelframe', padding=20)
         self.result_card.grid(row=3, column=0, sticky='ew', padx=10, pady=10)
@@ -164,9 +177,15 @@ class SchedulerPage:
         self.fig, self.ax = plt.subplots(figsize=(10, 3))
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.result_card)
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        # The figure is reused between solves; streamed improvements are drawn at most 4x a second
+        self.gantt = GanttRenderer(self.ax, palette={'text': COLORS['text'], 'title': COLORS['primary'], 'grid': COLORS['accent']})
         # Configure grid weights
         content.grid_rowconfigure(3, weight=1)
         content.grid_columnconfigure(0, weight=1)
+        # The solver runs on a worker thread and reports back through this queue
+        self.worker = None
+        self.cancel_event = None
+        self.updates = queue.Queue()
     def parse_constraints(self, text, convert_to_zero_based=True):
         constraints = []
         for line in text.split('\n'):
@@ -193,6 +212,8 @@ class SchedulerPage:
                     continue
         return constraints
     def solve(self):
+        if self.worker is not None and self.worker.is_alive():
+            return
         try:
             job_durations = [int(x.strip()) for x in self.job_durations.get().split(',')]
             machine_capacities = [int(x.strip()) for x in self.machine_caps.get().split(',')]
@@ -202,77 +223,74 @@ class SchedulerPage:
                 raise ValueError("Number of job durations doesn't match number of jobs")
             if len(machine_capacities) != num_machines:
                 raise ValueError("Number of machine capacities doesn't match number of machines")
+            time_limit = float(self.time_limit.get()) if self.time_limit.get().strip() else None
             # Parse constraints
             precedence_constraints = self.parse_constraints(self.precedence.get("1.0", tk.END))
             resource_constraints = self.parse_constraints(self.resources.get("1.0", tk.END))
             temporal_constraints = self.parse_temporal_constraints(self.temporal.get("1.0", tk.END))
+            problem = Problem(job_durations, num_machines, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, self.auto_split.get())
+        except Exception as e:
+            self.show_error(str(e))
+            return
+        self.cancel_event = threading.Event()
+        self.updates = queue.Queue()
+        self.result_label.config(text="Solving...", foreground=COLORS['primary'])
+        self.worker = threading.Thread(target=self.run_solver, args=(problem, time_limit, self.cancel_event, self.updates), daemon=True)
+        self.worker.start()
+        self.root.after(100, self.poll_updates)
+    def run_solver(self, problem, time_limit, cancel_event, updates):
+        # Runs off the Tk thread: only talks to the UI through the queue
+        def on_improvement(schedule, makespan, elapsed, count):
+            updates.put(('improved', schedule, makespan, elapsed))
+        try:
             # Call appropriate algorithm
-            if self.algorithm == "Backtracking":
-                schedule, makespan = test.backtracking(
-                    job_durations, num_machines, precedence_constraints,
-                    resource_constraints, machine_capacities, self.auto_split.get(), temporal_constraints
-                )
-            else:
-                schedule, makespan = test.genetic_algorithm(
-                    job_durations, num_machines, precedence_constraints,
-                    resource_constraints, machine_capacities, self.auto_split.get(), temporal_constraints
-                )
-            if schedule:
-                self.plot_schedule(schedule, makespan)
-                self.result_label.config(text=f"Makespan: {makespan}", foreground=COLORS['success'])
-            else:
-                self.result_label.config(text="No valid schedule found", foreground=COLORS['error'])
-                self.ax.clear()
-                self.canvas.draw()
+            # Auto picks the method from the instance's features
+            method = {'Backtracking': 'backtracking', 'Local Search': 'tabu_search', 'Auto': 'auto'}.get(self.algorithm, 'genetic')
+            schedule, makespan = solve(problem, method, {'time_limit': time_limit, 'cancel': cancel_event, 'callback': on_improvement})
+            updates.put(('done', schedule, makespan, None))
         except Exception as e:
-            self.result_label.config(text=str(e), foreground=COLORS['error'])
-            self.ax.clear()
-            self.canvas.draw()
+            updates.put(('error', str(e), None, None))
+    def poll_updates(self):
+        if not self.result_label.winfo_exists():
+            return
+        latest = None
+        try:
+            while True:
+                latest = self.updates.get_nowait()
+                if latest[0] != 'improved':
+                    break
+        except queue.Empty:
+            pass
+        # Only the newest improvement of each batch is drawn
+        if latest is not None:
+            kind, first, makespan, elapsed = latest
+            if kind == 'improved':
+                self.gantt.update(first, makespan)
+                self.result_label.config(text=f"Best so far: {makespan} ({elapsed:.1f}s)", foreground=COLORS['primary'])
+            elif kind == 'done':
+                if first:
+                    self.plot_schedule(first, makespan)
+                    stopped = " (stopped early)" if self.cancel_event.is_set() else ""
+                    self.result_label.config(text=f"Makespan: {makespan}{stopped}", foreground=COLORS['success'])
+                else:
+                    self.show_error("No valid schedule found")
+                return
+            else:
+                self.show_error(first)
+                return
+        self.gantt.flush()
+        self.root.after(100, self.poll_updates)
+    def stop(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+    def go_back(self):
+        self.stop()
+        self.back_callback()
+    def show_error(self, message):
+        self.result_label.config(text=message, foreground=COLORS['error'])
+        self.gantt.clear()
     def plot_schedule(self, schedule, makespan):
-        self.ax.clear()
-        colors = plt.cm.Set3(np.linspace(0, 1, len(schedule)))
-        # --- New logic to stack overlapping jobs ---
-        # Get machine list
-        machines = set(machine for _, (_, _, machine) in schedule.items())
-        # Build time slots for each machine
-        time_slots = {}
-        for job, (start, end, machine) in schedule.items():
-            for t in range(start, end):
-                if (machine, t) not in time_slots:
-                    time_slots[(machine, t)] = []
-                time_slots[(machine, t)].append(job)
-        # Assign slot positions to jobs
-        job_positions = {}
-        for job, (start, end, machine) in schedule.items():
-            concurrent = set()
-            for t in range(start, end):
-                concurrent.update(time_slots.get((machine, t), []))
-            used = {job_positions.get(j, -1) for j in concurrent if j in job_positions}
-            pos = 0
-            while pos in used:
-                pos += 1
-            job_positions[job] = pos
-        # Plot each job in its slot
-        yticks = []
-        yticklabels = []
-        for job, (start, end, machine) in schedule.items():
-            position = job_positions[job]
-            y_pos = f"Machine {machine+1} (Slot {position+1})"
-            self.ax.barh(y=y_pos, width=end-start, left=start, color=colors[job], label=f"Job {job+1}")
-            if y_pos not in yticklabels:
-                yticks.append(y_pos)
-                yticklabels.append(y_pos)
-        self.ax.set_xlabel('Time', color=COLORS['text'])
-        self.ax.set_title(f'Job Schedule', color=COLORS['primary'])
-        self.ax.grid(True, color=COLORS['accent'], linestyle='--', alpha=0.3)
-        # Remove duplicate legend entries
-        handles, labels = self.ax.get_legend_handles_labels()
-        by_label = dict(zip(labels, handles))
-        self.ax.legend(by_label.values(), by_label.keys(), bbox_to_anchor=(1.02, 1), loc='upper left', borderaxespad=0)
-        self.ax.invert_yaxis()
-        self.fig.tight_layout()
-        self.fig.subplots_adjust(right=0.85)
-        self.canvas.draw()
+        self.gantt.draw(schedule, makespan)
 
 class App:
     def __init__(self, root):
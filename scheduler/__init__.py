@@ -0,0 +1,53 @@
+# Job scheduling solvers. Importing the package never prompts, plots or loads numpy;
+# the interactive program lives in scheduler.cli (run it with `python -m scheduler`)
+from .api import METHODS, result_to_dict, solve, solver_function
+from .budget import SolveBudget
+from .cache import SolutionCache, canonical_form, fingerprint
+from .decomposition import PARTITIONS, RollingHorizon, rolling_horizon
+from .dispatching import DISPATCHING_RULES, best_dispatch, dispatch_all, dispatch_order, dispatching, rule_features
+from .genetic import crossover, fitness, generate_random_schedule, genetic_algorithm, mutate
+from .instance import MappedProblem, convert, load_binary, load_problem, load_text, save_binary, save_problem, save_text
+from .instrumentation import SolverStats, profile
+from .local_search import VARIANTS, LocalSearch, local_search, simulated_annealing, tabu_search
+from .islands import island_genetic_algorithm
+from .ordering import BRANCHING_ORDERS, branching_order, job_tails, topological_order
+from .parallel import parallel_branch_and_bound
+from .propagation import Domains, propagate
+from .portfolio import (DEFAULT_POLICY, FEATURES, auto, calibrate, dynamic_programming, instance_features, load_policy, race,
+                        save_policy, select_method)
+from .permutation import (CROSSOVERS, MUTATIONS, SCHEDULE_TYPES, PermutationDecoder, insert_mutation, order_crossover,
+                          permutation_genetic_algorithm, pmx_crossover, swap_mutation)
+from .problem import InfeasibleError, Problem
+from .repair import AddPrecedence, ChangeDuration, IncrementalScheduler, MachineOutage, NewJob, Release, RemoveJob, repair
+from .schedule import Schedule
+from .search import BranchAndBound, backtracking, branch_and_bound
+from .state import ScheduleState, is_valid
+from .transposition import TABLE_POLICIES, TranspositionTable
+
+__all__ = [
+    'METHODS', 'solve', 'solver_function', 'result_to_dict', 'Problem', 'InfeasibleError', 'Domains', 'propagate', 'SolveBudget', 'SolverStats', 'profile',
+    'Schedule', 'ScheduleState', 'is_valid', 'BRANCHING_ORDERS', 'branching_order', 'job_tails', 'topological_order',
+    'backtracking', 'BranchAndBound', 'branch_and_bound', 'parallel_branch_and_bound', 'TranspositionTable', 'TABLE_POLICIES',
+    'generate_random_schedule', 'fitness', 'crossover', 'mutate', 'genetic_algorithm',
+    'SCHEDULE_TYPES', 'PermutationDecoder', 'order_crossover', 'pmx_crossover', 'swap_mutation', 'insert_mutation',
+    'CROSSOVERS', 'MUTATIONS', 'permutation_genetic_algorithm', 'island_genetic_algorithm',
+    'LocalSearch', 'VARIANTS', 'local_search', 'tabu_search', 'simulated_annealing',
+    'SolutionCache', 'canonical_form', 'fingerprint',
+    'DISPATCHING_RULES', 'rule_features', 'dispatch_order', 'dispatch_all', 'best_dispatch', 'dispatching',
+    'PARTITIONS', 'RollingHorizon', 'rolling_horizon',
+    'FEATURES', 'instance_features', 'dynamic_programming', 'DEFAULT_POLICY', 'select_method', 'calibrate', 'save_policy', 'load_policy',
+    'race', 'auto',
+    'MappedProblem', 'load_binary', 'save_binary', 'load_text', 'save_text', 'load_problem', 'save_problem', 'convert',
+    'IncrementalScheduler', 'repair', 'NewJob', 'ChangeDuration', 'AddPrecedence', 'MachineOutage', 'Release', 'RemoveJob',
+]
+
+def __getattr__(name):
+    # The numpy-backed solver is loaded on first access
+    if name in ('vectorized_genetic_algorithm', 'decode_population'):
+        from . import vectorized
+        return getattr(vectorized, name)
+    # Gantt rendering needs matplotlib
+    if name in ('GanttRenderer', 'assign_slots'):
+        from . import gantt
+        return getattr(gantt, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,59 @@
+import inspect
+from importlib import import_module
+
+from .problem import Problem
+
+# ----------------------------
+# Solver Registry
+# ----------------------------
+
+# Method name -> (module, function); modules are imported on first use so that importing
+# the package stays cheap and numpy is only loaded for the vectorized solver
+METHODS = {
+    'backtracking': ('search', 'backtracking'),
+    'branch_and_bound': ('search', 'branch_and_bound'),
+    'parallel_branch_and_bound': ('parallel', 'parallel_branch_and_bound'),
+    'genetic': ('genetic', 'genetic_algorithm'),
+    'permutation_genetic': ('permutation', 'permutation_genetic_algorithm'),
+    'island_genetic': ('islands', 'island_genetic_algorithm'),
+    'vectorized_genetic': ('vectorized', 'vectorized_genetic_algorithm'),
+    'tabu_search': ('local_search', 'tabu_search'),
+    'simulated_annealing': ('local_search', 'simulated_annealing'),
+    'dispatching': ('dispatching', 'dispatching'),
+    'rolling_horizon': ('decomposition', 'rolling_horizon'),
+    'dynamic_programming': ('portfolio', 'dynamic_programming'),
+    'auto': ('portfolio', 'auto'),
+    'race': ('portfolio', 'race'),
+}
+
+def solver_function(method):
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose one of: {', '.join(METHODS)}")
+    module, name = METHODS[method]
+    return getattr(import_module(f'.{module}', __package__), name)
+
+# Options a caller sets for a whole run (CLI flags, the batch service), whatever the method:
+# they are dropped for methods that do not take them. Any other unknown option is an error
+RUN_OPTIONS = ('time_limit', 'seed', 'cancel', 'callback', 'stats')
+
+def method_options(function, options):
+    accepted = inspect.signature(function).parameters
+    return {name: value for name, value in (options or {}).items() if name in accepted or name not in RUN_OPTIONS}
+
+def solve(problem, method='branch_and_bound', options=None):
+    # Pure entry point: no prompts, no globals. options are the solver's keyword arguments
+    # (time_limit, seed, stats, ...); RUN_OPTIONS the method does not take are ignored. problem
+    # is a Problem, a MappedProblem or a Problem.to_dict() dict. Returns (schedule, makespan);
+    # schedule is None if none was found
+    if not hasattr(problem, 'args'):
+        problem = Problem.from_dict(problem)
+    function = solver_function(method)
+    result = function(*problem.args(), **method_options(function, options))
+    return result[0], result[1]
+
+def result_to_dict(schedule, makespan):
+    # JSON-friendly form of a solver result; job keys become strings
+    return {
+        'makespan': makespan if schedule else None,
+        'schedule': {str(job): list(entry) for job, entry in sorted(schedule.items())} if schedule else None,
+    }
@@ -0,0 +1,351 @@
+import argparse
+import csv
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from .api import solve
+from .instrumentation import SolverStats
+from .portfolio import DP_MAX_JOBS, calibrate, instance_features, save_policy
+from .problem import Problem
+
+# ----------------------------
+# Instance Loading
+# ----------------------------
+
+# Best known makespans of classic OR-Library job-shop instances
+BEST_KNOWN = {
+    'ft06': 55, 'ft10': 930, 'ft20': 1165,
+    'la01': 666, 'la02': 655, 'la03': 597, 'la04': 590, 'la05': 593,
+}
+
+def jobshop_to_problem(jobs, num_machines):
+    # Every operation becomes a job: it may only run on its own machine and must follow
+    # the previous operation of the same job-shop job
+    job_durations = []
+    precedence_constraints = []
+    resource_constraints = []
+    for operations in jobs:
+        previous = None
+        for machine, duration in operations:
+            job = len(job_durations)
+            job_durations.append(duration)
+            resource_constraints.extend((job, r) for r in range(num_machines) if r != machine)
+            if previous is not None:
+                precedence_constraints.append((previous, job))
+            previous = job
+    return job_durations, num_machines, precedence_constraints, resource_constraints, [1] * num_machines, {}
+
+def parse_orlib(text):
+    # OR-Library job-shop format: "n m", then one line per job of (machine, time) pairs with
+    # 0-based machines. Files holding several instances name each one with "instance <name>"
+    instances = []
+    name = None
+    lines = iter(text.splitlines())
+    for line in lines:
+        words = line.split()
+        if len(words) == 2 and words[0] == 'instance':
+            name = words[1]
+            continue
+        if len(words) != 2 or not all(word.isdigit() for word in words):
+            continue
+        num_jobs, num_machines = int(words[0]), int(words[1])
+        jobs = []
+        while len(jobs) < num_jobs:
+            values = [int(value) for value in next(lines).split()]
+            if values:
+                jobs.append(list(zip(values[0::2], values[1::2])))
+        name = name or f"orlib{len(instances) + 1}"
+        instances.append({'name': name, 'problem': jobshop_to_problem(jobs, num_machines), 'best_known': BEST_KNOWN.get(name)})
+        name = None
+    return instances
+
+def parse_taillard(text, name='taillard'):
+    # Taillard format: a header line with job and machine counts (and optionally the upper
+    # bound), a "Times" matrix and a "Machines" matrix with 1-based machines
+    best_known = None
+    rows = []
+    header = None
+    for line in text.splitlines():
+        words = line.replace(',', ' ').split()
+        if not words:
+            continue
+        if not all(word.lstrip('-').isdigit() for word in words):
+            continue
+        values = [int(word) for word in words]
+        if header is None:
+            header = values
+            if len(values) >= 5:
+                best_known = values[4]
+            continue
+        rows.append(values)
+    num_jobs, num_machines = header[0], header[1]
+    times = rows[:num_jobs]
+    machines = rows[num_jobs:2 * num_jobs]
+    jobs = [[(machine - 1, duration) for machine, duration in zip(machines[j], times[j])] for j in range(num_jobs)]
+    return {'name': name, 'problem': jobshop_to_problem(jobs, num_machines), 'best_known': best_known}
+
+def generate_instance(num_jobs, num_machines, precedence_density=0.1, capacity=1, forbidden_density=0.0, release_density=0.0, max_duration=10, seed=None):
+    rng = random.Random(seed)
+    job_durations = [rng.randint(1, max_duration) for _ in range(num_jobs)]
+    # Edges only go from lower to higher job index, so the precedence graph stays acyclic
+    precedence_constraints = [(a, b) for a in range(num_jobs) for b in range(a + 1, num_jobs) if rng.random() < precedence_density]
+    resource_constraints = []
+    for job in range(num_jobs):
+        keep = rng.randrange(num_machines)
+        resource_constraints.extend((job, r) for r in range(num_machines) if r != keep and rng.random() < forbidden_density)
+    temporal_constraints = {job: rng.randint(0, max_duration * 2) for job in range(num_jobs) if rng.random() < release_density}
+    problem = (job_durations, num_machines, precedence_constraints, resource_constraints, [capacity] * num_machines, temporal_constraints)
+    name = f"synthetic-{num_jobs}x{num_machines}-p{precedence_density}-c{capacity}-s{seed}"
+    return {'name': name, 'problem': problem, 'best_known': None}
+
+# ----------------------------
+# Solvers Under Test
+# ----------------------------
+
+def run_branch_and_bound(problem, seed, time_limit):
+    stats = SolverStats()
+    schedule, makespan = solve(Problem.from_tuple(problem), 'branch_and_bound', {'time_limit': time_limit, 'stats': stats})
+    return schedule, makespan, stats
+
+def run_backtracking(problem, seed, time_limit):
+    stats = SolverStats()
+    schedule, makespan = solve(Problem.from_tuple(problem), 'backtracking', {'time_limit': time_limit, 'stats': stats})
+    return schedule, makespan, stats
+
+def run_genetic(problem, seed, time_limit):
+    random.seed(seed)
+    stats = SolverStats()
+    schedule, makespan = solve(Problem.from_tuple(problem), 'genetic', {'time_limit': time_limit, 'stats': stats})
+    return schedule, makespan, stats
+
+def run_permutation_genetic(problem, seed, time_limit):
+    stats = SolverStats()
+    options = {'population_size': 50, 'generations': 100, 'seed': seed, 'time_limit': time_limit, 'stats': stats}
+    schedule, makespan = solve(Problem.from_tuple(problem), 'permutation_genetic', options)
+    return schedule, makespan, stats
+
+def run_tabu_search(problem, seed, time_limit):
+    stats = SolverStats()
+    schedule, makespan = solve(Problem.from_tuple(problem), 'tabu_search', {'time_limit': time_limit, 'seed': seed, 'stats': stats})
+    return schedule, makespan, stats
+
+def run_dispatching(problem, seed, time_limit):
+    stats = SolverStats()
+    schedule, makespan = solve(Problem.from_tuple(problem), 'dispatching', {'stats': stats})
+    return schedule, makespan, stats
+
+def run_dynamic_programming(problem, seed, time_limit):
+    # Reported as no schedule on instances beyond its size limit, so it can run on every size
+    stats = SolverStats()
+    if len(problem[0]) > DP_MAX_JOBS:
+        return None, None, stats
+    schedule, makespan = solve(Problem.from_tuple(problem), 'dynamic_programming', {'time_limit': time_limit, 'stats': stats})
+    return schedule, makespan, stats
+
+def run_rolling_horizon(problem, seed, time_limit):
+    stats = SolverStats()
+    schedule, makespan = solve(Problem.from_tuple(problem), 'rolling_horizon', {'time_limit': time_limit, 'stats': stats})
+    return schedule, makespan, stats
+
+def run_auto(problem, seed, time_limit):
+    stats = SolverStats()
+    schedule, makespan = solve(Problem.from_tuple(problem), 'auto', {'time_limit': time_limit, 'seed': seed, 'stats': stats})
+    return schedule, makespan, stats
+
+SOLVERS = {
+    'branch_and_bound': run_branch_and_bound,
+    'backtracking': run_backtracking,
+    'genetic': run_genetic,
+    'permutation_genetic': run_permutation_genetic,
+    'tabu_search': run_tabu_search,
+    'dispatching': run_dispatching,
+    'dynamic_programming': run_dynamic_programming,
+    'rolling_horizon': run_rolling_horizon,
+    'auto': run_auto,
+}
+
+# ----------------------------
+# Runner
+# ----------------------------
+
+def run_once(solver, problem, seed, time_limit, measure_memory):
+    started = time.perf_counter()
+    schedule, makespan, stats = solver(problem, seed, time_limit)
+    wall_time = time.perf_counter() - started
+    # Tree searches report nodes, the genetic solvers report fitness evaluations
+    count = stats.counters['nodes'] or stats.counters['evaluations'] or None
+    peak_memory = None
+    if measure_memory:
+        # Separate traced run so tracing overhead does not distort the timing
+        tracemalloc.start()
+        solver(problem, seed, time_limit)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return schedule, makespan, count, wall_time, peak_memory, stats
+
+def run_benchmark(instances, solver_names, seeds=1, time_limit=None, measure_memory=True, keep_stats=False):
+    # Every row carries the instance features, so the results can calibrate the auto policy
+    results = []
+    for instance in instances:
+        features = instance_features(*instance['problem'])
+        for name in solver_names:
+            for seed in range(seeds):
+                schedule, makespan, count, wall_time, peak_memory, stats = run_once(SOLVERS[name], instance['problem'], seed, time_limit, measure_memory)
+                best_known = instance['best_known']
+                feasible = schedule is not None
+                results.append({
+                    'instance': instance['name'],
+                    'solver': name,
+                    'seed': seed,
+                    'makespan': makespan if feasible else None,
+                    'best_known': best_known,
+                    'gap': (makespan - best_known) / best_known if feasible and best_known else None,
+                    'wall_time': wall_time,
+                    'count': count,
+                    'per_second': count / wall_time if count is not None and wall_time > 0 else None,
+                    'peak_memory_kb': peak_memory // 1024 if peak_memory is not None else None,
+                    'stats': stats.to_dict() if keep_stats else None,
+                    'features': features,
+                })
+                print(f"{instance['name']:<40} {name:<20} seed {seed}: makespan {results[-1]['makespan']} in {wall_time:.3f}s", file=sys.stderr)
+    return results
+
+def save_results(results, path):
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()) if results else [])
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+def load_results(path):
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for key in ('makespan', 'wall_time'):
+                row[key] = float(row[key]) if row[key] not in ('', 'None') else None
+        return rows
+    with open(path) as f:
+        return json.load(f)
+
+# ----------------------------
+# Regression Comparison
+# ----------------------------
+
+def summarize(results):
+    groups = {}
+    for row in results:
+        groups.setdefault((row['instance'], row['solver']), []).append(row)
+    summary = {}
+    for key, rows in groups.items():
+        makespans = [row['makespan'] for row in rows if row['makespan'] is not None]
+        summary[key] = {
+            'wall_time': statistics.median(row['wall_time'] for row in rows),
+            'makespan': statistics.median(makespans) if makespans else None,
+        }
+    return summary
+
+def compare(baseline, current, time_tolerance=0.10):
+    # Flags a slower median wall time (beyond the tolerance) or a worse median makespan
+    before = summarize(baseline)
+    after = summarize(current)
+    rows = []
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        slower = new['wall_time'] > old['wall_time'] * (1 + time_tolerance)
+        worse = old['makespan'] is not None and (new['makespan'] is None or new['makespan'] > old['makespan'])
+        rows.append({
+            'instance': key[0],
+            'solver': key[1],
+            'wall_time_before': old['wall_time'],
+            'wall_time_after': new['wall_time'],
+            'makespan_before': old['makespan'],
+            'makespan_after': new['makespan'],
+            'regression': slower or worse,
+        })
+    return rows
+
+# ----------------------------
+# Command Line
+# ----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the job scheduling solvers")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run solvers over instances and save the results")
+    run.add_argument('--orlib', action='append', default=[], help="OR-Library job-shop file (may hold several instances)")
+    run.add_argument('--taillard', action='append', default=[], help="Taillard instance file")
+    run.add_argument('--synthetic', action='append', default=[], metavar='JOBSxMACHINES', help="synthetic instance size, e.g. 20x3")
+    run.add_argument('--precedence-density', type=float, default=0.1)
+    run.add_argument('--capacity', type=int, default=1)
+    run.add_argument('--instance-seed', type=int, default=0, help="seed of the synthetic instance generator")
+    run.add_argument('--solvers', default='branch_and_bound,genetic', help=f"comma-separated, from: {', '.join(SOLVERS)}")
+    run.add_argument('--seeds', type=int, default=3)
+    run.add_argument('--time-limit', type=float, default=10.0)
+    run.add_argument('--no-memory', action='store_true', help="skip the traced run that measures peak memory")
+    run.add_argument('--output', default='benchmark_results.json', help="results file (.json or .csv)")
+    run.add_argument('--stats', action='store_true', help="keep the full solver counters and timers in every JSON row")
+
+    comparison = commands.add_parser('compare', help="flag regressions between two result files")
+    comparison.add_argument('baseline')
+    comparison.add_argument('current')
+    comparison.add_argument('--tolerance', type=float, default=0.10, help="allowed relative slowdown")
+
+    calibration = commands.add_parser('calibrate', help="fit the auto method's selection policy to JSON results of run")
+    calibration.add_argument('results', nargs='+')
+    calibration.add_argument('--tolerance', type=float, default=0.02, help="relative makespan gap to the best run that still counts as adequate")
+    calibration.add_argument('--output', default='policy.json', help="policy file for solve(..., 'auto', {'policy': path})")
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        instances = []
+        for path in args.orlib:
+            with open(path) as f:
+                instances.extend(parse_orlib(f.read()))
+        for path in args.taillard:
+            with open(path) as f:
+                instances.append(parse_taillard(f.read(), name=path))
+        for size in args.synthetic:
+            num_jobs, num_machines = (int(value) for value in size.lower().split('x'))
+            instances.append(generate_instance(num_jobs, num_machines, args.precedence_density, args.capacity, seed=args.instance_seed))
+        solver_names = args.solvers.split(',')
+        for name in solver_names:
+            if name not in SOLVERS:
+                parser.error(f"unknown solver '{name}'")
+        results = run_benchmark(instances, solver_names, args.seeds, args.time_limit, not args.no_memory, args.stats)
+        save_results(results, args.output)
+        print(f"Saved {len(results)} runs to {args.output}")
+        return 0
+
+    if args.command == 'calibrate':
+        results = []
+        for path in args.results:
+            results.extend(load_results(path))
+        try:
+            policy = calibrate(results, tolerance=args.tolerance)
+        except ValueError as e:
+            print(f"Cannot calibrate: {e}", file=sys.stderr)
+            return 1
+        save_policy(policy, args.output)
+        for rule in policy:
+            print(rule)
+        print(f"Saved the policy to {args.output}")
+        return 0
+
+    rows = compare(load_results(args.baseline), load_results(args.current), args.tolerance)
+    for row in rows:
+        flag = "REGRESSION" if row['regression'] else "ok"
+        print(f"{row['instance']:<40} {row['solver']:<20} time {row['wall_time_before']:.3f}s -> {row['wall_time_after']:.3f}s  "
+              f"makespan {row['makespan_before']} -> {row['makespan_after']}  {flag}")
+    return 1 if any(row['regression'] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
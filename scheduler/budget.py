@@ -0,0 +1,33 @@
+import time
+
+# ----------------------------
+# Solve Budget (anytime solving)
+# ----------------------------
+
+class SolveBudget:
+    # Wall-clock limit, node / generation limit and cancellation (any object with is_set(),
+    # e.g. threading.Event) shared by the solvers. callback(schedule, makespan, elapsed, count)
+    # receives every improved incumbent while the solver is still running
+    def __init__(self, time_limit=None, limit=None, cancel=None, callback=None):
+        self.time_limit = time_limit
+        self.limit = limit
+        self.cancel = cancel
+        self.callback = callback
+        self.started = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def interrupted(self):
+        if self.cancel is not None and self.cancel.is_set():
+            return True
+        return self.time_limit is not None and self.elapsed() > self.time_limit
+
+    def exhausted(self, count, check_clock=True):
+        if self.limit is not None and count >= self.limit:
+            return True
+        return check_clock and self.interrupted()
+
+    def improved(self, schedule, makespan, count):
+        if self.callback is not None:
+            self.callback(dict(schedule), makespan, self.elapsed(), count)
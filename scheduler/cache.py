@@ -0,0 +1,210 @@
+import hashlib
+import inspect
+import json
+import sqlite3
+import time
+
+from .api import method_options, solver_function
+from .ordering import topological_order
+from .permutation import PermutationDecoder
+from .problem import Problem
+
+# ----------------------------
+# Canonical Fingerprint
+# ----------------------------
+
+def rank(keys):
+    # Dense ranks of sortable keys: equal keys get equal ranks, independent of the job numbering
+    index = {key: position for position, key in enumerate(sorted(set(keys)))}
+    return [index[key] for key in keys]
+
+def refine(colors, predecessors, successors):
+    # Weisfeiler-Lehman refinement: a job's next color is its color plus the multisets of its
+    # predecessors' and successors' colors. Classes only ever split, so it stops as soon as a
+    # round splits none
+    while True:
+        refined = rank([(colors[job], tuple(sorted(colors[before] for before in predecessors[job])),
+                         tuple(sorted(colors[after] for after in successors[job]))) for job in range(len(colors))])
+        if max(refined, default=0) == max(colors, default=0):
+            return refined
+        colors = refined
+
+def canonical_order(features, predecessors, successors, max_splits=64):
+    # Jobs in canonical order. While constrained jobs still share a color, the lowest numbered job
+    # of the first such class gets a color of its own and refinement runs again. Unconstrained
+    # jobs with equal colors are interchangeable, so their order does not matter. Ties left after
+    # max_splits fall back to job numbers: that can cost a cache hit, never give a wrong one
+    colors = refine(rank(features), predecessors, successors)
+    for _ in range(max_splits):
+        classes = {}
+        for job, color in enumerate(colors):
+            if predecessors[job] or successors[job]:
+                classes.setdefault(color, []).append(job)
+        tied = [jobs for color, jobs in sorted(classes.items()) if len(jobs) > 1]
+        if not tied:
+            break
+        chosen = tied[0][0]
+        colors = refine(rank([(color, job == chosen) for job, color in enumerate(colors)]), predecessors, successors)
+    return sorted(range(len(colors)), key=lambda job: (colors[job], job))
+
+def canonical_form(problem, shape=False):
+    # (order, form): order[i] is the job at canonical position i and form is the problem
+    # relabeled that way, with every constraint list sorted. shape=True leaves out durations and
+    # release times, so problems that only differ in those share a shape
+    num_jobs = problem.num_jobs
+    predecessors = [[] for _ in range(num_jobs)]
+    successors = [[] for _ in range(num_jobs)]
+    for before, after in problem.precedence_constraints:
+        predecessors[after].append(before)
+        successors[before].append(after)
+    forbidden = [[] for _ in range(num_jobs)]
+    for job, resource in problem.resource_constraints:
+        forbidden[job].append(resource)
+    # Depth and height in the precedence DAG tell chain positions apart without refinement rounds
+    order = topological_order(num_jobs, problem.precedence_constraints)
+    depth = [0] * num_jobs
+    height = [0] * num_jobs
+    for job in order:
+        depth[job] = max([depth[before] + 1 for before in predecessors[job]], default=0)
+    for job in reversed(order):
+        height[job] = max([height[after] + 1 for after in successors[job]], default=0)
+    releases = problem.temporal_constraints
+    features = [(tuple(sorted(set(forbidden[job]))), depth[job], height[job], len(predecessors[job]), len(successors[job]))
+                + (() if shape else (problem.job_durations[job], releases.get(job, 0)))
+                for job in range(num_jobs)]
+    order = canonical_order(features, predecessors, successors)
+    position = [0] * num_jobs
+    for index, job in enumerate(order):
+        position[job] = index
+    form = {
+        'num_jobs': num_jobs,
+        'num_resources': problem.num_resources,
+        'machine_capacities': problem.machine_capacities,
+        'precedence_constraints': sorted({(position[before], position[after]) for before, after in problem.precedence_constraints}),
+        'resource_constraints': sorted({(position[job], resource) for job, resource in problem.resource_constraints}),
+    }
+    if not shape:
+        form['job_durations'] = [problem.job_durations[job] for job in order]
+        form['temporal_constraints'] = sorted((position[job], release) for job, release in releases.items() if release > 0)
+    return order, form
+
+def fingerprint(form):
+    return hashlib.sha256(json.dumps(form, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+# ----------------------------
+# Solution Cache
+# ----------------------------
+
+class SolutionCache:
+    # Best known schedule per canonical problem in an sqlite file, so renumbered or reordered
+    # resubmissions hit the same row. At most max_entries rows are kept, least recently used
+    # evicted first. A problem with the same shape (only durations or release times differ)
+    # is a near hit: the cached job order and machines are decoded into a warm start
+    def __init__(self, path, max_entries=10000):
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path, timeout=30)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions (fingerprint TEXT PRIMARY KEY, shape TEXT NOT NULL, "
+                "schedule TEXT NOT NULL, shape_positions TEXT NOT NULL, makespan INTEGER NOT NULL, "
+                "solver TEXT NOT NULL, optimal INTEGER NOT NULL, used REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS solutions_shape ON solutions (shape, used)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used)")
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def keys(self, problem):
+        # (fingerprint, canonical order, shape fingerprint, shape order)
+        order, form = canonical_form(problem)
+        shape_order, shape_form = canonical_form(problem, shape=True)
+        return fingerprint(form), order, fingerprint(shape_form), shape_order
+
+    def get(self, problem, keys=None):
+        # Exact hit: {'schedule', 'makespan', 'solver', 'optimal'} in the problem's own job numbers
+        key, order, _, _ = keys or self.keys(problem)
+        row = self.connection.execute("SELECT schedule, makespan, solver, optimal FROM solutions WHERE fingerprint = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute("UPDATE solutions SET used = ? WHERE fingerprint = ?", (time.time(), key))
+        durations = problem.job_durations
+        schedule = {job: (start, start + durations[job], resource) for job, (start, resource) in zip(order, json.loads(row[0]))}
+        return {'schedule': schedule, 'makespan': row[1], 'solver': row[2], 'optimal': bool(row[3])}
+
+    def warm_start(self, problem, keys=None):
+        # Near hit: the most recently used schedule of the same shape, replayed as a job order and
+        # machine choice through the permutation decoder, so it is valid for the new durations
+        _, _, shape, shape_order = keys or self.keys(problem)
+        row = self.connection.execute("SELECT schedule, shape_positions FROM solutions WHERE shape = ? ORDER BY used DESC LIMIT 1", (shape,)).fetchone()
+        if row is None:
+            return None
+        cached, positions = json.loads(row[0]), json.loads(row[1])
+        start = [0] * problem.num_jobs
+        machine = [0] * problem.num_jobs
+        for job, position in zip(shape_order, positions):
+            start[job], machine[job] = cached[position]
+        permutation = sorted(range(problem.num_jobs), key=lambda job: (start[job], job))
+        decoder = PermutationDecoder(problem.job_durations, problem.num_resources, problem.precedence_constraints, problem.resource_constraints, problem.machine_capacities, problem.temporal_constraints)
+        return decoder.decode(permutation, machine)[0]
+
+    def put(self, problem, schedule, makespan, solver, optimal=False, keys=None):
+        # Keeps the better entry: a shorter makespan, or the same one with a proof of optimality
+        key, order, shape, shape_order = keys or self.keys(problem)
+        position = [0] * problem.num_jobs
+        for index, job in enumerate(order):
+            position[job] = index
+        stored = json.dumps([[schedule[job][0], schedule[job][2]] for job in order])
+        shape_positions = json.dumps([position[job] for job in shape_order])
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (fingerprint) DO UPDATE SET "
+                "schedule = excluded.schedule, makespan = excluded.makespan, solver = excluded.solver, optimal = excluded.optimal "
+                "WHERE excluded.makespan < solutions.makespan OR (excluded.makespan = solutions.makespan AND excluded.optimal > solutions.optimal)",
+                (key, shape, stored, shape_positions, makespan, solver, int(optimal), time.time()))
+            self.connection.execute("UPDATE solutions SET used = ? WHERE fingerprint = ?", (time.time(), key))
+            self.connection.execute("DELETE FROM solutions WHERE fingerprint IN (SELECT fingerprint FROM solutions ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                                    (self.max_entries,))
+
+    def solve(self, problem, method='branch_and_bound', options=None):
+        # Same contract as api.solve. Exact hits return the cached schedule whatever the method;
+        # near hits pass the warm start as `initial` to solvers that take one
+        if not isinstance(problem, Problem):
+            problem = Problem.from_dict(problem)
+        keys = self.keys(problem)
+        cached = self.get(problem, keys)
+        if cached is not None:
+            self.hits += 1
+            return cached['schedule'], cached['makespan']
+        function = solver_function(method)
+        options = method_options(function, options)
+        warm = self.warm_start(problem, keys)
+        if warm is not None:
+            self.near_hits += 1
+            if 'initial' in inspect.signature(function).parameters:
+                options.setdefault('initial', warm)
+        else:
+            self.misses += 1
+        result = function(*problem.args(), **options)
+        schedule, makespan = result[0], result[1]
+        if warm is not None:
+            warm_makespan = max((end for _, end, _ in warm.values()), default=0)
+            if schedule is None or warm_makespan < makespan:
+                schedule, makespan = warm, warm_makespan
+        if schedule is not None:
+            # Branch and bound proves optimality when its lower bound meets the makespan
+            optimal = len(result) > 2 and result[2] == makespan
+            self.put(problem, schedule, makespan, method, optimal, keys)
+        return schedule, makespan
@@ -0,0 +1,195 @@
+import argparse
+import json
+import sys
+
+from .api import METHODS, result_to_dict, solve
+from .cache import SolutionCache
+from .genetic import genetic_algorithm
+from .instance import MappedProblem, load_problem, save_problem
+from .portfolio import auto
+from .search import backtracking
+
+# ----------------------------
+# Step 1: Get input from user with validation
+# ----------------------------
+
+def get_positive_int(prompt):
+    while True:
+        try:
+            value = int(input(prompt))
+            if value <= 0:
+                print("Please enter a positive integer.")
+                continue
+            return value
+        except ValueError:
+            print("Invalid input. Please enter a valid integer.")
+
+def get_user_input():
+    try:
+        num_jobs = get_positive_int("Enter number of jobs: ")
+        num_resources = get_positive_int("Enter number of machines/resources: ")
+
+        machine_capacities = []
+        for i in range(num_resources):
+            capacity = get_positive_int(f"Enter capacity for machine {i+1}: ")
+            machine_capacities.append(capacity)
+
+        job_durations = []
+        for i in range(num_jobs):
+            t = get_positive_int(f"Enter duration for job {i+1}: ")
+            job_durations.append(t)
+
+        precedence_constraints = []
+        print("\nEnter precedence constraints (e.g., '1 2' means job 1 must finish before job 2). Type 'done' when finished:")
+        while True:
+            try:
+                line = input().strip()
+                if line.lower() == 'done':
+                    break
+                a, b = map(int, line.split())
+                if 1 <= a <= num_jobs and 1 <= b <= num_jobs:
+                    precedence_constraints.append((a-1, b-1))
+                else:
+                    print(f"Invalid job index. Must be between 1 and {num_jobs}.")
+            except ValueError:
+                print("Invalid input. Please enter two numbers or 'done'.")
+
+        resource_constraints = []
+        print("\nEnter resource constraints (e.g., '1 1' means job 1 cannot run on machine 1). Type 'done' when finished:")
+        while True:
+            try:
+                line = input().strip()
+                if line.lower() == 'done':
+                    break
+                j, r = map(int, line.split())
+                if 1 <= j <= num_jobs and 1 <= r <= num_resources:
+                    resource_constraints.append((j-1, r-1))
+                else:
+                    print(f"Invalid input. Jobs 1-{num_jobs}, machines 1-{num_resources}.")
+            except ValueError:
+                print("Invalid input. Please enter two numbers or 'done'.")
+
+        temporal_constraints = {}
+        print("\nEnter temporal constraints (e.g., '1 5' means job 1 cannot start before time 5). Type 'done' when finished:")
+        while True:
+            try:
+                line = input().strip()
+                if line.lower() == 'done':
+                    break
+                j, t = map(int, line.split())
+                if 1 <= j <= num_jobs and t >= 0:
+                    temporal_constraints[j-1] = t
+                else:
+                    print(f"Invalid input. Job index 1-{num_jobs}, time >= 0.")
+            except ValueError:
+                print("Invalid input. Please enter two numbers or 'done'.")
+
+        return job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints
+    except (EOFError, KeyboardInterrupt):
+        print("\nInput terminated. Exiting...")
+        sys.exit(0)
+
+# ----------------------------
+# Main Program
+# ----------------------------
+
+def interactive():
+    print("\n=== Welcome to the Job Scheduling Solver ===\n")
+
+    try:
+        algo_choice = input("Choose algorithm (1: Backtracking, 2: Genetic Algorithm, 3: Auto): ").strip()
+        while algo_choice not in ['1', '2', '3']:
+            algo_choice = input("Invalid choice. Please enter 1, 2 or 3: ").strip()
+
+        split_choice = input("Do you want to automatically assign jobs to machines? (yes/no): ").strip().lower()
+        while split_choice not in ['yes', 'no']:
+            split_choice = input("Invalid choice. Please enter 'yes' or 'no': ").strip().lower()
+        auto_split = (split_choice == 'yes')
+
+        job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints = get_user_input()
+
+        if algo_choice == '1':
+            print("\nSolving using Backtracking...")
+            best_schedule, best_makespan = backtracking(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints)
+        elif algo_choice == '2':
+            print("\nSolving using Genetic Algorithm...")
+            best_schedule, best_makespan = genetic_algorithm(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints)
+        else:
+            print("\nSolving with the method picked for this problem...")
+            best_schedule, best_makespan = auto(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints)[:2]
+
+        print("\n=== Results ===")
+        print_schedule(best_schedule, best_makespan)
+
+        print("\nThank you for using the Job Scheduling Solver!")
+
+    except ValueError as e:
+        print(f"\nNo valid schedule: {e}")
+    except (EOFError, KeyboardInterrupt):
+        print("\nInput terminated. Exiting...")
+        sys.exit(0)
+
+def print_schedule(best_schedule, best_makespan):
+    if best_schedule:
+        print(f"Minimum Makespan: {best_makespan}")
+        for job, (start, end, resource) in sorted(best_schedule.items()):
+            print(f"Job {job+1}: Starts at {start}, Ends at {end}, on Machine {resource+1}")
+    else:
+        print("No valid schedule found.")
+
+def main(argv=None):
+    # Without --problem this is the original interactive program
+    parser = argparse.ArgumentParser(description="Job Scheduling Solver")
+    parser.add_argument('--problem', help="problem file: JSON (see Problem.to_dict), .txt answers to the prompts or .jspb binary "
+                                          "(see scheduler.instance); prompts for input when omitted")
+    parser.add_argument('--convert', metavar='PATH', help="write the problem to PATH (.jspb binary, .txt text, else JSON) instead of solving it")
+    parser.add_argument('--method', default='branch_and_bound', choices=list(METHODS))
+    parser.add_argument('--time-limit', type=float, help="seconds before returning the best schedule so far (ignored by methods without a time limit)")
+    parser.add_argument('--seed', type=int, help="random seed for the seeded solvers (ignored by the others)")
+    parser.add_argument('--output', help="write the schedule as JSON instead of printing it")
+    parser.add_argument('--policy', help="selection policy file for --method auto (see `python -m scheduler.benchmark calibrate`)")
+    parser.add_argument('--race', action='store_true', help="with --method auto: race the candidate methods in parallel processes")
+    parser.add_argument('--cache', help="sqlite solution cache: repeated problems are answered from it, similar ones warm-start the solver")
+    args = parser.parse_args(argv)
+    if args.problem is None:
+        interactive()
+        return 0
+
+    options = {}
+    if args.time_limit is not None:
+        options['time_limit'] = args.time_limit
+    if args.seed is not None:
+        options['seed'] = args.seed
+    if (args.policy or args.race) and args.method != 'auto':
+        parser.error("--policy and --race need --method auto")
+    if args.policy:
+        options['policy'] = args.policy
+    if args.race:
+        options['parallel'] = True
+    try:
+        problem = load_problem(args.problem)
+    except ValueError as e:
+        print(f"Invalid problem file: {e}", file=sys.stderr)
+        return 1
+    try:
+        if args.convert:
+            save_problem(problem, args.convert)
+            return 0
+        if args.cache:
+            with SolutionCache(args.cache) as cache:
+                best_schedule, best_makespan = cache.solve(problem.to_problem() if isinstance(problem, MappedProblem) else problem, args.method, options)
+        else:
+            best_schedule, best_makespan = solve(problem, args.method, options)
+    except (TypeError, ValueError) as e:
+        print(f"No valid schedule: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if isinstance(problem, MappedProblem):
+            problem.close()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result_to_dict(best_schedule, best_makespan), f, indent=2)
+    else:
+        print_schedule(best_schedule, best_makespan)
+    return 0 if best_schedule else 1
+
@@ -0,0 +1,260 @@
+import inspect
+import time
+from collections import Counter
+
+from .api import solver_function
+from .budget import SolveBudget
+from .dispatching import dispatching
+from .instrumentation import timed_phase
+from .ordering import job_tails, topological_order
+from .permutation import PermutationDecoder
+
+# ----------------------------
+# Partitioning
+# ----------------------------
+
+# A partition is a sequence of jobs in which every job comes after its predecessors; windows
+# are consecutive slices of it, so everything a window depends on is already placed
+
+PARTITIONS = ('window', 'cluster')
+
+def job_heads(job_durations, precedence_constraints, temporal_constraints, order):
+    # Earliest start of each job from release times and precedence alone
+    predecessors = [[] for _ in job_durations]
+    for before, after in precedence_constraints:
+        predecessors[after].append(before)
+    head = [temporal_constraints.get(job, 0) for job in range(len(job_durations))]
+    for job in order:
+        for before in predecessors[job]:
+            head[job] = max(head[job], head[before] + job_durations[before])
+    return head
+
+def time_sequence(job_durations, precedence_constraints, temporal_constraints):
+    # Time windows: earliest start first, longest tail first among equal starts
+    order = topological_order(len(job_durations), precedence_constraints)
+    head = job_heads(job_durations, precedence_constraints, temporal_constraints, order)
+    tail = job_tails(job_durations, precedence_constraints, order)
+    return topological_order(len(job_durations), precedence_constraints, lambda job: (head[job], -tail[job], job)), [len(job_durations)]
+
+def cluster_sequence(job_durations, precedence_constraints, temporal_constraints):
+    # Precedence-connected clusters (union-find), earliest cluster first, each in time order.
+    # Also returns where each cluster ends, so windows can be cut between clusters
+    sequence, _ = time_sequence(job_durations, precedence_constraints, temporal_constraints)
+    parent = list(range(len(job_durations)))
+
+    def find(job):
+        while parent[job] != job:
+            parent[job] = parent[parent[job]]
+            job = parent[job]
+        return job
+
+    for before, after in precedence_constraints:
+        parent[find(before)] = find(after)
+    clusters = {}
+    for job in sequence:
+        clusters.setdefault(find(job), []).append(job)
+    sequence, boundaries = [], []
+    for jobs in clusters.values():
+        sequence.extend(jobs)
+        boundaries.append(len(sequence))
+    return sequence, boundaries
+
+def cut_windows(sequence, boundaries, window_size):
+    # Slices of at most window_size jobs, cut at cluster boundaries where possible
+    windows = []
+    start = 0
+    previous = 0
+    for boundary in boundaries:
+        if boundary - start > window_size and previous > start:
+            windows.append((start, previous))
+            start = previous
+        while boundary - start > window_size:
+            windows.append((start, start + window_size))
+            start += window_size
+        previous = boundary
+    if start < len(sequence):
+        windows.append((start, len(sequence)))
+    return windows
+
+# ----------------------------
+# Rolling Horizon
+# ----------------------------
+
+# Sub-solver options used when none are given: short runs, since every window gets one
+WINDOW_OPTIONS = {
+    'tabu_search': {'iterations': 100},
+    'simulated_annealing': {'iterations': 500},
+    'permutation_genetic': {'generations': 20},
+    'branch_and_bound': {'node_limit': 2000},
+}
+
+class RollingHorizon:
+    # Solves the windows one after the other. Each window sees the commitments of the earlier
+    # ones as boundary conditions: finished predecessors become release times, and every busy
+    # machine slot becomes a blocking job that keeps the slot's machine busy over [0, free).
+    # The sub-solver's start order and machine choice are then replayed through the permutation
+    # decoder on the carried-over slots, so the stitched schedule is feasible by construction.
+    # With overlap > 0 every window also takes the next `overlap` jobs of the sequence, but the
+    # `overlap` jobs that start last are not committed: they are re-optimized with the next
+    # window, which keeps ragged window ends from fixing idle time. Work per window is bounded
+    # by window_size + overlap, so time and memory grow linearly with the number of windows
+    def __init__(self, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, window_size=200, overlap=0, partition='window'):
+        if partition not in PARTITIONS:
+            raise ValueError(f"Unknown partition '{partition}'. Choose one of: {', '.join(PARTITIONS)}")
+        if window_size < 1 or overlap < 0:
+            raise ValueError("window_size must be positive and overlap non-negative")
+        num_jobs = len(job_durations)
+        self.job_durations = job_durations
+        self.num_resources = num_resources
+        self.machine_capacities = machine_capacities
+        self.temporal_constraints = temporal_constraints
+        self.overlap = overlap
+        self.predecessors = [[] for _ in range(num_jobs)]
+        for before, after in precedence_constraints:
+            self.predecessors[after].append(before)
+        self.forbidden = [[] for _ in range(num_jobs)]
+        for job, resource in resource_constraints:
+            self.forbidden[job].append(resource)
+        build = time_sequence if partition == 'window' else cluster_sequence
+        self.sequence, boundaries = build(job_durations, precedence_constraints, temporal_constraints)
+        self.windows = cut_windows(self.sequence, boundaries, window_size)
+        self.slots = [[0] * min(capacity, num_jobs) for capacity in machine_capacities]
+        self.taken = 0
+        self.carried = []
+        self.schedule = {}
+        self.makespan = 0
+
+    def boundary(self, jobs):
+        # (free, machine) of every busy slot on a machine some of the jobs may use; slots on the
+        # other machines cannot delay the window. Sorted, so slots that free up at the same time
+        # are neighbours
+        usable = set()
+        for job in jobs:
+            if len(usable) == self.num_resources:
+                break
+            forbidden = set(self.forbidden[job])
+            usable.update(resource for resource in range(self.num_resources) if resource not in forbidden)
+        return sorted((free, resource) for resource in usable for free in self.slots[resource] if free > 0)
+
+    def subproblem(self, jobs, boundary=()):
+        # Solver arguments for the jobs renumbered 0..len(jobs)-1. Predecessors outside the
+        # window are already scheduled and turn into release times. Every boundary slot is
+        # appended as a job as long as the slot is busy. Blockers of equal length are
+        # interchangeable, so each one only stays off the machines outside its group;
+        # solve_window puts them back at time 0 on their own machines
+        local = {job: index for index, job in enumerate(jobs)}
+        durations = [self.job_durations[job] for job in jobs]
+        precedence = []
+        releases = {}
+        for job in jobs:
+            release = self.temporal_constraints.get(job, 0)
+            for before in self.predecessors[job]:
+                if before in local:
+                    precedence.append((local[before], local[job]))
+                else:
+                    release = max(release, self.schedule[before][1])
+            if release > 0:
+                releases[local[job]] = release
+        resources = [(local[job], resource) for job in jobs for resource in self.forbidden[job]]
+        keys = [free if self.machine_capacities[resource] == 1 else (free, resource) for free, resource in boundary]
+        groups = {}
+        for key, (_, resource) in zip(keys, boundary):
+            groups.setdefault(key, set()).add(resource)
+        for key, (free, resource) in zip(keys, boundary):
+            resources.extend((len(durations), other) for other in range(self.num_resources) if other not in groups[key])
+            durations.append(free)
+        return durations, self.num_resources, precedence, resources, self.machine_capacities, releases
+
+    def solve_window(self, index, function, options):
+        # Solves window `index` with the jobs carried over and the look-ahead, commits all but
+        # the last starting `overlap` of them (all of them in the last window)
+        _, end = self.windows[index]
+        taken = min(len(self.sequence), end + self.overlap)
+        jobs = self.carried + self.sequence[self.taken:taken]
+        self.taken = taken
+        boundary = self.boundary(jobs)
+        durations, num_resources, precedence, resources, capacities, releases = self.subproblem(jobs, boundary)
+        result = function(durations, num_resources, precedence, resources, capacities, True, releases, **options)
+        local = result[0]
+        if local is None:
+            local = dispatching(durations, num_resources, precedence, resources, capacities, True, releases)[0]
+        blockers = range(len(jobs), len(durations))
+        if any(local[job][0] > 0 for job in blockers) or Counter((durations[job], local[job][2]) for job in blockers) != Counter(boundary):
+            # The sub-solver let window jobs go ahead of a busy slot, or moved a slot's blocker
+            # to another machine of its group, which the carried-over slots do not allow: keep
+            # its start order and machines, but re-time the window with every blocker decoded
+            # first on its own machine, so each one is back at [0, free)
+            order = list(blockers) + sorted(range(len(jobs)), key=lambda job: (local[job][0], job))
+            decoder = PermutationDecoder(durations, num_resources, precedence, resources, capacities, releases)
+            machines = [local[job][2] for job in range(len(jobs))] + [resource for _, resource in boundary]
+            local = decoder.decode(order, machines)[0]
+        # A predecessor never starts after its successor, so an earliest-start prefix (sequence
+        # order on ties) contains the predecessors of all its jobs
+        order = sorted(range(len(jobs)), key=lambda job: (local[job][0], job))
+        count = len(jobs) - (taken - end)
+        chosen = sorted(order[:count])
+        committed = [jobs[job] for job in chosen]
+        self.carried = [jobs[job] for job in sorted(order[count:])]
+        # Replay the committed jobs in the sub-solver's start order on its machines
+        position = {job: index for index, job in enumerate(chosen)}
+        permutation = [position[job] for job in order[:count]]
+        machines = [local[job][2] for job in chosen]
+        durations, num_resources, precedence, resources, capacities, releases = self.subproblem(committed)
+        decoder = PermutationDecoder(durations, num_resources, precedence, resources, capacities, releases)
+        placed, makespan = decoder.decode(permutation, machines, self.slots)
+        for job, entry in placed.items():
+            self.schedule[committed[job]] = entry
+        self.makespan = max(self.makespan, makespan)
+
+class WindowCancel:
+    # Cancel handed to a window's sub-solver: set once the window's share of the time limit is
+    # used up or the outer cancel is set, so the driver stops the window itself
+    def __init__(self, share, cancel):
+        self.budget = SolveBudget(share, None, cancel)
+
+    def is_set(self):
+        return self.budget.interrupted()
+
+def rolling_horizon(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, method='tabu_search', options=None, window_size=200, overlap=50, partition='window', time_limit=None, cancel=None, callback=None, stats=None):
+    # Decomposition driver for instances too large for a single solve: any registered method
+    # solves the windows. time_limit is shared out evenly over the windows still to solve and
+    # enforced here: a sub-solver that takes cancel is stopped at the end of its share, and one
+    # that cannot be stopped is replaced by dispatching while its last window took longer than
+    # the current share. Once the limit runs out or cancel is set, the remaining windows are
+    # dispatched so the result is always a complete schedule. callback sees the committed part
+    # of the schedule after every window. Sub-solvers always get auto_split: their machine
+    # choice is replayed, not fixed up front
+    if method == 'rolling_horizon':
+        raise ValueError("rolling_horizon cannot solve its own windows")
+    function = solver_function(method)
+    options = dict(WINDOW_OPTIONS.get(method, {}) if options is None else options)
+    accepted = inspect.signature(function).parameters
+    budget = SolveBudget(time_limit, None, cancel, callback)
+    with timed_phase(stats, 'partition'):
+        horizon = RollingHorizon(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, window_size, overlap, partition)
+    # Duration of the last window the sub-solver solved
+    last = 0.0
+    with timed_phase(stats, 'windows'):
+        for index in range(len(horizon.windows)):
+            share = None
+            dispatch = budget.interrupted()
+            if not dispatch and time_limit is not None:
+                share = (time_limit - budget.elapsed()) / (len(horizon.windows) - index)
+                dispatch = 'cancel' not in accepted and last > share
+                if dispatch and stats is not None:
+                    stats.count('dispatched_windows')
+            if dispatch:
+                horizon.solve_window(index, dispatching, {})
+            else:
+                window_options = dict(options)
+                if share is not None and 'time_limit' in accepted:
+                    window_options['time_limit'] = min(share, options.get('time_limit', share))
+                if 'cancel' in accepted and (share is not None or window_options.get('cancel', cancel) is not None):
+                    window_options['cancel'] = WindowCancel(share, window_options.get('cancel', cancel))
+                started = time.perf_counter()
+                horizon.solve_window(index, function, window_options)
+                last = time.perf_counter() - started
+            budget.improved(horizon.schedule, horizon.makespan, index + 1)
+    if stats is not None:
+        stats.count('windows', len(horizon.windows))
+    return horizon.schedule, horizon.makespan
@@ -0,0 +1,79 @@
+from .instrumentation import timed_phase
+from .ordering import job_tails, topological_order
+from .permutation import PermutationDecoder
+
+# ----------------------------
+# Priority Dispatching Rules
+# ----------------------------
+
+# Each rule maps a job to a sort key (smaller goes first). The PermutationDecoder's heap then
+# starts, among the jobs whose predecessors are done, the one the rule ranks first, on the
+# allowed machine slot that frees up first, or in an idle gap it fits in earlier. Sorting is
+# O(n log n); decoding takes heap operations per job plus, while its machines are busy, a
+# binary search per bucket of gap lengths (about log of the longest gap) and a short scan
+
+def rule_features(job_durations, precedence_constraints, temporal_constraints):
+    # What the rules look at: release, longest chain from the job to the end (tail),
+    # earliest start and number of transitive successors
+    num_jobs = len(job_durations)
+    order = topological_order(num_jobs, precedence_constraints)
+    tail = job_tails(job_durations, precedence_constraints, order)
+    release = [temporal_constraints.get(job, 0) for job in range(num_jobs)]
+    predecessors = [[] for _ in range(num_jobs)]
+    successors = [[] for _ in range(num_jobs)]
+    for before, after in precedence_constraints:
+        predecessors[after].append(before)
+        successors[before].append(after)
+    earliest = list(release)
+    for job in order:
+        for before in predecessors[job]:
+            earliest[job] = max(earliest[job], earliest[before] + job_durations[before])
+    # Transitive successors as bitsets, counted with int.bit_count
+    below = [0] * num_jobs
+    for job in reversed(order):
+        for after in successors[job]:
+            below[job] |= below[after] | (1 << after)
+    return {'release': release, 'tail': tail, 'earliest': earliest, 'successors': [bits.bit_count() for bits in below]}
+
+DISPATCHING_RULES = {
+    # Shortest / longest processing time
+    'spt': lambda job, d, f: (d[job], job),
+    'lpt': lambda job, d, f: (-d[job], job),
+    # Most work remaining: the longest chain of work from the job to the end
+    'mwkr': lambda job, d, f: (-f['tail'][job], job),
+    # Most total successors: unblocks the most jobs
+    'most_successors': lambda job, d, f: (-f['successors'][job], -f['tail'][job], job),
+    # Earliest release date
+    'earliest_release': lambda job, d, f: (f['release'][job], -f['tail'][job], job),
+    # Longest path through the job first (earliest start + tail), i.e. critical jobs
+    'critical_path': lambda job, d, f: (-(f['earliest'][job] + f['tail'][job]), -f['tail'][job], job),
+}
+
+def dispatch_order(job_durations, precedence_constraints, temporal_constraints, rule, features=None):
+    if rule not in DISPATCHING_RULES:
+        raise ValueError(f"Unknown dispatching rule '{rule}'. Choose one of: {', '.join(DISPATCHING_RULES)}")
+    features = features or rule_features(job_durations, precedence_constraints, temporal_constraints)
+    key = DISPATCHING_RULES[rule]
+    return sorted(range(len(job_durations)), key=lambda job: key(job, job_durations, features))
+
+def dispatch_all(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, rules=None, schedule_type='active'):
+    # {rule: (schedule, makespan)} for every rule; the features and the decoder are built once
+    decoder = PermutationDecoder(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, schedule_type)
+    features = rule_features(job_durations, precedence_constraints, temporal_constraints)
+    return {rule: decoder.decode(dispatch_order(job_durations, precedence_constraints, temporal_constraints, rule, features))
+            for rule in (rules or DISPATCHING_RULES)}
+
+def best_dispatch(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, rules=None):
+    # Shortest schedule over the rules (first rule on ties); an instant upper bound
+    results = dispatch_all(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, rules)
+    return min(results.values(), key=lambda result: result[1])
+
+def dispatching(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, rule=None, schedule_type='active', stats=None):
+    # One rule, or the best of all of them when rule is None. The decoder picks each job's
+    # machine, so auto_split has no effect
+    rules = None if rule is None else [rule]
+    with timed_phase(stats, 'dispatch'):
+        results = dispatch_all(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, rules, schedule_type)
+    if stats is not None:
+        stats.count('evaluations', len(results))
+    return min(results.values(), key=lambda result: result[1])
@@ -0,0 +1,181 @@
+import heapq
+import time
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Patch
+
+# ----------------------------
+# Slot Assignment
+# ----------------------------
+
+def assign_slots(schedule):
+    # Interval sweep per machine: each job, in start order, takes the lowest slot that is free at
+    # its start, so overlapping jobs land on different rows. O(n log n).
+    # Returns ({job: slot}, {machine: number of slots})
+    by_machine = {}
+    for job, (start, end, machine) in schedule.items():
+        by_machine.setdefault(machine, []).append((start, end, job))
+    slots = {}
+    counts = {}
+    for machine, jobs in by_machine.items():
+        jobs.sort()
+        busy = []
+        free = []
+        count = 0
+        for start, end, job in jobs:
+            while busy and busy[0][0] <= start:
+                heapq.heappush(free, heapq.heappop(busy)[1])
+            if free:
+                slot = heapq.heappop(free)
+            else:
+                slot = count
+                count += 1
+            slots[job] = slot
+            heapq.heappush(busy, (end, slot))
+        counts[machine] = count
+    return slots, counts
+
+def merge_bars(rows, starts, ends, gap):
+    # rows / starts sorted by (row, start). Consecutive bars of one row less than `gap` apart
+    # become one bar; returns (first index, row, start, end, size) per merged bar
+    first = np.flatnonzero(np.concatenate(([True], (rows[1:] != rows[:-1]) | (starts[1:] - ends[:-1] >= gap))))
+    sizes = np.diff(np.append(first, len(starts)))
+    return first, rows[first], starts[first], np.maximum.reduceat(ends, first), sizes
+
+# ----------------------------
+# Gantt Renderer
+# ----------------------------
+
+class GanttRenderer:
+    # Draws schedules on one Axes that is reused between solves: one PolyCollection per machine
+    # instead of a bar per job, a legend only for small schedules, and when more than max_bars
+    # bars are visible, the bars of a row closer than a pixel are merged into grey blocks. The
+    # merge is redone for the visible range whenever the x limits change (zoom / pan).
+    # update() is for streamed incumbents and draws at most once per min_interval seconds;
+    # flush() draws what update() held back, draw() always draws
+    AGGREGATE_COLOR = '#9ca3af'
+
+    def __init__(self, ax, max_bars=2000, legend_limit=20, min_interval=0.25, colormap='tab20', palette=None):
+        self.ax = ax
+        self.max_bars = max_bars
+        self.legend_limit = legend_limit
+        self.min_interval = min_interval
+        self.colormap = colormaps[colormap]
+        self.palette = {'text': 'black', 'title': 'black', 'grid': 'grey', **(palette or {})}
+        self.machines = []
+        self.collections = []
+        self.labels = None
+        self.pending = None
+        self.last_draw = 0.0
+        self.drawing = False
+        ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def update(self, schedule, makespan):
+        if time.perf_counter() - self.last_draw < self.min_interval:
+            self.pending = (schedule, makespan)
+            return False
+        self.draw(schedule, makespan)
+        return True
+
+    def flush(self):
+        if self.pending is not None and time.perf_counter() - self.last_draw >= self.min_interval:
+            self.draw(*self.pending)
+
+    def draw(self, schedule, makespan, title='Job Schedule'):
+        self.pending = None
+        self.last_draw = time.perf_counter()
+        ax = self.ax
+        labels = self.prepare(schedule)
+        self.drawing = True
+        try:
+            ax.set_xlim(0, max(makespan, 1))
+            ax.set_ylim(len(labels) - 0.5, -0.5)
+        finally:
+            self.drawing = False
+        ax.set_xlabel('Time', color=self.palette.get('text'))
+        ax.set_title(title, color=self.palette.get('title'))
+        ax.grid(True, color=self.palette.get('grid'), linestyle='--', alpha=0.3)
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if 0 < len(schedule) <= self.legend_limit:
+            handles = [Patch(color=self.colormap(job % self.colormap.N), label=f"Job {job+1}") for job in sorted(schedule)]
+            ax.legend(handles=handles, bbox_to_anchor=(1.02, 1), loc='upper left', borderaxespad=0)
+        self.refresh()
+        # The layout only depends on the row labels and the legend
+        layout = (labels, len(schedule) <= self.legend_limit)
+        if layout != self.labels:
+            self.labels = layout
+            if len(labels) <= 40:
+                ax.set_yticks(range(len(labels)), labels)
+            else:
+                # Too many rows to name: one tick per machine at its first row
+                ticks = [row for row, label in enumerate(labels) if label.endswith('(Slot 1)')]
+                ax.set_yticks(ticks, [labels[row].split(' (')[0] for row in ticks])
+            ax.figure.tight_layout()
+            ax.figure.subplots_adjust(right=0.85 if layout[1] else 0.97)
+        ax.figure.canvas.draw_idle()
+
+    def clear(self):
+        self.pending = None
+        for collection in self.collections:
+            collection.remove()
+        self.collections = []
+        self.machines = []
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        self.ax.figure.canvas.draw_idle()
+
+    def prepare(self, schedule):
+        # Per machine numpy arrays of (row, start, end, job), sorted by row and start
+        slots, counts = assign_slots(schedule)
+        offsets = {}
+        labels = []
+        for machine in sorted(counts):
+            offsets[machine] = len(labels)
+            labels.extend(f"Machine {machine+1} (Slot {slot+1})" for slot in range(counts[machine]))
+        by_machine = {machine: [] for machine in counts}
+        for job, (start, end, machine) in schedule.items():
+            by_machine[machine].append((offsets[machine] + slots[job], start, end, job))
+        self.machines = []
+        for machine in sorted(by_machine):
+            bars = np.array(sorted(by_machine[machine]), dtype=float).reshape(-1, 4)
+            self.machines.append((bars[:, 0], bars[:, 1], bars[:, 2], bars[:, 3].astype(int)))
+        return tuple(labels)
+
+    def refresh(self):
+        # Rebuilds the collections for the visible x range
+        for collection in self.collections:
+            collection.remove()
+        self.collections = []
+        x0, x1 = self.ax.get_xlim()
+        visible = [(rows[mask], starts[mask], ends[mask], jobs[mask])
+                   for rows, starts, ends, jobs in self.machines
+                   for mask in [(ends > x0) & (starts < x1)]]
+        aggregate = sum(len(rows) for rows, _, _, _ in visible) > self.max_bars
+        pixel = (x1 - x0) / max(self.ax.bbox.width, 1.0)
+        for rows, starts, ends, jobs in visible:
+            if not len(rows):
+                continue
+            colors = self.colormap(jobs % self.colormap.N)
+            if aggregate:
+                first, rows, starts, ends, sizes = merge_bars(rows, starts, ends, pixel)
+                colors = colors[first]
+                colors[sizes > 1] = to_rgba(self.AGGREGATE_COLOR)
+            verts = np.empty((len(rows), 4, 2))
+            verts[:, 0, 0] = verts[:, 1, 0] = starts
+            verts[:, 2, 0] = verts[:, 3, 0] = ends
+            verts[:, 0, 1] = verts[:, 3, 1] = rows - 0.4
+            verts[:, 1, 1] = verts[:, 2, 1] = rows + 0.4
+            collection = PolyCollection(verts, facecolors=colors, edgecolors='face', linewidths=0.5)
+            self.ax.add_collection(collection)
+            self.collections.append(collection)
+
+    def on_xlim_changed(self, ax):
+        if not self.drawing and self.machines:
+            self.refresh()
+            ax.figure.canvas.draw_idle()
@@ -0,0 +1,270 @@
+import random
+
+from .budget import SolveBudget
+from .dispatching import dispatch_all
+from .instrumentation import timed_phase
+from .local_search import LocalSearch
+from .ordering import topological_order
+from .propagation import propagate
+from .schedule import Schedule
+from .state import ScheduleState
+
+# ----------------------------
+# Genetic Algorithm
+# ----------------------------
+
+def generate_random_schedule(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, domains=None):
+    if domains is None:
+        domains = propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    state = ScheduleState(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    # Random topological order: predecessors are always placed first, so every job fits somewhere
+    priority = [random.random() for _ in job_durations]
+    jobs = topological_order(len(job_durations), precedence_constraints, priority.__getitem__)
+
+    for job in jobs:
+        # تحسين التعامل مع القيود الزمنية
+        min_start = state.min_start(job)  # البدء بالقيد الزمني
+        
+        resources = domains.allowed[job] if not auto_split else sorted(
+            domains.allowed[job], 
+            key=lambda r: state.load[r]
+        )
+        
+        resource = random.choice(resources)
+        # محاولة البدء بالوقت المحدد في القيد الزمني أولاً
+        for start in state.candidate_starts(resource, min_start):
+            if state.is_valid(job, start, resource):
+                state.place(job, start, resource)
+                break
+    return state.schedule
+
+def fitness(schedule, temporal_constraints):
+    if schedule is None:
+        return float('inf')
+    # Penalize schedules that don't respect temporal constraints
+    for job, release in temporal_constraints.items():
+        if job in schedule and schedule[job][0] < release:
+            return float('inf')
+    if isinstance(schedule, Schedule):
+        return schedule.makespan()
+    return max(e for _, (s, e, _) in schedule.items())
+
+def crossover(parent1, parent2, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, domains=None):
+    if domains is None:
+        domains = propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    state = ScheduleState(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    # The child is built in topological order: each job keeps a parent's start and machine
+    # when that is still valid, otherwise it takes the earliest valid start on that machine
+    for job in domains.order:
+        start, _, resource = parent1[job] if random.random() > 0.5 else parent2.get(job, parent1[job])
+        if not state.is_valid(job, start, resource):
+            # Ensure temporal constraint is strictly enforced
+            min_start = state.min_start(job)
+            start = next(s for s in state.candidate_starts(resource, min_start) if state.is_valid(job, s, resource))
+        state.place(job, start, resource)
+    return state.schedule
+
+def mutate(schedule, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, domains=None):
+    if domains is None:
+        domains = propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    state = ScheduleState(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    for job, (start, _, resource) in schedule.items():
+        state.place(job, start, resource)
+
+    job = random.choice(list(schedule.keys()))
+    # Ensure temporal constraint is strictly enforced
+    min_start = state.min_start(job)
+    new_start = min_start  # Always try minimum start time first
+    new_resource = random.choice(domains.allowed[job])
+    if state.is_valid(job, new_start, new_resource):
+        schedule[job] = (new_start, new_start + job_durations[job], new_resource)
+    return schedule
+
+def distance(schedule, other):
+    # Fraction of jobs placed differently (start or machine) in two compact Schedules
+    differ = sum(1 for a, b, r, q in zip(schedule.starts, other.starts, schedule.resources, other.resources) if a != b or r != q)
+    return differ / max(len(schedule.starts), 1)
+
+def adapt_rate(rate, trials, successes, target=0.2, step=0.2, low=0.05, high=1.0):
+    # 1/5 success rule: use an operator more while more than `target` of its children
+    # succeed, less otherwise
+    if not trials:
+        return rate
+    rate *= 1 + step if successes / trials > target else 1 - step
+    return min(high, max(low, rate))
+
+def genetic_algorithm(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, population_size=10, generations=20, time_limit=None, cancel=None, callback=None, stats=None, local_search_iterations=0, seed_fraction=0.2, initial=None, crossover_rate=1.0, mutation_rate=0.2, adaptive=True, stagnation=10, restarts=2, restart_fraction=0.5, min_diversity=0.02):
+    # Stops after `generations`, at the time limit or on cancellation with the best schedule so far.
+    # local_search_iterations > 0 makes it memetic: each generation the best individual gets
+    # that many tabu search iterations before selection. seed_fraction of the initial population
+    # (one per dispatching rule at most) comes from the dispatching rules instead of random schedules;
+    # initial, a known valid schedule, joins the population as well.
+    # Individuals are hashed (Schedule.signature) and a child equal to one already in the next
+    # generation is rejected before it takes a place. A child is crossed over with probability
+    # crossover_rate (else it copies the better parent) and mutated with mutation_rate (always
+    # when copied); with adaptive, both rates follow the share of children that come out no
+    # worse than the better parent. When the best makespan has not improved for `stagnation`
+    # generations, or the population's mean distance to the best falls below min_diversity,
+    # the worst restart_fraction is replaced by random schedules; after `restarts` restarts in
+    # a row without improvement the run stops early. It also stops at the propagation lower bound
+    budget = SolveBudget(time_limit, generations, cancel, callback)
+    population_size = max(2, population_size)
+    # Raises InfeasibleError up front; with the reduced domains every random schedule and
+    # every child is feasible, so neither loop below can spin
+    domains = propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    lower_bound = domains.lower_bound()
+    memetic = None
+    if local_search_iterations:
+        memetic = LocalSearch(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+
+    def random_individuals(count, signatures):
+        # Up to `count` random schedules not in signatures; gives up on duplicates after a few
+        # tries per place, since small problems may not have that many distinct schedules
+        individuals = []
+        attempts = 0
+        while len(individuals) < count and attempts < 3 * count:
+            if budget.interrupted():
+                break
+            attempts += 1
+            s = generate_random_schedule(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, domains)
+            if stats is not None:
+                stats.count('random_schedules' if s else 'random_schedule_failures')
+            if not s:
+                continue
+            if s.signature() in signatures:
+                if stats is not None:
+                    stats.count('duplicates_rejected')
+                continue
+            signatures.add(s.signature())
+            individuals.append((fitness(s, temporal_constraints), s))
+            if stats is not None:
+                stats.count('evaluations')
+        return individuals
+
+    population = []
+    signatures = set()
+    with timed_phase(stats, 'initial_population'):
+        if initial is not None:
+            seed = Schedule.from_dict(initial, job_durations)
+            signatures.add(seed.signature())
+            population.append((fitness(seed, temporal_constraints), seed))
+        seeds = int(population_size * seed_fraction) if seed_fraction else 0
+        if seeds:
+            for schedule, _ in sorted(dispatch_all(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints).values(), key=lambda result: result[1]):
+                seed = Schedule.from_dict(schedule, job_durations)
+                if len(population) < seeds + (initial is not None) and seed.signature() not in signatures:
+                    signatures.add(seed.signature())
+                    population.append((fitness(seed, temporal_constraints), seed))
+            if stats is not None:
+                stats.count('dispatch_seeds', len(population))
+        population += random_individuals(population_size - len(population), signatures)
+        # Too few distinct schedules: selection needs two parents, even equal ones
+        for _ in range(2 * population_size):
+            if len(population) >= 2 or budget.interrupted():
+                break
+            s = generate_random_schedule(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, domains)
+            if s:
+                population.append((fitness(s, temporal_constraints), s))
+        if len(population) < 2:
+            return None, float('inf')
+
+    best_schedule = None
+    best_score = float('inf')
+    stalled = 0
+    restarted = 0
+
+    generation = 0
+    with timed_phase(stats, 'evolve'):
+        while not budget.exhausted(generation):
+            generation += 1
+            population.sort(key=lambda individual: individual[0])
+            if memetic is not None:
+                with timed_phase(stats, 'local_search'):
+                    improved, score = memetic.improve(population[0][1], local_search_iterations, rng=random, stats=stats)
+                population[0] = (score, Schedule.from_dict(improved, job_durations))
+            if population[0][0] < best_score:
+                best_score, best_schedule = population[0]
+                budget.improved(best_schedule, best_score, generation)
+                stalled = 0
+                restarted = 0
+            else:
+                stalled += 1
+            diversity = sum(distance(s, population[0][1]) for _, s in population[1:]) / max(len(population) - 1, 1)
+            if stats is not None:
+                stats.generation(generation, population[0][0], diversity)
+            if best_score <= lower_bound:
+                if stats is not None:
+                    stats.count('stopped_at_lower_bound')
+                break
+
+            next_gen = population[:max(2, population_size // 2)]
+            signatures = {s.signature() for _, s in next_gen}
+            if (stagnation is not None and stalled >= stagnation) or (len(population) > 1 and diversity < min_diversity):
+                if restarted >= restarts:
+                    if stats is not None:
+                        stats.count('stopped_stagnant')
+                    break
+                # Partial restart: the worst part of the population makes room for random schedules
+                restarted += 1
+                stalled = 0
+                keep = max(2, population_size - int(population_size * restart_fraction))
+                next_gen = population[:keep]
+                signatures = {s.signature() for _, s in next_gen}
+                next_gen += random_individuals(population_size - len(next_gen), signatures)
+                if stats is not None:
+                    stats.count('restarts')
+
+            crossed_trials = crossed_successes = mutated_trials = mutated_successes = 0
+            duplicates = 0
+            parents = list(next_gen)
+            while len(next_gen) < population_size:
+                if budget.interrupted():
+                    return (best_schedule.to_dict() if best_schedule is not None else None), best_score
+                (score1, p1), (score2, p2) = random.sample(parents, 2)
+                crossed = random.random() < crossover_rate
+                if crossed:
+                    child = crossover(p1, p2, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, domains)
+                else:
+                    child = (p1 if score1 <= score2 else p2).copy()
+                mutated = bool(child) and (not crossed or random.random() < mutation_rate)
+                if mutated:
+                    child = mutate(child, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, domains)
+                    if stats is not None:
+                        stats.count('mutations')
+                if not child:
+                    if stats is not None:
+                        stats.count('crossover_discarded')
+                    continue
+                if child.signature() in signatures:
+                    # A clone: not evaluated and no place taken. Once clones keep coming, a
+                    # random schedule takes the place instead
+                    duplicates += 1
+                    if stats is not None:
+                        stats.count('duplicates_rejected')
+                    if duplicates > population_size:
+                        immigrants = random_individuals(1, signatures)
+                        next_gen += immigrants or [(score1, p1)]
+                        duplicates = 0
+                        if stats is not None:
+                            stats.count('immigrants')
+                    continue
+                score = fitness(child, temporal_constraints)
+                if stats is not None:
+                    stats.count('evaluations')
+                success = score <= min(score1, score2)
+                crossed_trials += crossed
+                crossed_successes += crossed and success
+                mutated_trials += mutated
+                mutated_successes += mutated and success
+                signatures.add(child.signature())
+                next_gen.append((score, child))
+            if adaptive:
+                crossover_rate = adapt_rate(crossover_rate, crossed_trials, crossed_successes)
+                mutation_rate = adapt_rate(mutation_rate, mutated_trials, mutated_successes)
+            population = next_gen
+    if best_schedule is None:
+        # Stopped before the first generation: the best initial schedule
+        best_score, best_schedule = min(population, key=lambda individual: individual[0])
+
+    # Individuals are compact Schedules; callers get the usual dict
+    return (best_schedule.to_dict() if best_schedule is not None else None), best_score
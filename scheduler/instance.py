@@ -0,0 +1,379 @@
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+from .problem import Problem
+
+# ----------------------------
+# Binary Instance Format
+# ----------------------------
+
+# A .jspb file is a 32 byte header followed by little-endian int32 arrays, back to back:
+#
+#   header     magic b'JSPB', uint32 version, then int32 num_jobs, num_resources,
+#              num_edges, num_forbidden, num_releases (non-zero release times), flags
+#              (bit 0 = auto_split)
+#   durations  num_jobs
+#   capacities num_resources
+#   offsets    num_jobs + 1     precedence in CSR form: the successors of job j are
+#   targets    num_edges        targets[offsets[j]:offsets[j + 1]]
+#   forbidden  2 * num_forbidden (job, machine) pairs
+#   releases   num_jobs         release time per job, 0 = none
+#
+# Jobs and machines are 0-based, as in Problem. MappedProblem maps the file and reads the
+# arrays in place, so loading costs one mmap whatever the size of the instance
+
+MAGIC = b'JSPB'
+VERSION = 1
+HEADER = struct.Struct('<4sI6i')
+AUTO_SPLIT = 1
+
+class EdgeView(Sequence):
+    # (before, after) pairs of a CSR adjacency, without materializing them
+    def __init__(self, offsets, targets):
+        self.offsets = offsets
+        self.targets = targets
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.targets)
+        if not 0 <= index < len(self.targets):
+            raise IndexError(index)
+        # The source is the last job whose successors start at or before index
+        low, high = 0, len(self.offsets) - 1
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.offsets[middle] <= index:
+                low = middle
+            else:
+                high = middle
+        return (low, self.targets[index])
+
+    def __iter__(self):
+        offsets, targets = self.offsets, self.targets
+        for job in range(len(offsets) - 1):
+            for index in range(offsets[job], offsets[job + 1]):
+                yield (job, targets[index])
+
+    def successors(self, job):
+        return self.targets[self.offsets[job]:self.offsets[job + 1]]
+
+class PairView(Sequence):
+    # (first, second) pairs stored flat
+    def __init__(self, flat):
+        self.flat = flat
+
+    def __len__(self):
+        return len(self.flat) // 2
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return (self.flat[2 * index], self.flat[2 * index + 1])
+
+    def __iter__(self):
+        flat = self.flat
+        for index in range(0, len(flat), 2):
+            yield (flat[index], flat[index + 1])
+
+class ReleaseView(Mapping):
+    # The dense release array as the {job: release} mapping the solvers expect; jobs with
+    # release 0 are not in it
+    def __init__(self, releases, count):
+        self.releases = releases
+        self.count = count
+
+    def __getitem__(self, job):
+        release = self.releases[job] if 0 <= job < len(self.releases) else 0
+        if not release:
+            raise KeyError(job)
+        return release
+
+    def get(self, job, default=None):
+        release = self.releases[job] if 0 <= job < len(self.releases) else 0
+        return release if release else default
+
+    def __contains__(self, job):
+        return isinstance(job, int) and 0 <= job < len(self.releases) and self.releases[job] != 0
+
+    def __iter__(self):
+        return (job for job, release in enumerate(self.releases) if release)
+
+    def __len__(self):
+        return self.count
+
+class MappedProblem:
+    # A .jspb file mapped read-only. It has Problem's attributes and args(), backed by
+    # memoryviews into the mapping, so the solvers and api.solve take it as it is; nothing is
+    # parsed or copied until a solver reads it. to_problem() makes an ordinary Problem.
+    # Close it (or use it as a context manager) once no solver uses it any more
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views = []
+        error = None
+        try:
+            self.read()
+        except ValueError as invalid:
+            # See load_binary: the traceback would keep the mapping open
+            error = ValueError(*invalid.args)
+        if error is not None:
+            self.close()
+            raise error
+
+    def read(self):
+        if len(self.map) < HEADER.size:
+            raise ValueError("Not a binary instance: file too short")
+        magic, version, num_jobs, num_resources, num_edges, num_forbidden, num_releases, flags = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError("Not a binary instance: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary instance version {version}")
+        if min(num_jobs, num_resources, num_edges, num_forbidden, num_releases) < 0:
+            raise ValueError("Corrupt binary instance: negative count")
+        sizes = [num_jobs, num_resources, num_jobs + 1, num_edges, 2 * num_forbidden, num_jobs]
+        if len(self.map) != HEADER.size + 4 * sum(sizes):
+            raise ValueError(f"Corrupt binary instance: expected {HEADER.size + 4 * sum(sizes)} bytes, found {len(self.map)}")
+        arrays = []
+        offset = HEADER.size
+        whole = memoryview(self.map)
+        self.views.append(whole)
+        for size in sizes:
+            if sys.byteorder == 'little':
+                view = whole[offset:offset + 4 * size].cast('i')
+                self.views.append(view)
+            else:
+                view = array('i')
+                view.frombytes(whole[offset:offset + 4 * size])
+                view.byteswap()
+            arrays.append(view)
+            offset += 4 * size
+        durations, capacities, offsets, targets, forbidden, releases = arrays
+        self.job_durations = durations
+        self.num_resources = num_resources
+        self.machine_capacities = capacities
+        self.precedence_constraints = EdgeView(offsets, targets)
+        self.resource_constraints = PairView(forbidden)
+        self.temporal_constraints = ReleaseView(releases, num_releases)
+        self.auto_split = bool(flags & AUTO_SPLIT)
+        if offsets[0] != 0 or offsets[num_jobs] != num_edges:
+            raise ValueError("Corrupt binary instance: precedence offsets do not match the edge count")
+
+    @property
+    def num_jobs(self):
+        return len(self.job_durations)
+
+    def arrays(self):
+        # The sections as numpy arrays over the same memory (numpy is only needed here)
+        import numpy as np
+        edges = self.precedence_constraints
+        return {name: np.frombuffer(values, dtype='<i4') for name, values in (
+            ('durations', self.job_durations), ('capacities', self.machine_capacities), ('offsets', edges.offsets),
+            ('targets', edges.targets), ('forbidden', self.resource_constraints.flat), ('releases', self.temporal_constraints.releases))}
+
+    def validate(self):
+        # Problem.validate's checks over whole arrays (with numpy when it is installed); the
+        # offending constraint is only looked up once a check fails
+        num_jobs, num_resources = self.num_jobs, self.num_resources
+        if num_resources <= 0:
+            raise ValueError("A problem needs at least one machine")
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        edges = self.precedence_constraints
+        flat = self.resource_constraints.flat
+        if np is not None:
+            arrays = self.arrays()
+            durations, capacities, offsets, targets, releases = (arrays[name] for name in ('durations', 'capacities', 'offsets', 'targets', 'releases'))
+            jobs, machines = arrays['forbidden'][0::2], arrays['forbidden'][1::2]
+            unsorted = bool((np.diff(offsets) < 0).any())
+            bad_edges = not unsorted and bool(len(targets) and ((targets < 0).any() or (targets >= num_jobs).any()
+                                                                 or (np.repeat(np.arange(num_jobs), np.diff(offsets)) == targets).any()))
+        else:
+            durations, capacities, offsets, targets, releases = (self.job_durations, self.machine_capacities, edges.offsets,
+                                                                 edges.targets, self.temporal_constraints.releases)
+            jobs, machines = flat[0::2], flat[1::2]
+            unsorted = any(offsets[job] > offsets[job + 1] for job in range(num_jobs))
+            bad_edges = not unsorted and bool(len(targets) and (min(targets) < 0 or max(targets) >= num_jobs
+                                                                 or any(job in edges.successors(job) for job in range(num_jobs))))
+        low, high = (np.min, np.max) if np is not None else (min, max)
+        if num_jobs and low(durations) <= 0:
+            raise ValueError("Job durations must be positive")
+        if low(capacities) <= 0:
+            raise ValueError(f"Expected {num_resources} positive machine capacities")
+        if unsorted:
+            raise ValueError("Corrupt binary instance: precedence offsets are not sorted")
+        if bad_edges:
+            before, after = next((before, after) for before, after in edges if not 0 <= after < num_jobs or before == after)
+            raise ValueError(f"Invalid precedence constraint ({before}, {after})")
+        if len(jobs) and (low(jobs) < 0 or high(jobs) >= num_jobs or low(machines) < 0 or high(machines) >= num_resources):
+            job, resource = next((job, resource) for job, resource in self.resource_constraints
+                                 if not (0 <= job < num_jobs and 0 <= resource < num_resources))
+            raise ValueError(f"Invalid resource constraint ({job}, {resource})")
+        if num_jobs and low(releases) < 0:
+            raise ValueError("Release times must not be negative")
+
+    def args(self):
+        return (self.job_durations, self.num_resources, self.precedence_constraints, self.resource_constraints,
+                self.machine_capacities, self.auto_split, self.temporal_constraints)
+
+    def to_problem(self):
+        return Problem(self.job_durations, self.num_resources, self.precedence_constraints, self.resource_constraints,
+                       self.machine_capacities, dict(self.temporal_constraints.items()), self.auto_split)
+
+    def close(self):
+        # The memoryviews must go before the mapping can close
+        for view in reversed(getattr(self, 'views', [])):
+            view.release()
+        self.views = []
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"MappedProblem({self.num_jobs} jobs, {self.num_resources} machines, {len(self.precedence_constraints)} precedence constraints)"
+
+def load_binary(path, validate=True):
+    problem = MappedProblem(path)
+    if validate:
+        error = None
+        try:
+            problem.validate()
+        except ValueError as invalid:
+            # Re-raised without the traceback, whose frames still hold views into the mapping
+            error = ValueError(*invalid.args)
+        if error is not None:
+            problem.close()
+            raise error
+    return problem
+
+def save_binary(problem, path):
+    # Any problem with Problem's attributes: a Problem, a MappedProblem or a text instance
+    num_jobs = problem.num_jobs
+    durations = array('i', problem.job_durations)
+    capacities = array('i', problem.machine_capacities)
+    # CSR by counting sort of the edge sources
+    offsets = array('i', [0]) * (num_jobs + 1)
+    for before, _ in problem.precedence_constraints:
+        offsets[before + 1] += 1
+    for job in range(num_jobs):
+        offsets[job + 1] += offsets[job]
+    targets = array('i', [0]) * offsets[num_jobs]
+    fill = array('i', offsets)
+    for before, after in problem.precedence_constraints:
+        targets[fill[before]] = after
+        fill[before] += 1
+    forbidden = array('i')
+    for job, resource in problem.resource_constraints:
+        forbidden.append(job)
+        forbidden.append(resource)
+    releases = array('i', [0]) * num_jobs
+    for job, release in problem.temporal_constraints.items():
+        releases[job] = release
+    count = sum(1 for release in releases if release)
+    header = HEADER.pack(MAGIC, VERSION, num_jobs, problem.num_resources, len(targets), len(forbidden) // 2, count,
+                         AUTO_SPLIT if problem.auto_split else 0)
+    with open(path, 'wb') as f:
+        f.write(header)
+        for values in (durations, capacities, offsets, targets, forbidden, releases):
+            if sys.byteorder != 'little':
+                values.byteswap()
+            values.tofile(f)
+
+# ----------------------------
+# Text Form
+# ----------------------------
+
+# The answers the interactive program reads (cli.get_user_input), one per line and 1-based:
+# number of jobs, number of machines, one capacity per machine, one duration per job, then
+# precedence pairs, forbidden (job, machine) pairs and (job, release) pairs, each section
+# closed by a line 'done'. A text file can be piped into `python -m scheduler` as it is
+
+def load_text(path, auto_split=False):
+    with open(path) as f:
+        lines = (line.strip() for line in f)
+        lines = (line for line in lines if line)
+        num_jobs = int(next(lines))
+        num_resources = int(next(lines))
+        capacities = [int(next(lines)) for _ in range(num_resources)]
+        durations = [int(next(lines)) for _ in range(num_jobs)]
+        sections = []
+        for _ in range(3):
+            pairs = []
+            for line in lines:
+                if line.lower() == 'done':
+                    break
+                first, second = line.split()
+                pairs.append((int(first), int(second)))
+            sections.append(pairs)
+    precedence, forbidden, releases = sections
+    return Problem(durations, num_resources, [(before - 1, after - 1) for before, after in precedence],
+                   [(job - 1, resource - 1) for job, resource in forbidden], capacities,
+                   {job - 1: release for job, release in releases}, auto_split)
+
+def save_text(problem, path):
+    with open(path, 'w') as f:
+        f.write(f"{problem.num_jobs}\n{problem.num_resources}\n")
+        f.writelines(f"{capacity}\n" for capacity in problem.machine_capacities)
+        f.writelines(f"{duration}\n" for duration in problem.job_durations)
+        f.writelines(f"{before + 1} {after + 1}\n" for before, after in problem.precedence_constraints)
+        f.write("done\n")
+        f.writelines(f"{job + 1} {resource + 1}\n" for job, resource in problem.resource_constraints)
+        f.write("done\n")
+        f.writelines(f"{job + 1} {release}\n" for job, release in sorted(problem.temporal_constraints.items()))
+        f.write("done\n")
+
+# ----------------------------
+# Loading by Format
+# ----------------------------
+
+FORMATS = ('json', 'text', 'binary')
+
+def instance_format(path):
+    # Binary files are recognized by their magic, text files by a .txt extension
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            return 'binary'
+    return 'text' if str(path).endswith('.txt') else 'json'
+
+def load_problem(path, format=None):
+    format = format or instance_format(path)
+    if format == 'binary':
+        return load_binary(path)
+    if format == 'text':
+        return load_text(path)
+    if format == 'json':
+        return Problem.load(path)
+    raise ValueError(f"Unknown instance format '{format}'. Choose one of: {', '.join(FORMATS)}")
+
+def save_problem(problem, path, format=None):
+    # Without a format: .jspb is binary, .txt text, anything else JSON
+    format = format or ('binary' if str(path).endswith('.jspb') else 'text' if str(path).endswith('.txt') else 'json')
+    if format == 'binary':
+        save_binary(problem, path)
+    elif format == 'text':
+        save_text(problem, path)
+    elif format == 'json':
+        (problem if isinstance(problem, Problem) else problem.to_problem()).save(path)
+    else:
+        raise ValueError(f"Unknown instance format '{format}'. Choose one of: {', '.join(FORMATS)}")
+
+def convert(source, destination, format=None):
+    problem = load_problem(source)
+    try:
+        save_problem(problem, destination, format)
+    finally:
+        if isinstance(problem, MappedProblem):
+            problem.close()
@@ -0,0 +1,92 @@
+import cProfile
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+# ----------------------------
+# Solver Statistics
+# ----------------------------
+
+class SolverStats:
+    # Opt-in: solvers take stats=None and skip every bookkeeping call when it is None
+    def __init__(self):
+        self.counters = Counter()
+        self.maxima = {}
+        self.timers = defaultdict(float)
+        self.history = []
+        self.events = []
+        self.started = time.perf_counter()
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def maximum(self, name, value):
+        if name not in self.maxima or value > self.maxima[name]:
+            self.maxima[name] = value
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.timers[name] += end - start
+            self.events.append((name, start - self.started, end - start))
+
+    def generation(self, generation, best, diversity):
+        # Seconds since the run started, on the same clock as the phase events
+        self.history.append({'generation': generation, 'best': best, 'diversity': diversity, 'time': time.perf_counter() - self.started})
+
+    def derived(self):
+        derived = {}
+        search_time = self.timers.get('search')
+        if search_time and self.counters['nodes']:
+            derived['nodes_per_second'] = self.counters['nodes'] / search_time
+        considered = self.counters['pruned'] + self.counters['expanded']
+        if considered:
+            derived['pruning_ratio'] = self.counters['pruned'] / considered
+        checks = self.counters['validity_checks']
+        if checks:
+            derived['rejection_ratio'] = sum(value for name, value in self.counters.items() if name.startswith('rejected_')) / checks
+        evolve_time = self.timers.get('evolve')
+        if evolve_time and self.counters['evaluations']:
+            derived['evaluations_per_second'] = self.counters['evaluations'] / evolve_time
+        if self.history:
+            derived['final_diversity'] = self.history[-1]['diversity']
+        return derived
+
+    def to_dict(self):
+        return {
+            'counters': dict(self.counters),
+            'maxima': dict(self.maxima),
+            'timers': dict(self.timers),
+            'derived': self.derived(),
+            'history': list(self.history),
+        }
+
+    def write_trace(self, path):
+        # Chrome trace-event JSON: opens as a flame chart in chrome://tracing, Perfetto or speedscope
+        events = [
+            {'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6, 'pid': 1, 'tid': 1}
+            for name, start, duration in self.events
+        ]
+        events.extend(
+            {'name': 'best', 'ph': 'C', 'ts': entry['time'] * 1e6, 'pid': 1, 'args': {'best': entry['best'], 'diversity': entry['diversity']}}
+            for entry in self.history
+        )
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'otherData': self.to_dict()}, f)
+
+def timed_phase(stats, name):
+    # Phase timer that costs nothing but a None check when instrumentation is off
+    return stats.phase(name) if stats is not None else nullcontext()
+
+def profile(func, *args, path=None, **kwargs):
+    # Runs func under cProfile; the .prof file loads in snakeviz, gprof2dot or pstats
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    if path is not None:
+        profiler.dump_stats(path)
+    return result, profiler
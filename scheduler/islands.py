@@ -0,0 +1,100 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .permutation import CROSSOVERS, MUTATIONS, PermutationDecoder, evolve_permutations, random_permutation_population
+
+# ----------------------------
+# Island Model Genetic Algorithm
+# ----------------------------
+
+# Each worker process builds its decoder once in the pool initializer
+island_decoder = None
+
+def init_island_worker(problem, schedule_type):
+    global island_decoder
+    island_decoder = PermutationDecoder(*problem, schedule_type)
+
+def pack_population(population):
+    # Populations travel between processes as flat int arrays instead of lists of lists
+    permutations = array('i')
+    keys = array('i')
+    makespans = array('q')
+    for makespan, permutation, machine_keys in population:
+        makespans.append(makespan)
+        permutations.extend(permutation)
+        if machine_keys is not None:
+            keys.extend(machine_keys)
+    return makespans, permutations, keys if len(keys) else None
+
+def unpack_population(packed, num_jobs):
+    makespans, permutations, keys = packed
+    population = []
+    for i, makespan in enumerate(makespans):
+        permutation = permutations[i * num_jobs:(i + 1) * num_jobs].tolist()
+        machine_keys = None if keys is None else keys[i * num_jobs:(i + 1) * num_jobs].tolist()
+        population.append([makespan, permutation, machine_keys])
+    return population
+
+def evolve_island(task):
+    packed, population_size, auto_split, generations, seed, crossover, mutation, mutation_rate = task
+    rng = random.Random(seed)
+    if packed is None:
+        population = random_permutation_population(island_decoder, population_size, auto_split, rng)
+    else:
+        population = unpack_population(packed, len(island_decoder.job_durations))
+    population = evolve_permutations(island_decoder, population, generations, rng, crossover, mutation, mutation_rate)
+    return pack_population(population)
+
+def island_genetic_algorithm(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, islands=4, population_size=50, generations=100, migration_interval=10, migrants=2, crossover='ox', mutation='swap', mutation_rate=0.2, schedule_type='active', seed=None, workers=None):
+    if crossover not in CROSSOVERS:
+        raise ValueError(f"Unknown crossover '{crossover}'. Choose one of: {', '.join(CROSSOVERS)}")
+    if mutation not in MUTATIONS:
+        raise ValueError(f"Unknown mutation '{mutation}'. Choose one of: {', '.join(MUTATIONS)}")
+    problem = (job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    # Fails fast on cycles or unplaceable jobs before any process is started
+    decoder = PermutationDecoder(*problem, schedule_type)
+    num_jobs = len(job_durations)
+    population_size = max(2, population_size)
+    migrants = min(migrants, population_size // 2)
+    base_seed = seed if seed is not None else random.randrange(2 ** 32)
+
+    def tasks(populations, epoch, epoch_generations):
+        # Every island and epoch has its own seed, so results only depend on seed and island count
+        return [
+            (populations[island], population_size, auto_split, epoch_generations,
+             f"{base_seed}-{island}-{epoch}", crossover, mutation, mutation_rate)
+            for island in range(islands)
+        ]
+
+    def run(pool_map):
+        populations = [None] * islands
+        done = 0
+        epoch = 0
+        while True:
+            epoch_generations = min(migration_interval, generations - done)
+            populations = list(pool_map(evolve_island, tasks(populations, epoch, epoch_generations)))
+            done += epoch_generations
+            epoch += 1
+            if done >= generations:
+                return populations
+            # Ring migration: the best of each island replace the worst of the next one
+            unpacked = [unpack_population(packed, num_jobs) for packed in populations]
+            for island in range(islands):
+                if migrants:
+                    incoming = [[m, list(p), None if k is None else list(k)] for m, p, k in unpacked[island][:migrants]]
+                    unpacked[(island + 1) % islands][-migrants:] = incoming
+            populations = [pack_population(sorted(population, key=lambda individual: individual[0])) for population in unpacked]
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or islands <= 1:
+        init_island_worker(problem, schedule_type)
+        populations = run(map)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, islands), initializer=init_island_worker, initargs=(problem, schedule_type)) as pool:
+            populations = run(pool.map)
+
+    best = min((unpack_population(packed, num_jobs)[0] for packed in populations), key=lambda individual: individual[0])
+    _, permutation, keys = best
+    return decoder.decode(permutation, keys)
@@ -0,0 +1,489 @@
+import heapq
+import math
+import random
+from operator import add
+
+from .budget import SolveBudget
+from .instrumentation import timed_phase
+from .ordering import job_tails, topological_order
+from .permutation import PermutationDecoder
+from .problem import InfeasibleError
+
+# ----------------------------
+# Critical-Path Local Search
+# ----------------------------
+
+def lane_bisect(jobs, value, key, right=False):
+    # bisect_left (bisect_right with right) over a lane ordered by key; bisect's own key=
+    # argument needs Python 3.10
+    low, high = 0, len(jobs)
+    while low < high:
+        middle = (low + high) // 2
+        found = key(jobs[middle])
+        if found < value or (right and found == value):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+class LocalSearch:
+    # A solution is a job sequence per machine lane (a machine of capacity c has c lanes, as
+    # in PermutationDecoder). Heads (starts) are longest paths over precedence arcs, lane arcs
+    # and release times; tails are longest paths from a job's start to the end. Every move
+    # relocates one job: within its lane (N5 swaps and N7 insertions on a critical block) or
+    # onto a lane of another allowed machine. After a move only the heads downstream and the
+    # tails upstream of the jobs whose lane arcs changed are recomputed
+    def __init__(self, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints):
+        num_jobs = len(job_durations)
+        topological_order(num_jobs, precedence_constraints)
+        self.job_durations = job_durations
+        self.release = [temporal_constraints.get(job, 0) for job in range(num_jobs)]
+        self.predecessors = [[] for _ in range(num_jobs)]
+        self.successors = [[] for _ in range(num_jobs)]
+        for before, after in precedence_constraints:
+            self.predecessors[after].append(before)
+            self.successors[before].append(after)
+        self.arcs = set(precedence_constraints)
+        forbidden = set(resource_constraints)
+        self.allowed = [[r for r in range(num_resources) if (job, r) not in forbidden and machine_capacities[r] > 0] for job in range(num_jobs)]
+        for job in range(num_jobs):
+            if not self.allowed[job]:
+                raise InfeasibleError(f"Job {job+1} is forbidden on every machine", {'reason': 'no_machine', 'job': job})
+        self.lane_machine = []
+        self.machine_lanes = []
+        for resource, capacity in enumerate(machine_capacities):
+            first = len(self.lane_machine)
+            self.lane_machine.extend([resource] * min(capacity, num_jobs))
+            self.machine_lanes.append(range(first, len(self.lane_machine)))
+        self.lanes = [[] for _ in self.lane_machine]
+        self.lane_of = [0] * num_jobs
+        self.position = [0] * num_jobs
+        self.heads = [0] * num_jobs
+        self.tails = [0] * num_jobs
+        self.makespan = 0
+        # Every path starts at a job's release, so the makespan is the largest release + tail.
+        # Max-heap of (-(release + tail), job) with stale entries popped lazily; a move only
+        # pushes the tails it changed
+        self.path_heap = []
+
+    # Solutions
+
+    def load(self, schedule):
+        # Lanes from a {job: (start, end, resource)} schedule (dict or Schedule): per machine the
+        # jobs go by start time onto the lane that frees up first
+        for lane in self.lanes:
+            lane.clear()
+        by_machine = [[] for _ in self.machine_lanes]
+        for job, (start, end, resource) in schedule.items():
+            by_machine[resource].append((start, end, job))
+        if sum(len(jobs) for jobs in by_machine) != len(self.job_durations):
+            raise ValueError("The schedule must place every job")
+        for resource, jobs in enumerate(by_machine):
+            free = [(0, lane) for lane in self.machine_lanes[resource]]
+            for start, end, job in sorted(jobs):
+                if not free or free[0][0] > start:
+                    raise ValueError(f"Machine {resource+1} runs more jobs than its capacity at time {start}")
+                lane = heapq.heapreplace(free, (end, free[0][1]))[1]
+                self.lane_of[job] = lane
+                self.position[job] = len(self.lanes[lane])
+                self.lanes[lane].append(job)
+        if not self.evaluate():
+            raise ValueError("The schedule contradicts the precedence constraints")
+
+    def schedule(self):
+        durations, heads = self.job_durations, self.heads
+        return {job: (heads[job], heads[job] + durations[job], self.lane_machine[self.lane_of[job]]) for job in range(len(durations))}
+
+    def evaluate(self):
+        # Full head / tail computation; False when the lane order closes a cycle
+        num_jobs = len(self.job_durations)
+        waiting = [len(self.predecessors[job]) + (self.position[job] > 0) for job in range(num_jobs)]
+        ready = [job for job in range(num_jobs) if waiting[job] == 0]
+        order = []
+        while ready:
+            job = ready.pop()
+            order.append(job)
+            self.heads[job] = self.head_of(job)
+            for after in self.following(job):
+                waiting[after] -= 1
+                if waiting[after] == 0:
+                    ready.append(after)
+        if len(order) < num_jobs:
+            return False
+        for job in reversed(order):
+            self.tails[job] = self.tail_of(job)
+        self.makespan = max(map(add, self.heads, self.job_durations), default=0)
+        self.path_heap = [(-(self.release[job] + self.tails[job]), job) for job in range(num_jobs)]
+        heapq.heapify(self.path_heap)
+        return True
+
+    def push_tails(self, jobs):
+        # Records the current tails of the jobs; rebuilt from scratch once stale entries pile up
+        heap, release, tails = self.path_heap, self.release, self.tails
+        if len(heap) > 4 * len(tails) + 64:
+            heap[:] = [(-(release[job] + tails[job]), job) for job in range(len(tails))]
+            heapq.heapify(heap)
+            return
+        for job in jobs:
+            heapq.heappush(heap, (-(release[job] + tails[job]), job))
+
+    def longest_path(self):
+        heap, release, tails = self.path_heap, self.release, self.tails
+        while heap and -heap[0][0] != release[heap[0][1]] + tails[heap[0][1]]:
+            heapq.heappop(heap)
+        return -heap[0][0] if heap else 0
+
+    # Longest paths
+
+    def following(self, job):
+        lane = self.lanes[self.lane_of[job]]
+        position = self.position[job] + 1
+        return self.successors[job] + [lane[position]] if position < len(lane) else self.successors[job]
+
+    def preceding(self, job):
+        position = self.position[job]
+        return self.predecessors[job] + [self.lanes[self.lane_of[job]][position - 1]] if position else self.predecessors[job]
+
+    def ready(self, job):
+        # Release and precedence part of the head
+        durations, heads = self.job_durations, self.heads
+        return max([self.release[job]] + [heads[before] + durations[before] for before in self.predecessors[job]])
+
+    def after(self, job):
+        # Precedence part of the tail (without the job itself)
+        return max([self.tails[after] for after in self.successors[job]], default=0)
+
+    def head_of(self, job):
+        head = self.ready(job)
+        position = self.position[job]
+        if position:
+            before = self.lanes[self.lane_of[job]][position - 1]
+            head = max(head, self.heads[before] + self.job_durations[before])
+        return head
+
+    def tail_of(self, job):
+        tail = self.after(job)
+        lane = self.lanes[self.lane_of[job]]
+        position = self.position[job] + 1
+        if position < len(lane):
+            tail = max(tail, self.tails[lane[position]])
+        return tail + self.job_durations[job]
+
+    def update(self, changed, forward):
+        # Recomputes the heads (forward) or tails of the cone reachable from the changed jobs, in
+        # topological order of the cone only. Returns the old values, or None (values untouched)
+        # when the cone contains a cycle
+        step, values, compute = (self.following, self.heads, self.head_of) if forward else (self.preceding, self.tails, self.tail_of)
+        waiting = {}
+        stack = [job for job in changed if job is not None]
+        while stack:
+            job = stack.pop()
+            if job not in waiting:
+                waiting[job] = 0
+                stack.extend(step(job))
+        for job in waiting:
+            for other in step(job):
+                waiting[other] += 1
+        saved = {job: values[job] for job in waiting}
+        ready = [job for job, count in waiting.items() if count == 0]
+        done = 0
+        while ready:
+            job = ready.pop()
+            values[job] = compute(job)
+            done += 1
+            for other in step(job):
+                waiting[other] -= 1
+                if waiting[other] == 0:
+                    ready.append(other)
+        if done < len(waiting):
+            for job, value in saved.items():
+                values[job] = value
+            return None
+        return saved
+
+    # Moves
+
+    def neighbours(self, job, lane, position):
+        # Lane predecessor and successor the job would get at `position` of `lane`, counted
+        # after the job has been taken out of its own lane
+        jobs = self.lanes[lane]
+        skip = self.position[job] if lane == self.lane_of[job] else len(jobs)
+
+        def at(index):
+            index += index >= skip
+            return jobs[index] if 0 <= index < len(jobs) else None
+
+        return (at(position - 1) if position else None), at(position)
+
+    def links(self, job, lane, position):
+        # (created, destroyed) lane arcs as (job, lane, lane predecessor) attributes; the tabu
+        # list forbids re-creating recently destroyed ones
+        old_lane = self.lane_of[job]
+        old_prev, old_next = self.neighbours(job, old_lane, self.position[job])
+        new_prev, new_next = self.neighbours(job, lane, position)
+        created = [(job, lane, new_prev)]
+        destroyed = [(job, old_lane, old_prev)]
+        if old_next is not None:
+            created.append((old_next, old_lane, old_prev))
+            destroyed.append((old_next, old_lane, job))
+        if new_next is not None:
+            created.append((new_next, lane, job))
+            destroyed.append((new_next, lane, new_prev))
+        return created, destroyed
+
+    def shift(self, job, lane, position):
+        source = self.lanes[self.lane_of[job]]
+        old_position = self.position[job]
+        del source[old_position]
+        target = self.lanes[lane]
+        target.insert(position, job)
+        self.lane_of[job] = lane
+        for index in range(old_position, len(source)):
+            self.position[source[index]] = index
+        for index in range(position if target is not source else min(position, old_position), len(target)):
+            self.position[target[index]] = index
+
+    def relocate(self, job, lane, position):
+        # Applies a move; returns an undo record, or None (nothing changed) if it closes a cycle
+        old_lane, old_position = self.lane_of[job], self.position[job]
+        old_prev, old_next = self.neighbours(job, old_lane, old_position)
+        new_prev, new_next = self.neighbours(job, lane, position)
+        old_makespan = self.makespan
+        self.shift(job, lane, position)
+        heads = self.update((job, old_next, new_next), True)
+        if heads is None:
+            self.shift(job, old_lane, old_position)
+            return None
+        tails = self.update((job, old_prev, new_prev), False)
+        # Incremental: only the tails the move changed are looked at
+        self.push_tails(tails)
+        self.makespan = self.longest_path()
+        return job, old_lane, old_position, heads, tails, old_makespan
+
+    def undo(self, record):
+        job, lane, position, heads, tails, makespan = record
+        self.shift(job, lane, position)
+        for other, value in heads.items():
+            self.heads[other] = value
+        for other, value in tails.items():
+            self.tails[other] = value
+        self.push_tails(tails)
+        self.makespan = makespan
+
+    def bounds(self, job, cache):
+        # (ready, after) of a job; they only change when a move is applied, so callers keep one
+        # cache per iteration
+        entry = cache.get(job)
+        if entry is None:
+            entry = cache[job] = (self.ready(job), self.after(job))
+        return entry
+
+    def estimate(self, job, lane, position, cache):
+        # Longest path through the jobs whose lane position changes, from the old heads and
+        # tails (Taillard's estimate); exact unless the move also shifts their other predecessors
+        jobs = self.lanes[lane]
+        old_position = self.position[job]
+        if lane != self.lane_of[job]:
+            segment = [job]
+            before = jobs[position - 1] if position else None
+            after = jobs[position] if position < len(jobs) else None
+        elif position < old_position:
+            segment = [job] + jobs[position:old_position]
+            before = jobs[position - 1] if position else None
+            after = jobs[old_position + 1] if old_position + 1 < len(jobs) else None
+        else:
+            segment = jobs[old_position + 1:position + 1] + [job]
+            before = jobs[old_position - 1] if old_position else None
+            after = jobs[position + 1] if position + 1 < len(jobs) else None
+        durations = self.job_durations
+        end = self.heads[before] + durations[before] if before is not None else 0
+        heads = []
+        for other in segment:
+            head = max(self.bounds(other, cache)[0], end)
+            heads.append(head)
+            end = head + durations[other]
+        tail = self.tails[after] if after is not None else 0
+        longest = 0
+        for other, head in zip(reversed(segment), reversed(heads)):
+            tail = durations[other] + max(self.bounds(other, cache)[1], tail)
+            longest = max(longest, head + tail)
+        return longest
+
+    def critical_path(self, rng=None):
+        # Jobs with head + tail == makespan linked by tight arcs; lane arcs are preferred so
+        # blocks come out as long as possible, other ties are broken by rng when given
+        durations, heads, tails, makespan = self.job_durations, self.heads, self.tails, self.makespan
+        critical = [job for job in range(len(durations)) if heads[job] + tails[job] == makespan]
+        if not critical:
+            return []
+        job = min(critical, key=heads.__getitem__)
+        path = [job]
+        while tails[job] > durations[job]:
+            end = heads[job] + durations[job]
+            tight = [after for after in self.following(job) if heads[after] == end and tails[after] == tails[job] - durations[job]]
+            if self.lane_of[tight[-1]] == self.lane_of[job] and self.position[tight[-1]] == self.position[job] + 1:
+                job = tight[-1]
+            else:
+                job = rng.choice(tight) if rng is not None else tight[0]
+            path.append(job)
+        return path
+
+    def blocks(self, path):
+        # Maximal runs of the path that follow each other directly on one lane
+        blocks = [[path[0]]] if path else []
+        for before, after in zip(path, path[1:]):
+            if self.lane_of[before] == self.lane_of[after] and self.position[after] == self.position[before] + 1:
+                blocks[-1].append(after)
+            else:
+                blocks.append([after])
+        return blocks
+
+    def moves(self, rng=None):
+        # (job, lane, position) candidates: N5 swaps at both ends of every critical block, N7
+        # insertions of inner block jobs before its first / after its last job, and each critical
+        # job onto the other lanes of its allowed machines wherever it fits around its current head
+        path = self.critical_path(rng)
+        moves = set()
+        for block in self.blocks(path):
+            if len(block) < 2:
+                continue
+            lane = self.lane_of[block[0]]
+            first, last = self.position[block[0]], self.position[block[-1]]
+            for before, after in ((block[0], block[1]), (block[-2], block[-1])):
+                if (before, after) not in self.arcs:
+                    moves.add((after, lane, self.position[before]))
+            for job in block[1:-1]:
+                moves.add((job, lane, first))
+                moves.add((job, lane, last))
+        durations, heads = self.job_durations, self.heads
+        for job in path:
+            start, end = heads[job], heads[job] + durations[job]
+            for resource in self.allowed[job]:
+                tried_empty = False
+                for lane in self.machine_lanes[resource]:
+                    jobs = self.lanes[lane]
+                    if lane == self.lane_of[job] or (not jobs and tried_empty):
+                        continue
+                    tried_empty = tried_empty or not jobs
+                    # Lane jobs ending after the start are not predecessors, lane jobs starting
+                    # before the end are not successors: between those the move is acyclic
+                    low = lane_bisect(jobs, start, lambda other: heads[other] + durations[other], True)
+                    high = lane_bisect(jobs, end, heads.__getitem__)
+                    for position in range(low, high + 1):
+                        moves.add((job, lane, position))
+        return sorted(moves)
+
+    # Searches
+
+    def tabu_search(self, tenure, budget, rng, stats=None):
+        # Runs until the budget's iteration limit. Each iteration applies the best estimated
+        # non-tabu move, even when it is worse; a tabu move is allowed when it is estimated to
+        # beat the best makespan (aspiration)
+        best_schedule, best = self.schedule(), self.makespan
+        tabu = {}
+        iteration = 0
+        while not budget.exhausted(iteration):
+            iteration += 1
+            cache = {}
+            candidates = sorted((self.estimate(*move, cache), rng.random(), move) for move in self.moves(rng))
+            if stats is not None:
+                stats.count('iterations')
+                stats.count('neighbours', len(candidates))
+            record = None
+            for allow_tabu in (False, True):
+                for estimate, _, move in candidates:
+                    created, destroyed = self.links(*move)
+                    if not allow_tabu and estimate >= best and any(tabu.get(link, 0) >= iteration for link in created):
+                        continue
+                    record = self.relocate(*move)
+                    if record is not None:
+                        break
+                    if stats is not None:
+                        stats.count('rejected_cycle')
+                if record is not None or not candidates:
+                    break
+            if record is None:
+                break
+            for link in destroyed:
+                tabu[link] = iteration + tenure
+            if self.makespan < best:
+                best_schedule, best = self.schedule(), self.makespan
+                budget.improved(best_schedule, best, iteration)
+                if stats is not None:
+                    stats.count('improvements')
+        return best_schedule, best
+
+    def anneal(self, temperature, cooling, budget, rng, stats=None):
+        # A random critical-path move each iteration, kept when it helps and otherwise with
+        # probability exp(-delta / temperature); the temperature decays geometrically
+        best_schedule, best = self.schedule(), self.makespan
+        iteration = 0
+        while not budget.exhausted(iteration):
+            iteration += 1
+            moves = self.moves(rng)
+            if not moves:
+                break
+            current = self.makespan
+            record = self.relocate(*rng.choice(moves))
+            temperature *= cooling
+            if stats is not None:
+                stats.count('iterations')
+            if record is None:
+                if stats is not None:
+                    stats.count('rejected_cycle')
+                continue
+            delta = self.makespan - current
+            if delta > 0 and rng.random() >= math.exp(-delta / max(temperature, 1e-9)):
+                self.undo(record)
+                continue
+            if stats is not None and delta > 0:
+                stats.count('accepted_worse')
+            if self.makespan < best:
+                best_schedule, best = self.schedule(), self.makespan
+                budget.improved(best_schedule, best, iteration)
+                if stats is not None:
+                    stats.count('improvements')
+        return best_schedule, best
+
+    def improve(self, schedule, iterations=50, tenure=10, rng=None, stats=None):
+        # Short tabu run from a given schedule, e.g. as the memetic step of a genetic algorithm
+        self.load(schedule)
+        return self.tabu_search(tenure, SolveBudget(limit=iterations), rng or random.Random(), stats)
+
+def initial_schedule(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints):
+    # Longest tail first through the permutation decoder: heap operations and a gap search
+    # per job, fine for thousands of jobs
+    tail = job_tails(job_durations, precedence_constraints, topological_order(len(job_durations), precedence_constraints))
+    order = topological_order(len(job_durations), precedence_constraints, lambda job: (-tail[job], job))
+    decoder = PermutationDecoder(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    return decoder.decode(order)[0]
+
+VARIANTS = ('tabu', 'annealing')
+
+def local_search(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, variant='tabu', iterations=1000, tenure=10, temperature=None, cooling=0.995, initial=None, time_limit=None, cancel=None, callback=None, seed=None, stats=None):
+    # Improves `initial` (any valid schedule, e.g. from another solver) or a list schedule.
+    # Machine choice is part of the neighbourhood, so auto_split has no effect
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown local search variant '{variant}'. Choose one of: {', '.join(VARIANTS)}")
+    budget = SolveBudget(time_limit, iterations, cancel, callback)
+    rng = random.Random(seed)
+    search = LocalSearch(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    if not job_durations:
+        return {}, 0
+    with timed_phase(stats, 'initial_solution'):
+        search.load(initial if initial is not None else initial_schedule(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints))
+    budget.improved(search.schedule(), search.makespan, 0)
+    with timed_phase(stats, 'local_search'):
+        if variant == 'tabu':
+            return search.tabu_search(tenure, budget, rng, stats)
+        if temperature is None:
+            temperature = sum(job_durations) / len(job_durations)
+        return search.anneal(temperature, cooling, budget, rng, stats)
+
+def tabu_search(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, iterations=1000, tenure=10, initial=None, time_limit=None, cancel=None, callback=None, seed=None, stats=None):
+    return local_search(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints,
+                        'tabu', iterations, tenure, None, 0.995, initial, time_limit, cancel, callback, seed, stats)
+
+def simulated_annealing(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, iterations=5000, temperature=None, cooling=0.999, initial=None, time_limit=None, cancel=None, callback=None, seed=None, stats=None):
+    return local_search(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints,
+                        'annealing', iterations, 10, temperature, cooling, initial, time_limit, cancel, callback, seed, stats)
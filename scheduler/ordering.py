@@ -0,0 +1,80 @@
+import heapq
+
+from .problem import InfeasibleError
+
+# ----------------------------
+# Precedence Ordering
+# ----------------------------
+
+BRANCHING_ORDERS = ('index', 'topological', 'longest_tail', 'most_constrained')
+
+def topological_order(num_jobs, precedence_constraints, priority=None):
+    successors = [[] for _ in range(num_jobs)]
+    indegree = [0] * num_jobs
+    for before, after in precedence_constraints:
+        successors[before].append(after)
+        indegree[after] += 1
+    key = priority or (lambda job: job)
+    ready = [(key(job), job) for job in range(num_jobs) if indegree[job] == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, job = heapq.heappop(ready)
+        order.append(job)
+        for after in successors[job]:
+            indegree[after] -= 1
+            if indegree[after] == 0:
+                heapq.heappush(ready, (key(after), after))
+
+    if len(order) < num_jobs:
+        cycle = precedence_cycle({job for job in range(num_jobs) if indegree[job] > 0}, precedence_constraints)
+        raise InfeasibleError("Precedence constraints contain a cycle: " + " -> ".join(f"job {job+1}" for job in cycle),
+                              {'reason': 'cycle', 'cycle': cycle})
+    return order
+
+def precedence_cycle(left, precedence_constraints):
+    # Every job left by Kahn's algorithm has a predecessor that is also left: walk back until
+    # a job repeats. Returns the cycle in precedence order, closed with its first job
+    predecessor = {after: before for before, after in precedence_constraints if before in left and after in left}
+    seen = {}
+    path = []
+    job = min(left)
+    while job not in seen:
+        seen[job] = len(path)
+        path.append(job)
+        job = predecessor[job]
+    cycle = path[seen[job]:][::-1]
+    cycle.append(cycle[0])
+    return cycle
+
+def job_tails(job_durations, precedence_constraints, order):
+    # Longest chain of durations from each job to the end of the precedence DAG
+    successors = [[] for _ in job_durations]
+    for before, after in precedence_constraints:
+        successors[before].append(after)
+    tail = [0] * len(job_durations)
+    for job in reversed(order):
+        tail[job] = job_durations[job] + max([tail[after] for after in successors[job]] + [0])
+    return tail
+
+def branching_order(job_durations, num_resources, precedence_constraints, resource_constraints, order='topological'):
+    num_jobs = len(job_durations)
+    # Always check for cycles before any search starts
+    topo = topological_order(num_jobs, precedence_constraints)
+    if order == 'index':
+        return list(range(num_jobs))
+    if order == 'topological':
+        return topo
+    if order == 'longest_tail':
+        tail = job_tails(job_durations, precedence_constraints, topo)
+        return topological_order(num_jobs, precedence_constraints, lambda job: (-tail[job], job))
+    if order == 'most_constrained':
+        allowed = [num_resources] * num_jobs
+        for job, _ in set(resource_constraints):
+            allowed[job] -= 1
+        degree = [0] * num_jobs
+        for before, after in precedence_constraints:
+            degree[before] += 1
+            degree[after] += 1
+        return topological_order(num_jobs, precedence_constraints, lambda job: (allowed[job], -degree[job], job))
+    raise ValueError(f"Unknown branching order '{order}'. Choose one of: {', '.join(BRANCHING_ORDERS)}")
@@ -0,0 +1,177 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .budget import SolveBudget
+from .search import BranchAndBound
+
+# ----------------------------
+# Parallel Branch and Bound
+# ----------------------------
+
+# Nodes a worker counts before adding them to the shared total, so the counter's lock is taken
+# once per batch; the node limit may be overshot by less than a batch per worker
+NODE_BATCH = 64
+
+class SharedIncumbentBranchAndBound(BranchAndBound):
+    # Prunes against the best makespan of all workers, kept in shared memory, and counts its
+    # nodes towards one node limit shared by all tasks
+    def __init__(self, incumbent, shared_nodes, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.incumbent = incumbent
+        self.shared_nodes = shared_nodes
+        self.shared_limit = None
+        self.reported = 0
+
+    def pruned(self, bound):
+        # Ties with other workers are kept, so every task still finds its first optimum in serial order
+        return bound >= self.best_makespan or bound > self.incumbent.value
+
+    def record(self, makespan):
+        super().record(makespan)
+        with self.incumbent.get_lock():
+            if makespan < self.incumbent.value:
+                self.incumbent.value = makespan
+
+    def report_nodes(self):
+        # Adds the nodes not yet reported to the shared count; returns the total of all tasks
+        with self.shared_nodes.get_lock():
+            self.shared_nodes.value += self.nodes - self.reported
+            total = self.shared_nodes.value
+        self.reported = self.nodes
+        return total
+
+    def out_of_budget(self):
+        if self.shared_limit is not None and self.nodes - self.reported >= NODE_BATCH:
+            if self.report_nodes() >= self.shared_limit:
+                return True
+        return super().out_of_budget()
+
+# Each worker process builds its solver once in the pool initializer, and gets the cancel
+# (an Event set by the parent in a pool) its tasks stop on
+subtree_solver = None
+subtree_cancel = None
+
+def init_subtree_worker(incumbent, shared_nodes, cancel, problem, order, table_size=None):
+    global subtree_solver, subtree_cancel
+    subtree_solver = SharedIncumbentBranchAndBound(incumbent, shared_nodes, *problem, order=order, table_size=table_size, dispatch=False)
+    subtree_cancel = cancel
+
+def solve_subtree(task):
+    prefix, node_limit, deadline = task
+    solver = subtree_solver
+    solver.best_schedule = None
+    solver.best_makespan = float('inf')
+    solver.nodes = 0
+    solver.reported = 0
+    solver.shared_limit = node_limit
+    if solver.table is not None:
+        # States are only remembered within one task, so ties resolve as in the serial search
+        solver.table.clear()
+    solver.budget = SolveBudget(None if deadline is None else max(0.0, deadline - time.time()), None, subtree_cancel)
+    # Tasks left after a stop (node limit, deadline, cancel) end at once, and a running one
+    # reads the clock and cancel from its first node on
+    solver.next_check = solver.work
+    solver.stopped = (node_limit is not None and solver.report_nodes() >= node_limit) or solver.budget.interrupted()
+
+    # Replay the top of the tree, then search the rest of this subtree as the serial solver would
+    makespan = 0
+    last = (-1, -1)
+    for job, start, resource in prefix:
+        solver.place(job, start, resource)
+        makespan = max(makespan, start + solver.job_durations[job])
+        last = (start, job)
+    if not solver.stopped and not solver.pruned(solver.lower_bound(makespan, last[0])):
+        solver.search(last, makespan)
+    solver.report_nodes()
+    for job, _, _ in reversed(prefix):
+        solver.remove(job)
+    best_schedule = solver.best_schedule.to_dict() if solver.best_schedule is not None else None
+    return best_schedule, solver.best_makespan, solver.nodes, solver.stopped
+
+def split_tree(solver, depth):
+    # Top-level prefixes (job, start, resource) in the serial solver's depth-first order, over
+    # an explicit stack of child iterators as in BranchAndBound.search
+    prefixes = []
+    prefix = []
+
+    def complete():
+        return len(prefix) == depth or len(solver.state.schedule) == len(solver.job_durations)
+
+    if complete():
+        return [[]]
+    stack = [iter(solver.children((-1, -1)))]
+    while stack:
+        for job, start, resource in stack[-1]:
+            solver.place(job, start, resource)
+            prefix.append((job, start, resource))
+            if not complete():
+                stack.append(iter(solver.children((start, job))))
+                break
+            prefixes.append(list(prefix))
+            prefix.pop()
+            solver.remove(job)
+        else:
+            stack.pop()
+            if prefix:
+                solver.remove(prefix.pop()[0])
+    return prefixes
+
+def parallel_branch_and_bound(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, node_limit=None, time_limit=None, order='longest_tail', split_depth=2, workers=None, table_size=None, dispatch=True, initial=None, cancel=None, callback=None):
+    # Same schedule, makespan and lower bound as branch_and_bound when no budget is hit.
+    # node_limit counts the nodes of all tasks together. cancel stops every task; worker
+    # processes watch an Event the parent sets when cancel is, since any object with is_set()
+    # may be given. callback sees every task result that improves the incumbent
+    problem = (job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints)
+    root = BranchAndBound(*problem, order=order, dispatch=dispatch, initial=initial)
+    root_bound = root.lower_bound(0, 0)
+    tasks = split_tree(root, split_depth)
+    deadline = None if time_limit is None else time.time() + time_limit
+    # Every worker prunes against the dispatching rules' (or the given) incumbent from the start
+    best_schedule, best_makespan = root.initial_incumbent()
+    budget = SolveBudget(time_limit, None, cancel, callback)
+    if best_schedule is not None:
+        best_schedule = best_schedule.to_dict()
+        budget.improved(best_schedule, best_makespan, 0)
+    incumbent = multiprocessing.Value('d', best_makespan)
+    shared_nodes = multiprocessing.Value('q', 0)
+    reported = [best_makespan]
+
+    def report(result):
+        schedule, makespan = result[0], result[1]
+        if schedule is not None and makespan < reported[0]:
+            reported[0] = makespan
+            budget.improved(schedule, makespan, shared_nodes.value)
+
+    workers = workers or os.cpu_count() or 1
+    task_args = [(prefix, node_limit, deadline) for prefix in tasks]
+    if workers <= 1 or len(tasks) <= 1:
+        init_subtree_worker(incumbent, shared_nodes, cancel, problem, order, table_size)
+        results = []
+        for args in task_args:
+            results.append(solve_subtree(args))
+            report(results[-1])
+    else:
+        stop = multiprocessing.Event()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_subtree_worker, initargs=(incumbent, shared_nodes, stop, problem, order, table_size)) as pool:
+            futures = [pool.submit(solve_subtree, args) for args in task_args]
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report(future.result())
+                if cancel is not None and cancel.is_set():
+                    stop.set()
+            results = [future.result() for future in futures]
+
+    stopped = False
+    for schedule, makespan, _, task_stopped in results:
+        stopped = stopped or task_stopped
+        # Strict improvement keeps the earliest task on ties, like the serial search
+        if makespan < best_makespan:
+            best_schedule, best_makespan = schedule, makespan
+    if best_schedule is None and stopped:
+        best_schedule, best_makespan = dict(root.domains.schedule), root.domains.horizon
+    lower_bound = root_bound if stopped else best_makespan
+    return best_schedule, best_makespan, lower_bound
@@ -0,0 +1,225 @@
+import heapq
+import random
+from bisect import bisect_left, insort
+
+from .budget import SolveBudget
+from .instrumentation import timed_phase
+from .ordering import topological_order
+from .problem import InfeasibleError
+
+# ----------------------------
+# Permutation Genetic Algorithm
+# ----------------------------
+
+SCHEDULE_TYPES = ('active', 'non_delay')
+
+class PermutationDecoder:
+    def __init__(self, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, schedule_type='active'):
+        if schedule_type not in SCHEDULE_TYPES:
+            raise ValueError(f"Unknown schedule type '{schedule_type}'. Choose one of: {', '.join(SCHEDULE_TYPES)}")
+        num_jobs = len(job_durations)
+        # Raises InfeasibleError with a certificate on a precedence cycle
+        topological_order(num_jobs, precedence_constraints)
+        self.job_durations = job_durations
+        self.num_resources = num_resources
+        self.machine_capacities = machine_capacities
+        self.schedule_type = schedule_type
+        self.release = [temporal_constraints.get(job, 0) for job in range(num_jobs)]
+        self.successors = [[] for _ in range(num_jobs)]
+        self.indegree = [0] * num_jobs
+        for before, after in precedence_constraints:
+            self.successors[before].append(after)
+            self.indegree[after] += 1
+        forbidden = set(resource_constraints)
+        # Machines without capacity have no slots, so they are never allowed (as in propagate)
+        self.allowed = [[r for r in range(num_resources) if (job, r) not in forbidden and machine_capacities[r] > 0] for job in range(num_jobs)]
+        for job, machines in enumerate(self.allowed):
+            if not machines:
+                raise InfeasibleError(f"Job {job+1} is forbidden on every machine", {'reason': 'no_machine', 'job': job})
+
+    def decode(self, permutation, machine_keys=None, slots=None):
+        # List scheduling driven by the permutation: eligible jobs wait in a heap keyed by their
+        # position (active) or by their earliest start and then position (non-delay). Every
+        # machine keeps a heap with the free time of each of its capacity slots (lanes) and the
+        # idle gaps left on them; a job goes into the earliest gap it fits in when that beats
+        # the first free lane (gap insertion), so no job can start earlier without delaying
+        # another. Gaps are bucketed by length (below 1, 2, 4, ...) and sorted by start, so a
+        # job only looks at buckets long enough for it, from the last gaps that can still
+        # reach its earliest start; in a bucket of gaps longer than the job the first one is
+        # taken. Given slots (machine availability left by earlier decoding) are used and
+        # updated in place; their gaps are not kept
+        num_jobs = len(permutation)
+        position = [0] * num_jobs
+        for index, job in enumerate(permutation):
+            position[job] = index
+        durations = self.job_durations
+        ready = list(self.release)
+        waiting = list(self.indegree)
+        if slots is None:
+            slots = [[0] * min(capacity, num_jobs) for capacity in self.machine_capacities]
+        # Per machine {k: idle (start, end) intervals shorter than 2**k, sorted by start}
+        gaps = [{} for _ in slots]
+        non_delay = self.schedule_type == 'non_delay'
+        eligible = [(ready[job], position[job], job) if non_delay else (position[job], job)
+                    for job in range(num_jobs) if waiting[job] == 0]
+        heapq.heapify(eligible)
+
+        schedule = {}
+        makespan = 0
+        while eligible:
+            job = eligible[0][-1]
+            resource = machine_keys[job] if machine_keys is not None else None
+            machines = self.allowed[job] if resource is None or resource not in self.allowed[job] else (resource,)
+            earliest = ready[job]
+            duration = durations[job]
+            best = None
+            for r in machines:
+                free = slots[r][0]
+                start = free if free > earliest else earliest
+                if best is None or start < best[0]:
+                    best = (start, r, None)
+            if best[0] > earliest:
+                # Every allowed machine is busy at the earliest start: a gap may start it sooner
+                for r in machines:
+                    for k, bucket in gaps[r].items():
+                        bound = 1 << k
+                        if bound <= duration:
+                            continue
+                        # In start order, the first gap of a bucket that fits starts earliest
+                        index = bisect_left(bucket, (earliest - bound,))
+                        size = len(bucket)
+                        while index < size and bucket[index][0] < best[0]:
+                            gap_start, gap_end = bucket[index]
+                            start = gap_start if gap_start > earliest else earliest
+                            if gap_end - duration >= start:
+                                best = (start, r, (k, index))
+                                break
+                            index += 1
+            start, resource, gap = best
+            if non_delay and start > eligible[0][0]:
+                # Machine availability moved on since the job was queued: requeue at its real start
+                heapq.heapreplace(eligible, (start, position[job], job))
+                continue
+            heapq.heappop(eligible)
+            end = start + duration
+            machine_gaps = gaps[resource]
+            if gap is None:
+                pieces = ((heapq.heapreplace(slots[resource], end), start),)
+            else:
+                gap_start, gap_end = machine_gaps[gap[0]].pop(gap[1])
+                pieces = ((gap_start, start), (end, gap_end))
+            for piece in pieces:
+                if piece[0] < piece[1]:
+                    k = int(piece[1] - piece[0]).bit_length()
+                    if k not in machine_gaps:
+                        machine_gaps[k] = []
+                    insort(machine_gaps[k], piece)
+            schedule[job] = (start, end, resource)
+            if end > makespan:
+                makespan = end
+            for after in self.successors[job]:
+                if end > ready[after]:
+                    ready[after] = end
+                waiting[after] -= 1
+                if waiting[after] == 0:
+                    heapq.heappush(eligible, (ready[after], position[after], after) if non_delay else (position[after], after))
+        return schedule, makespan
+
+    def random_machines(self, rng):
+        return [rng.choice(machines) for machines in self.allowed]
+
+def order_crossover(parent1, parent2, rng):
+    # OX: keep a slice of parent1, fill the rest in parent2's order
+    size = len(parent1)
+    a, b = sorted(rng.sample(range(size + 1), 2))
+    kept = set(parent1[a:b])
+    rest = [job for job in parent2 if job not in kept]
+    return rest[:a] + parent1[a:b] + rest[a:]
+
+def pmx_crossover(parent1, parent2, rng):
+    # PMX: copy a slice of parent1, place parent2's displaced jobs through the slice mapping
+    size = len(parent1)
+    a, b = sorted(rng.sample(range(size + 1), 2))
+    child = [None] * size
+    child[a:b] = parent1[a:b]
+    index_in_parent2 = {job: i for i, job in enumerate(parent2)}
+    kept = set(parent1[a:b])
+    for i in range(a, b):
+        job = parent2[i]
+        if job in kept:
+            continue
+        spot = i
+        while a <= spot < b:
+            spot = index_in_parent2[parent1[spot]]
+        child[spot] = job
+    for i in range(size):
+        if child[i] is None:
+            child[i] = parent2[i]
+    return child
+
+def swap_mutation(permutation, rng):
+    i, j = rng.randrange(len(permutation)), rng.randrange(len(permutation))
+    permutation[i], permutation[j] = permutation[j], permutation[i]
+
+def insert_mutation(permutation, rng):
+    job = permutation.pop(rng.randrange(len(permutation)))
+    permutation.insert(rng.randrange(len(permutation) + 1), job)
+
+CROSSOVERS = {'ox': order_crossover, 'pmx': pmx_crossover}
+MUTATIONS = {'swap': swap_mutation, 'insert': insert_mutation}
+
+def evolve_permutations(decoder, population, generations, rng, crossover='ox', mutation='swap', mutation_rate=0.2, stats=None, budget=None):
+    # population: list of [makespan, permutation, machine_keys]; makespans are computed once per child.
+    # A budget ends the run early, between generations
+    cross = CROSSOVERS[crossover]
+    mutate_permutation = MUTATIONS[mutation]
+    population_size = len(population)
+    population.sort(key=lambda individual: individual[0])
+    for generation in range(generations):
+        if budget is not None and budget.interrupted():
+            break
+        next_gen = population[:max(2, population_size // 2)]
+        while len(next_gen) < population_size:
+            (_, perm1, keys1), (_, perm2, keys2) = rng.sample(next_gen, 2)
+            child = cross(perm1, perm2, rng)
+            keys = None if keys1 is None else [k1 if rng.random() < 0.5 else k2 for k1, k2 in zip(keys1, keys2)]
+            if rng.random() < mutation_rate:
+                mutate_permutation(child, rng)
+                if keys is not None:
+                    job = rng.randrange(len(keys))
+                    keys[job] = rng.choice(decoder.allowed[job])
+            next_gen.append([decoder.decode(child, keys)[1], child, keys])
+        next_gen.sort(key=lambda individual: individual[0])
+        population = next_gen
+        if stats is not None:
+            stats.count('evaluations', population_size - max(2, population_size // 2))
+            diversity = len({tuple(perm) for _, perm, _ in population}) / population_size
+            stats.generation(generation + 1, population[0][0], diversity)
+    return population
+
+def random_permutation_population(decoder, population_size, auto_split, rng):
+    population = []
+    for _ in range(population_size):
+        permutation = list(range(len(decoder.job_durations)))
+        rng.shuffle(permutation)
+        keys = None if auto_split else decoder.random_machines(rng)
+        population.append([decoder.decode(permutation, keys)[1], permutation, keys])
+    return population
+
+def permutation_genetic_algorithm(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, population_size=50, generations=100, crossover='ox', mutation='swap', mutation_rate=0.2, schedule_type='active', seed=None, time_limit=None, cancel=None, stats=None):
+    if crossover not in CROSSOVERS:
+        raise ValueError(f"Unknown crossover '{crossover}'. Choose one of: {', '.join(CROSSOVERS)}")
+    if mutation not in MUTATIONS:
+        raise ValueError(f"Unknown mutation '{mutation}'. Choose one of: {', '.join(MUTATIONS)}")
+    rng = random.Random(seed)
+    budget = SolveBudget(time_limit, None, cancel)
+    decoder = PermutationDecoder(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, schedule_type)
+    # With auto_split the decoder picks the machine, otherwise every chromosome carries machine keys
+    with timed_phase(stats, 'initial_population'):
+        population = random_permutation_population(decoder, max(2, population_size), auto_split, rng)
+    if stats is not None:
+        stats.count('evaluations', len(population))
+    with timed_phase(stats, 'evolve'):
+        population = evolve_permutations(decoder, population, generations, rng, crossover, mutation, mutation_rate, stats, budget)
+    _, permutation, keys = population[0]
+    return decoder.decode(permutation, keys)
@@ -0,0 +1,409 @@
+import inspect
+import json
+import multiprocessing
+import os
+import statistics
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .api import METHODS, solver_function
+from .budget import SolveBudget
+from .decomposition import job_heads
+from .dispatching import best_dispatch
+from .instrumentation import timed_phase
+from .local_search import tabu_search
+from .ordering import job_tails, topological_order
+from .propagation import propagate
+
+# ----------------------------
+# Instance Features
+# ----------------------------
+
+FEATURES = ('num_jobs', 'num_resources', 'precedence_density', 'capacity_slack', 'duration_spread',
+            'forbidden_density', 'release_fraction', 'lower_bound')
+
+def instance_features(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints):
+    # Linear-time summary of an instance for the selection policy. precedence_density is the
+    # share of possible edges present, capacity_slack the share of machine slots a schedule as
+    # long as the critical path leaves idle (0 when the machines are the bottleneck),
+    # duration_spread the coefficient of variation of the durations. lower_bound is the longer
+    # of the critical path and the total work spread over all slots (rounded up for integers)
+    num_jobs = len(job_durations)
+    order = topological_order(num_jobs, precedence_constraints)
+    head = job_heads(job_durations, precedence_constraints, temporal_constraints, order)
+    tail = job_tails(job_durations, precedence_constraints, order)
+    critical_path = max((head[job] + tail[job] for job in range(num_jobs)), default=0)
+    slots = sum(min(capacity, num_jobs) for capacity in machine_capacities)
+    work = sum(job_durations)
+    mean = work / num_jobs if num_jobs else 0
+    spread = (sum((duration - mean) ** 2 for duration in job_durations) / num_jobs) ** 0.5 / mean if mean else 0.0
+    return {
+        'num_jobs': num_jobs,
+        'num_resources': num_resources,
+        'precedence_density': 2 * len(precedence_constraints) / (num_jobs * (num_jobs - 1)) if num_jobs > 1 else 0.0,
+        'capacity_slack': max(0.0, 1 - work / (slots * critical_path)) if slots and critical_path else 0.0,
+        'duration_spread': spread,
+        'forbidden_density': len(resource_constraints) / (num_jobs * num_resources) if num_jobs and num_resources else 0.0,
+        'release_fraction': sum(1 for release in temporal_constraints.values() if release > 0) / num_jobs if num_jobs else 0.0,
+        'lower_bound': max(critical_path, -(-work // slots) if isinstance(work, int) else work / slots) if slots else critical_path,
+    }
+
+# ----------------------------
+# Exact Subset Dynamic Program
+# ----------------------------
+
+DP_MAX_JOBS = 16
+
+def machine_pools(num_jobs, num_resources, resource_constraints, machine_capacities):
+    # Machines that take the same jobs are interchangeable, and a machine of capacity c is c
+    # independent slots, so such machines merge into one pool of slots. Returns the machines of
+    # every pool and the pools each job may use
+    forbidden = [set() for _ in range(num_resources)]
+    for job, resource in resource_constraints:
+        forbidden[resource].add(job)
+    pools = {}
+    for resource in range(num_resources):
+        if machine_capacities[resource] > 0 and len(forbidden[resource]) < num_jobs:
+            pools.setdefault(frozenset(forbidden[resource]), []).append(resource)
+    members = list(pools.values())
+    allowed = [[pool for pool, machines in enumerate(members) if job not in forbidden[machines[0]]] for job in range(num_jobs)]
+    return members, allowed
+
+def assign_machines(placements, job_durations, members, machine_capacities):
+    # Concrete machines for (job, start, pool) placements: per pool, jobs in start order take
+    # the lowest free slot, and the slots are dealt out to the pool's machines by capacity
+    schedule = {}
+    for pool, machines in enumerate(members):
+        owners = [machine for machine in machines for _ in range(min(machine_capacities[machine], len(job_durations)))]
+        free = [0] * len(owners)
+        for start, job in sorted((start, job) for job, start, used in placements if used == pool):
+            slot = next(slot for slot in range(len(owners)) if free[slot] <= start)
+            free[slot] = start + job_durations[job]
+            schedule[job] = (start, free[slot], owners[slot])
+    return schedule
+
+def dynamic_programming(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, max_jobs=DP_MAX_JOBS, time_limit=None, cancel=None, callback=None, stats=None):
+    # Exact for very small instances. The states are the sets of jobs placed so far, added in
+    # start order; a label of a set holds the last start, the sorted free times of every
+    # pool's slots and the end times of the placed jobs that still have successors to place.
+    # A label no later in all of those than another one of the same set is dominated, so each
+    # set keeps its Pareto front only. Adding a job tries every pool it may use and every
+    # distinct slot free time there, starting as early as that allows; every schedule can be
+    # left-shifted into one built this way, so the last layer holds an optimum. Jobs still to
+    # place start no earlier than the last start, so labels whose bound (longest tail from
+    # there, or the work still to do spread over all slots) reaches the incumbent (the best
+    # dispatching rule, improved by a short tabu search) are dropped. Returns (schedule,
+    # makespan, lower_bound) with lower_bound == makespan, unless the budget ran out: then the
+    # incumbent comes back with the static bound. Slots pick the machines, so auto_split has
+    # no effect
+    num_jobs = len(job_durations)
+    if num_jobs > max_jobs:
+        raise ValueError(f"The subset dynamic program takes at most {max_jobs} jobs, this problem has {num_jobs}")
+    domains = propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    budget = SolveBudget(time_limit, None, cancel, callback)
+    best_schedule, best_makespan = best_dispatch(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    if domains.horizon < best_makespan:
+        best_schedule, best_makespan = dict(domains.schedule), domains.horizon
+    if best_makespan > domains.lower_bound():
+        schedule, makespan = tabu_search(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, iterations=200, seed=0)
+        if makespan < best_makespan:
+            best_schedule, best_makespan = schedule, makespan
+    budget.improved(best_schedule, best_makespan, 0)
+
+    members, allowed = machine_pools(num_jobs, num_resources, resource_constraints, machine_capacities)
+    num_slots = sum(min(machine_capacities[machine], num_jobs) for machines in members for machine in machines)
+    integral = all(isinstance(duration, int) for duration in job_durations)
+
+    def spread(total):
+        # Makespan bound of `total` busy time over all slots, rounded up for integer durations
+        return -(-total // num_slots) if integral else total / num_slots
+
+    lower_bound = max(domains.lower_bound(), spread(sum(job_durations)))
+    release = [temporal_constraints.get(job, 0) for job in range(num_jobs)]
+    predecessors = [[] for _ in range(num_jobs)]
+    required = [0] * num_jobs
+    following = [0] * num_jobs
+    for before, after in precedence_constraints:
+        predecessors[after].append(before)
+        required[after] |= 1 << before
+        following[before] |= 1 << after
+    tail = domains.tail
+    remaining = {}
+    open_jobs = {}
+
+    # label: (key, slots, ends, parent); parent is (label, job, start, pool)
+    layer = {0: [((), tuple(tuple([0] * sum(min(machine_capacities[machine], num_jobs) for machine in machines)) for machines in members), (0,) * num_jobs, None)]}
+    finished = True
+    with timed_phase(stats, 'subsets'):
+        for _ in range(num_jobs if best_makespan > lower_bound else 0):
+            next_layer = {}
+            for placed, labels in layer.items():
+                if budget.interrupted():
+                    finished = False
+                    break
+                for label in labels:
+                    key, slots, ends, _ = label
+                    latest = key[0] if key else 0
+                    makespan = max((free[-1] for free in slots if free), default=0)
+                    for job in range(num_jobs):
+                        if placed >> job & 1 or required[job] & ~placed:
+                            continue
+                        ready = max([release[job]] + [ends[before] for before in predecessors[job]])
+                        subset = placed | 1 << job
+                        if subset not in open_jobs:
+                            open_jobs[subset] = [other for other in range(num_jobs) if subset >> other & 1 and following[other] & ~subset]
+                            unplaced = [other for other in range(num_jobs) if not subset >> other & 1]
+                            remaining[subset] = (sum(job_durations[other] for other in unplaced), max((tail[other] for other in unplaced), default=0))
+                        for pool in allowed[job]:
+                            free_times = slots[pool]
+                            for index, free in enumerate(free_times):
+                                if index and free == free_times[index - 1]:
+                                    continue
+                                start = max(ready, free, latest)
+                                end = start + job_durations[job]
+                                work, longest = remaining[subset]
+                                if max(makespan, start + max(tail[job], longest)) >= best_makespan:
+                                    continue
+                                pool_slots = tuple(sorted(free_times[:index] + (end,) + free_times[index + 1:]))
+                                new_slots = slots[:pool] + (pool_slots,) + slots[pool + 1:]
+                                if spread(sum(max(other, start) for times in new_slots for other in times) + work) >= best_makespan:
+                                    continue
+                                new_ends = ends[:job] + (end,) + ends[job + 1:]
+                                if any(new_ends[other] + tail[other] - job_durations[other] >= best_makespan for other in open_jobs[subset]):
+                                    continue
+                                key = (start,) + sum(new_slots, ()) + tuple(new_ends[other] for other in open_jobs[subset])
+                                front = next_layer.setdefault(subset, [])
+                                if any(all(a <= b for a, b in zip(other[0], key)) for other in front):
+                                    continue
+                                front[:] = [other for other in front if not all(a <= b for a, b in zip(key, other[0]))]
+                                front.append((key, new_slots, new_ends, (label, job, start, pool)))
+            if not finished:
+                break
+            layer = next_layer
+            if stats is not None:
+                stats.count('labels', sum(len(labels) for labels in layer.values()))
+
+    if finished and best_makespan > lower_bound and layer:
+        # Every label of the full set is a complete schedule shorter than the incumbent
+        label = min(layer[(1 << num_jobs) - 1], key=lambda label: max(free[-1] for free in label[1] if free))
+        best_makespan = max(free[-1] for free in label[1] if free)
+        placements = []
+        while label[3] is not None:
+            label, job, start, pool = label[3]
+            placements.append((job, start, pool))
+        best_schedule = assign_machines(placements, job_durations, members, machine_capacities)
+        budget.improved(best_schedule, best_makespan, num_jobs)
+    return best_schedule, best_makespan, best_makespan if finished else lower_bound
+
+# ----------------------------
+# Selection Policy
+# ----------------------------
+
+# A policy is a list of rules tried in order; the first whose bounds all hold picks the method.
+# Bounds are 'max_<feature>' / 'min_<feature>' keys over instance_features(), 'options' are
+# passed to the method on top of METHOD_OPTIONS. The last rule should have no bounds so that
+# every instance matches. The defaults come from benchmark runs on random and job-shop
+# instances: the dynamic program proves small instances optimal in well under a second, the
+# tree search is quick while machines are mostly interchangeable but slow and poor on job
+# shops (most machines forbidden), where tabu search wins; the largest instances are split
+DEFAULT_POLICY = [
+    {'max_num_jobs': 14, 'method': 'dynamic_programming'},
+    {'max_num_jobs': 40, 'max_forbidden_density': 0.5, 'method': 'branch_and_bound'},
+    {'max_num_jobs': 1000, 'method': 'tabu_search'},
+    {'method': 'rolling_horizon'},
+]
+
+# Options the portfolio runs a method with unless the rule says otherwise: the tree searches
+# get a node limit, so that a wrong pick returns late instead of never
+METHOD_OPTIONS = {
+    'branch_and_bound': {'node_limit': 20000},
+    'backtracking': {'node_limit': 20000},
+    'parallel_branch_and_bound': {'node_limit': 20000},
+}
+
+# Upper job counts of the size buckets calibrate() picks a method for
+SIZE_BUCKETS = (14, 40, 200, 1000)
+
+def rule_matches(rule, features):
+    for key, value in rule.items():
+        if key.startswith('max_') and features[key[4:]] > value:
+            return False
+        if key.startswith('min_') and features[key[4:]] < value:
+            return False
+    return True
+
+def select_method(features, policy=None):
+    # (method, options) of the first matching rule
+    for rule in policy or DEFAULT_POLICY:
+        if rule_matches(rule, features):
+            return rule['method'], {**METHOD_OPTIONS.get(rule['method'], {}), **rule.get('options', {})}
+    raise ValueError("No rule of the policy matches this instance; end the policy with a rule without bounds")
+
+def check_policy(policy):
+    for rule in policy:
+        if rule.get('method') not in METHODS or rule['method'] in ('auto', 'race'):
+            raise ValueError(f"Policy rule {rule} needs a 'method' from: {', '.join(name for name in METHODS if name not in ('auto', 'race'))}")
+        for key in rule:
+            if key not in ('method', 'options') and not (key[:4] in ('max_', 'min_') and key[4:] in FEATURES):
+                raise ValueError(f"Unknown policy key '{key}'. Bounds are max_ or min_ followed by one of: {', '.join(FEATURES)}")
+    return policy
+
+def calibrate(results, buckets=SIZE_BUCKETS, tolerance=0.02, min_adequacy=0.8, fallback=None):
+    # Policy from benchmark rows that carry instance 'features' (see benchmark.run_benchmark).
+    # A method is adequate on an instance when its median makespan is within tolerance of the
+    # best median makespan any method reached there. Per size bucket the method with the lowest
+    # median wall time among those adequate on at least min_adequacy of the bucket's instances
+    # wins (the most often adequate one when none is); buckets without runs fall through to the
+    # fallback policy, which ends the calibrated one
+    runs = {}
+    sizes = {}
+    for row in results:
+        if not row.get('features'):
+            raise ValueError(f"The run of {row['solver']} on {row['instance']} has no instance features; rerun the benchmark")
+        sizes[row['instance']] = row['features']['num_jobs']
+        runs.setdefault((row['instance'], row['solver']), []).append(row)
+    summary = {}
+    for key, rows in runs.items():
+        makespans = [row['makespan'] for row in rows if row['makespan'] is not None]
+        summary[key] = (statistics.median(makespans) if makespans else float('inf'), statistics.median(row['wall_time'] for row in rows))
+    best = {}
+    for (instance, _), (makespan, _) in summary.items():
+        best[instance] = min(best.get(instance, float('inf')), makespan)
+
+    scores = {}
+    for (instance, solver), (makespan, wall_time) in summary.items():
+        bucket = next((index for index, upper in enumerate(buckets) if sizes[instance] <= upper), len(buckets))
+        adequate = makespan <= best[instance] * (1 + tolerance)
+        scores.setdefault(bucket, {}).setdefault(solver, []).append((adequate, wall_time))
+    policy = []
+    for bucket in sorted(scores):
+        ranking = []
+        for solver, entries in scores[bucket].items():
+            adequacy = sum(adequate for adequate, _ in entries) / len(entries)
+            wall_time = statistics.median(wall_time for _, wall_time in entries)
+            ranking.append((adequacy < min_adequacy, -adequacy if adequacy < min_adequacy else 0, wall_time, solver))
+        rule = {'method': min(ranking)[3]}
+        if bucket > 0:
+            rule['min_num_jobs'] = buckets[bucket - 1] + 1
+        if bucket < len(buckets):
+            rule['max_num_jobs'] = buckets[bucket]
+        policy.append(rule)
+    return policy + list(fallback or DEFAULT_POLICY)
+
+def save_policy(policy, path):
+    with open(path, 'w') as f:
+        json.dump(check_policy(policy), f, indent=2)
+
+def load_policy(path):
+    with open(path) as f:
+        return check_policy(json.load(f))
+
+# ----------------------------
+# Parallel Race
+# ----------------------------
+
+# Each race worker gets the shared stop event in the pool initializer and hands it to its
+# solver as cancel
+race_stop = None
+
+def init_race_worker(stop):
+    global race_stop
+    race_stop = stop
+
+def run_racer(task):
+    method, problem, options = task
+    function = solver_function(method)
+    if 'cancel' in inspect.signature(function).parameters:
+        options['cancel'] = race_stop
+    result = function(*problem, **options)
+    return result[0], result[1], len(result) > 2 and result[0] is not None and result[2] == result[1]
+
+def race_candidates(features, policy=None):
+    # The policy's pick, both local searches and the dispatching rules, plus the exact methods
+    # where they have a chance to finish
+    methods = [select_method(features, policy)[0], 'tabu_search', 'simulated_annealing', 'dispatching']
+    if features['num_jobs'] <= DP_MAX_JOBS:
+        methods.append('dynamic_programming')
+    if features['num_jobs'] <= 60:
+        methods.append('branch_and_bound')
+    return list(dict.fromkeys(methods))
+
+def race(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, methods=None, policy=None, time_limit=None, workers=None, cancel=None, callback=None, stats=None):
+    # Runs the methods in parallel processes against one deadline. The first proven optimum
+    # (a method's lower bound meets its makespan, or the makespan meets the instance lower
+    # bound) stops the others; at the deadline or on cancel they are all stopped. Stopped
+    # methods still return their incumbents, and the best of everything returned wins.
+    # Methods without cancel support run to their own limits. Returns (schedule, makespan,
+    # lower_bound) like branch_and_bound
+    features = instance_features(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    methods = methods or race_candidates(features, policy)
+    # Plain lists and dicts, so mapped instances pickle to the workers
+    problem = (list(job_durations), num_resources, list(precedence_constraints), list(resource_constraints), list(machine_capacities), auto_split, dict(temporal_constraints))
+    tasks = []
+    for method in methods:
+        options = dict(METHOD_OPTIONS.get(method, {}))
+        if time_limit is not None and 'time_limit' in inspect.signature(solver_function(method)).parameters:
+            options['time_limit'] = time_limit
+        tasks.append((method, problem, options))
+    budget = SolveBudget(time_limit, None, cancel, callback)
+    best_schedule, best_makespan, proven = None, float('inf'), False
+    errors = []
+    stop = multiprocessing.Event()
+    workers = workers or min(len(tasks), os.cpu_count() or 1)
+    with timed_phase(stats, 'race'), ProcessPoolExecutor(max_workers=workers, initializer=init_race_worker, initargs=(stop,)) as pool:
+        pending = {pool.submit(run_racer, task) for task in tasks}
+        while pending:
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    schedule, makespan, optimal = future.result()
+                except Exception as e:
+                    # One failing method (infeasible input, RecursionError, a dead worker, ...)
+                    # counts as a failed entry; the others keep racing
+                    errors.append(e)
+                    continue
+                if schedule is None:
+                    continue
+                optimal = optimal or makespan <= features['lower_bound']
+                if makespan < best_makespan or (makespan == best_makespan and optimal and not proven):
+                    best_schedule, best_makespan, proven = schedule, makespan, proven or optimal
+                    budget.improved(schedule, makespan, len(tasks) - len(pending))
+            if proven or budget.interrupted():
+                stop.set()
+    if stats is not None:
+        stats.count('racers', len(tasks))
+        stats.count('racer_errors', len(errors))
+    if best_schedule is None and errors:
+        raise errors[0]
+    return best_schedule, best_makespan, best_makespan if proven else features['lower_bound']
+
+# ----------------------------
+# Automatic Selection
+# ----------------------------
+
+def auto(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, policy=None, parallel=False, methods=None, workers=None, time_limit=None, cancel=None, callback=None, seed=None, stats=None):
+    # Picks the method from the instance features and the policy (a rule list or the path of
+    # a saved one, DEFAULT_POLICY when None) and returns (schedule, makespan, lower_bound) on
+    # every path: the method's own lower bound when it gives one, the instance lower bound
+    # otherwise. With parallel=True the policy's pick races the other candidates instead (see race)
+    if isinstance(policy, str):
+        policy = load_policy(policy)
+    if parallel:
+        return race(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints,
+                    methods, policy, time_limit, workers, cancel, callback, stats)
+    with timed_phase(stats, 'features'):
+        features = instance_features(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    # The dispatching rules cost little more than the features; one that meets the lower bound
+    # is optimal, and nothing else needs to run
+    with timed_phase(stats, 'dispatch'):
+        schedule, makespan = best_dispatch(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    if makespan <= features['lower_bound']:
+        if stats is not None:
+            stats.count('dispatch_optimal')
+        return schedule, makespan, makespan
+    method, options = select_method(features, policy)
+    accepted = inspect.signature(solver_function(method)).parameters
+    for name, value in (('time_limit', time_limit), ('cancel', cancel), ('callback', callback), ('seed', seed), ('stats', stats)):
+        if value is not None and name in accepted:
+            options[name] = value
+    result = solver_function(method)(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, **options)
+    return result[0], result[1], result[2] if len(result) > 2 else features['lower_bound']
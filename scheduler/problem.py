@@ -0,0 +1,91 @@
+import json
+
+# ----------------------------
+# Problem Definition
+# ----------------------------
+
+class InfeasibleError(ValueError):
+    # No schedule exists. certificate is a JSON-friendly dict naming the reason and the
+    # jobs / machines that prove it, e.g. {'reason': 'cycle', 'cycle': [2, 5, 2]}
+    def __init__(self, message, certificate):
+        super().__init__(message)
+        self.certificate = certificate
+
+class Problem:
+    # Everything a solver needs, passed explicitly instead of through module globals.
+    # Jobs and machines are 0-based; temporal_constraints maps job -> release time
+    def __init__(self, job_durations, num_resources, precedence_constraints=(), resource_constraints=(), machine_capacities=None, temporal_constraints=None, auto_split=False):
+        self.job_durations = [int(duration) for duration in job_durations]
+        self.num_resources = int(num_resources)
+        self.precedence_constraints = [(int(before), int(after)) for before, after in precedence_constraints]
+        self.resource_constraints = [(int(job), int(resource)) for job, resource in resource_constraints]
+        self.machine_capacities = [1] * self.num_resources if machine_capacities is None else [int(capacity) for capacity in machine_capacities]
+        self.temporal_constraints = {int(job): int(release) for job, release in (temporal_constraints or {}).items()}
+        self.auto_split = bool(auto_split)
+        self.validate()
+
+    @property
+    def num_jobs(self):
+        return len(self.job_durations)
+
+    def validate(self):
+        num_jobs = self.num_jobs
+        if self.num_resources <= 0:
+            raise ValueError("A problem needs at least one machine")
+        if any(duration <= 0 for duration in self.job_durations):
+            raise ValueError("Job durations must be positive")
+        if len(self.machine_capacities) != self.num_resources or any(capacity <= 0 for capacity in self.machine_capacities):
+            raise ValueError(f"Expected {self.num_resources} positive machine capacities")
+        for before, after in self.precedence_constraints:
+            if not (0 <= before < num_jobs and 0 <= after < num_jobs) or before == after:
+                raise ValueError(f"Invalid precedence constraint ({before}, {after})")
+        for job, resource in self.resource_constraints:
+            if not (0 <= job < num_jobs and 0 <= resource < self.num_resources):
+                raise ValueError(f"Invalid resource constraint ({job}, {resource})")
+        for job, release in self.temporal_constraints.items():
+            if not 0 <= job < num_jobs or release < 0:
+                raise ValueError(f"Invalid release time {release} for job {job}")
+
+    def copy(self):
+        return Problem(self.job_durations, self.num_resources, self.precedence_constraints, self.resource_constraints,
+                       self.machine_capacities, self.temporal_constraints, self.auto_split)
+
+    def args(self):
+        # Positional arguments shared by every solver function
+        return (self.job_durations, self.num_resources, self.precedence_constraints, self.resource_constraints,
+                self.machine_capacities, self.auto_split, self.temporal_constraints)
+
+    def to_dict(self):
+        return {
+            'job_durations': self.job_durations,
+            'num_resources': self.num_resources,
+            'precedence_constraints': [list(pair) for pair in self.precedence_constraints],
+            'resource_constraints': [list(pair) for pair in self.resource_constraints],
+            'machine_capacities': self.machine_capacities,
+            'temporal_constraints': {str(job): release for job, release in self.temporal_constraints.items()},
+            'auto_split': self.auto_split,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['job_durations'], data['num_resources'], data.get('precedence_constraints', ()),
+                   data.get('resource_constraints', ()), data.get('machine_capacities'),
+                   data.get('temporal_constraints'), data.get('auto_split', False))
+
+    @classmethod
+    def from_tuple(cls, problem, auto_split=False):
+        # The (durations, machines, precedence, forbidden, capacities, releases) tuple used by the benchmarks
+        job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints = problem
+        return cls(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, auto_split)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def __repr__(self):
+        return f"Problem({self.num_jobs} jobs, {self.num_resources} machines, {len(self.precedence_constraints)} precedence constraints)"
@@ -0,0 +1,107 @@
+from .ordering import job_tails, topological_order
+from .problem import InfeasibleError
+from .state import ScheduleState
+
+# ----------------------------
+# Constraint Propagation
+# ----------------------------
+
+class Domains:
+    # Reduced search space shared by the solvers. Every schedule with makespan <= horizon
+    # (in particular every optimal one) starts each job within
+    # [earliest_start[job], latest_start[job]] on one of allowed[job]
+    def __init__(self, order, allowed, earliest_start, tail, horizon, job_durations, schedule=None):
+        self.order = order
+        self.allowed = allowed
+        self.earliest_start = earliest_start
+        self.tail = tail
+        self.horizon = horizon
+        # Latest finish leaves room for the longest chain of successors before the horizon
+        self.latest_finish = [horizon - (tail[job] - job_durations[job]) for job in range(len(job_durations))]
+        self.latest_start = [self.latest_finish[job] - job_durations[job] for job in range(len(job_durations))]
+        # Feasible schedule whose makespan is the horizon (None when a deadline was given)
+        self.schedule = schedule
+
+    def lower_bound(self):
+        return max((self.earliest_start[job] + self.tail[job] for job in range(len(self.tail))), default=0)
+
+def propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, deadline=None):
+    # Raises InfeasibleError with a certificate when no schedule exists (or none meets the deadline)
+    num_jobs = len(job_durations)
+    order = topological_order(num_jobs, precedence_constraints)
+
+    forbidden = set(resource_constraints)
+    allowed = [[r for r in range(num_resources) if (job, r) not in forbidden and machine_capacities[r] > 0] for job in range(num_jobs)]
+    for job in range(num_jobs):
+        if not allowed[job]:
+            raise InfeasibleError(f"Job {job+1} is forbidden on every machine", {'reason': 'no_machine', 'job': job})
+
+    predecessors = [[] for _ in range(num_jobs)]
+    for before, after in precedence_constraints:
+        predecessors[after].append(before)
+    earliest_start = [0] * num_jobs
+    for job in order:
+        earliest_start[job] = max([temporal_constraints.get(job, 0)] + [earliest_start[before] + job_durations[before] for before in predecessors[job]])
+    tail = job_tails(job_durations, precedence_constraints, order)
+
+    if deadline is not None:
+        check_deadline(job_durations, predecessors, machine_capacities, allowed, earliest_start, tail, deadline)
+        return Domains(order, allowed, earliest_start, tail, deadline, job_durations)
+
+    # Without a deadline the horizon is the makespan of a list schedule (longest tail first,
+    # earliest start on any allowed machine), which always exists and bounds the optimum
+    state = ScheduleState(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    for job in topological_order(num_jobs, precedence_constraints, lambda job: (-tail[job], job)):
+        ready = state.min_start(job)
+        best = None
+        for resource in allowed[job]:
+            for start in state.candidate_starts(resource, ready):
+                if state.is_valid(job, start, resource):
+                    if best is None or start < best[0]:
+                        best = (start, resource)
+                    break
+        state.place(job, *best)
+    horizon = max((end for _, end, _ in state.schedule.values()), default=0)
+    return Domains(order, allowed, earliest_start, tail, horizon, job_durations, state.schedule)
+
+def check_deadline(job_durations, predecessors, machine_capacities, allowed, earliest_start, tail, deadline):
+    # Time windows: the longest chain through a job must fit before the deadline
+    for job in range(len(job_durations)):
+        if earliest_start[job] + tail[job] > deadline:
+            raise InfeasibleError(
+                f"Job {job+1} cannot finish its chain of successors by {deadline}: it starts at {earliest_start[job]} at the earliest "
+                f"and the chain takes {tail[job]} time units",
+                {'reason': 'window', 'job': job, 'earliest_start': earliest_start[job], 'latest_start': deadline - tail[job],
+                 'path': critical_chain(job, job_durations, predecessors, earliest_start, tail)})
+    # Energy: jobs tied to one machine must fit in its capacity before the deadline
+    for resource, capacity in enumerate(machine_capacities):
+        bound = [job for job in range(len(job_durations)) if allowed[job] == [resource]]
+        if not bound:
+            continue
+        start = min(earliest_start[job] for job in bound)
+        work = sum(job_durations[job] for job in bound)
+        if work > capacity * (deadline - start):
+            raise InfeasibleError(
+                f"Machine {resource+1} needs {work} time units for the jobs only it can run but has {capacity * (deadline - start)} before {deadline}",
+                {'reason': 'overload', 'resource': resource, 'jobs': bound, 'work': work, 'available': capacity * (deadline - start)})
+
+def critical_chain(job, job_durations, predecessors, earliest_start, tail):
+    # The precedence path that forces the window violation: back along the predecessors that
+    # set the earliest start, forward along the successors that set the tail
+    successors = [[] for _ in job_durations]
+    for after, befores in enumerate(predecessors):
+        for before in befores:
+            successors[before].append(after)
+    path = [job]
+    current = job
+    while True:
+        tight = [before for before in predecessors[current] if earliest_start[before] + job_durations[before] == earliest_start[current]]
+        if not tight:
+            break
+        current = tight[0]
+        path.insert(0, current)
+    current = job
+    while successors[current]:
+        current = max(successors[current], key=lambda after: tail[after])
+        path.append(current)
+    return path
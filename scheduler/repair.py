@@ -0,0 +1,243 @@
+import random
+
+from .ordering import topological_order
+from .problem import Problem
+from .state import ScheduleState
+
+# ----------------------------
+# Schedule Deltas
+# ----------------------------
+
+# Each delta updates a copy of the problem (and schedule) and returns the jobs it directly
+# disturbs plus, per machine, the time from which that machine's timeline is re-laid
+
+def check_job(problem, schedule, job):
+    if not 0 <= job < problem.num_jobs or job not in schedule:
+        raise ValueError(f"Job {job} is not in the schedule")
+
+class NewJob:
+    def __init__(self, duration, predecessors=(), successors=(), forbidden=(), release=0):
+        self.duration = duration
+        self.predecessors = predecessors
+        self.successors = successors
+        self.forbidden = forbidden
+        self.release = release
+
+    def apply(self, problem, schedule, outages):
+        job = problem.num_jobs
+        problem.job_durations.append(int(self.duration))
+        problem.precedence_constraints.extend((before, job) for before in self.predecessors)
+        problem.precedence_constraints.extend((job, after) for after in self.successors)
+        problem.resource_constraints.extend((job, resource) for resource in self.forbidden)
+        if self.release:
+            problem.temporal_constraints[job] = int(self.release)
+        return {job}, {}
+
+class ChangeDuration:
+    def __init__(self, job, duration):
+        self.job = job
+        self.duration = duration
+
+    def apply(self, problem, schedule, outages):
+        check_job(problem, schedule, self.job)
+        problem.job_durations[self.job] = int(self.duration)
+        start, _, resource = schedule[self.job]
+        # A shorter job frees time, so the rest of its machine may move up as well
+        return {self.job}, {resource: start}
+
+class AddPrecedence:
+    def __init__(self, before, after):
+        self.before = before
+        self.after = after
+
+    def apply(self, problem, schedule, outages):
+        check_job(problem, schedule, self.before)
+        check_job(problem, schedule, self.after)
+        problem.precedence_constraints.append((self.before, self.after))
+        if schedule[self.after][0] >= schedule[self.before][1]:
+            return set(), {}
+        return {self.after}, {}
+
+class MachineOutage:
+    # The machine is unavailable in [start, end)
+    def __init__(self, resource, start, end):
+        self.resource = resource
+        self.start = start
+        self.end = end
+
+    def apply(self, problem, schedule, outages):
+        if not 0 <= self.resource < problem.num_resources or self.end <= self.start:
+            raise ValueError(f"Invalid outage {self.start}-{self.end} on machine {self.resource}")
+        outages.append((self.resource, self.start, self.end))
+        hit = {job for job, (start, end, resource) in schedule.items() if resource == self.resource and start < self.end and end > self.start}
+        return hit, {self.resource: self.start} if hit else {}
+
+class Release:
+    def __init__(self, job, time):
+        self.job = job
+        self.time = time
+
+    def apply(self, problem, schedule, outages):
+        check_job(problem, schedule, self.job)
+        old = problem.temporal_constraints.get(self.job, 0)
+        problem.temporal_constraints[self.job] = int(self.time)
+        if schedule[self.job][0] >= self.time and self.time >= old:
+            return set(), {}
+        return {self.job}, {}
+
+class RemoveJob:
+    # Later jobs are renumbered down by one, so job indices stay contiguous
+    def __init__(self, job):
+        self.job = job
+
+    def apply(self, problem, schedule, outages):
+        removed = self.job
+        check_job(problem, schedule, removed)
+        successors = [after for before, after in problem.precedence_constraints if before == removed]
+        start, _, resource = schedule.pop(removed)
+
+        def renumber(job):
+            return job - 1 if job > removed else job
+
+        del problem.job_durations[removed]
+        problem.precedence_constraints = [(renumber(before), renumber(after)) for before, after in problem.precedence_constraints if removed not in (before, after)]
+        problem.resource_constraints = [(renumber(job), resource) for job, resource in problem.resource_constraints if job != removed]
+        problem.temporal_constraints = {renumber(job): release for job, release in problem.temporal_constraints.items() if job != removed}
+        renumbered = {renumber(job): entry for job, entry in schedule.items()}
+        schedule.clear()
+        schedule.update(renumbered)
+        # Nothing becomes infeasible; successors and the rest of the machine may move up
+        return {renumber(after) for after in successors}, {resource: start}
+
+# ----------------------------
+# Incremental Repair
+# ----------------------------
+
+class IncrementalScheduler:
+    # Keeps a problem, its schedule and the known machine outages. apply() re-places only the
+    # downstream precedence cone of the disturbed jobs and the disturbed machine timelines;
+    # every other job keeps its start and machine
+    def __init__(self, problem, schedule, outages=()):
+        self.problem = problem.copy()
+        self.schedule = dict(schedule)
+        self.outages = list(outages)
+        self.affected = set()
+        self.moved = set()
+
+    def makespan(self):
+        return max((end for _, end, _ in self.schedule.values()), default=0)
+
+    def apply(self, delta, iterations=0, seed=None):
+        # Returns (schedule, makespan). iterations > 0 tries that many adjacent swaps of the
+        # re-placement order and keeps the ones that help. A delta that fails (bad index,
+        # precedence cycle) raises ValueError and leaves the scheduler unchanged
+        problem = self.problem.copy()
+        schedule = dict(self.schedule)
+        outages = list(self.outages)
+        try:
+            seeds, timelines = delta.apply(problem, schedule, outages)
+            problem.validate()
+        except (IndexError, KeyError, TypeError) as e:
+            raise ValueError(f"Delta does not match the schedule: {e}") from None
+        # Raises on a precedence cycle; the order doubles as the warm start for re-placement
+        order = topological_order(problem.num_jobs, problem.precedence_constraints,
+                                  lambda job: (schedule[job][0] if job in schedule else problem.temporal_constraints.get(job, 0), job))
+
+        affected = self.affected_jobs(problem, schedule, seeds, timelines)
+        frozen = {job: entry for job, entry in schedule.items() if job not in affected}
+        sequence = [job for job in order if job in affected]
+        state = ScheduleState(problem.job_durations, problem.num_resources, problem.precedence_constraints, problem.resource_constraints, problem.machine_capacities, problem.temporal_constraints)
+        for resource, start, end in outages:
+            state.block(resource, start, end)
+        for job, (start, _, resource) in frozen.items():
+            state.place(job, start, resource)
+        best_schedule = self.place_sequence(state, problem, sequence, schedule)
+        if sequence and best_schedule is None:
+            raise ValueError("No valid placement for the affected jobs")
+
+        if iterations and len(sequence) > 1:
+            best_key = self.score(best_schedule)
+            predecessors = {(before, after) for before, after in problem.precedence_constraints}
+            rng = random.Random(seed)
+            for _ in range(iterations):
+                i = rng.randrange(len(sequence) - 1)
+                if (sequence[i], sequence[i + 1]) in predecessors:
+                    continue
+                sequence[i], sequence[i + 1] = sequence[i + 1], sequence[i]
+                candidate = self.place_sequence(state, problem, sequence, schedule)
+                key = self.score(candidate) if candidate is not None else None
+                if key is not None and key <= best_key:
+                    best_schedule, best_key = candidate, key
+                else:
+                    sequence[i], sequence[i + 1] = sequence[i + 1], sequence[i]
+
+        self.problem = problem
+        self.outages = outages
+        self.affected = affected
+        self.moved = {job for job in affected if schedule.get(job) != best_schedule[job]}
+        self.schedule = best_schedule
+        return dict(best_schedule), self.makespan()
+
+    def affected_jobs(self, problem, schedule, seeds, timelines):
+        # Seeds plus everything after them on their machines, closed under precedence successors
+        timelines = dict(timelines)
+        for job in seeds:
+            if job in schedule:
+                start, _, resource = schedule[job]
+                timelines[resource] = min(start, timelines.get(resource, start))
+        affected = set(seeds)
+        for job, (start, end, resource) in schedule.items():
+            if resource in timelines and end > timelines[resource]:
+                affected.add(job)
+        successors = [[] for _ in range(problem.num_jobs)]
+        for before, after in problem.precedence_constraints:
+            successors[before].append(after)
+        stack = list(affected)
+        while stack:
+            for after in successors[stack.pop()]:
+                if after not in affected:
+                    affected.add(after)
+                    stack.append(after)
+        return affected
+
+    def place_sequence(self, state, problem, sequence, previous):
+        # Places the sequence on top of the frozen jobs, copies the result and takes the
+        # sequence off again, so the frozen state is built once per delta
+        placed = []
+        schedule = None
+        for job in sequence:
+            placement = self.earliest_placement(state, problem, job, previous.get(job))
+            if placement is None:
+                break
+            state.place(job, *placement)
+            placed.append(job)
+        else:
+            schedule = dict(state.schedule)
+        for job in placed:
+            state.remove(job)
+        return schedule
+
+    def earliest_placement(self, state, problem, job, previous):
+        # Earliest finish over the allowed machines; ties keep the job on its old machine
+        duration = problem.job_durations[job]
+        ready = state.min_start(job)
+        best = None
+        for resource in range(problem.num_resources):
+            if (job, resource) in state.forbidden:
+                continue
+            for start in state.candidate_starts(resource, ready):
+                if state.is_valid(job, start, resource):
+                    key = (start + duration, previous is None or previous[2] != resource, state.load[resource], resource)
+                    if best is None or key < best[0]:
+                        best = (key, start, resource)
+                    break
+        return None if best is None else (best[1], best[2])
+
+    def score(self, schedule):
+        return (max(end for _, end, _ in schedule.values()), sum(end for _, end, _ in schedule.values()))
+
+def repair(problem, schedule, delta, outages=(), iterations=0, seed=None):
+    # One-shot form: returns (new_problem, schedule, makespan)
+    scheduler = IncrementalScheduler(problem if isinstance(problem, Problem) else Problem.from_dict(problem), schedule, outages)
+    schedule, makespan = scheduler.apply(delta, iterations, seed)
+    return scheduler.problem, schedule, makespan
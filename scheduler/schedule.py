@@ -0,0 +1,153 @@
+from array import array
+
+# ----------------------------
+# Compact Schedule
+# ----------------------------
+
+class Schedule:
+    # Array-backed replacement for the {job: (start, end, resource)} dict. Starts and machines
+    # are int32 / int16 arrays indexed by job (start -1 = not placed); ends come from the durations.
+    # It reads like the dict (items, get, in, len, [job]) so solver code and plot_schedule
+    # work on either form.
+    # copy() is copy-on-write: both copies share the arrays until one of them is written.
+    # mark() / undo() roll placements back through an undo log instead of copying
+    __slots__ = ('durations', 'starts', 'resources', 'count', 'shared', 'log')
+
+    def __init__(self, durations, starts=None, resources=None, count=0):
+        # Shared, never copied: every schedule of one problem refers to the same durations
+        self.durations = durations
+        num_jobs = len(self.durations)
+        self.starts = starts if starts is not None else array('i', [-1]) * num_jobs
+        self.resources = resources if resources is not None else array('h', [-1]) * num_jobs
+        self.count = count
+        self.shared = False
+        self.log = None
+
+    @classmethod
+    def from_dict(cls, schedule, durations):
+        compact = cls(durations)
+        for job, (start, _, resource) in schedule.items():
+            compact.place(job, start, resource)
+        return compact
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def copy(self):
+        other = Schedule(self.durations, self.starts, self.resources, self.count)
+        other.shared = self.shared = True
+        return other
+
+    def own(self):
+        # First write after copy(): take private arrays
+        self.starts = array('i', self.starts)
+        self.resources = array('h', self.resources)
+        self.shared = False
+
+    # Mutation
+
+    def place(self, job, start, resource):
+        if self.shared:
+            self.own()
+        old = self.starts[job]
+        if self.log is not None:
+            self.log.append((job, old, self.resources[job]))
+        if old < 0:
+            self.count += 1
+        self.starts[job] = start
+        self.resources[job] = resource
+
+    def remove(self, job):
+        # Like del on the dict: removing a job that is not placed is a KeyError, not a no-op
+        if job not in self:
+            raise KeyError(job)
+        if self.shared:
+            self.own()
+        if self.log is not None:
+            self.log.append((job, self.starts[job], self.resources[job]))
+        self.starts[job] = -1
+        self.resources[job] = -1
+        self.count -= 1
+
+    def mark(self):
+        if self.log is None:
+            self.log = []
+        return len(self.log)
+
+    def undo(self, mark):
+        log = self.log
+        if self.shared:
+            self.own()
+        starts, resources = self.starts, self.resources
+        while len(log) > mark:
+            job, start, resource = log.pop()
+            if (starts[job] < 0) != (start < 0):
+                self.count += 1 if start >= 0 else -1
+            starts[job] = start
+            resources[job] = resource
+        if not log:
+            self.log = None
+
+    def __setitem__(self, job, entry):
+        start, end, resource = entry
+        if end != start + self.durations[job]:
+            raise ValueError(f"Job {job} lasts {self.durations[job]}, not {end - start}")
+        self.place(job, start, resource)
+
+    def pop(self, job):
+        entry = self[job]
+        self.remove(job)
+        return entry
+
+    # Reading
+
+    def __getitem__(self, job):
+        start = self.starts[job] if 0 <= job < len(self.starts) else -1
+        if start < 0:
+            raise KeyError(job)
+        return (start, start + self.durations[job], self.resources[job])
+
+    def get(self, job, default=None):
+        start = self.starts[job] if 0 <= job < len(self.starts) else -1
+        if start < 0:
+            return default
+        return (start, start + self.durations[job], self.resources[job])
+
+    def __contains__(self, job):
+        return 0 <= job < len(self.starts) and self.starts[job] >= 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (job for job, start in enumerate(self.starts) if start >= 0)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        durations, resources = self.durations, self.resources
+        return [(job, (start, start + durations[job], resources[job])) for job, start in enumerate(self.starts) if start >= 0]
+
+    def values(self):
+        return [entry for _, entry in self.items()]
+
+    def makespan(self):
+        return max((start + duration for start, duration in zip(self.starts, self.durations) if start >= 0), default=0)
+
+    def signature(self):
+        # Hashable contents, e.g. for counting distinct individuals
+        return (self.starts.tobytes(), self.resources.tobytes())
+
+    def __eq__(self, other):
+        if isinstance(other, Schedule):
+            return self.starts == other.starts and self.resources == other.resources and self.durations == other.durations
+        try:
+            return len(self) == len(other) and all(other.get(job) == entry for job, entry in self.items())
+        except AttributeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Schedule({self.to_dict()!r})"
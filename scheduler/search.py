@@ -0,0 +1,430 @@
+from .budget import SolveBudget
+from .dispatching import best_dispatch
+from .instrumentation import timed_phase
+from .ordering import branching_order, job_tails, topological_order
+from .propagation import propagate
+from .schedule import Schedule
+from .state import ScheduleState
+from .transposition import TranspositionTable
+
+# ----------------------------
+# Backtracking Algorithm
+# ----------------------------
+
+# Units of work (jobs visited by a bound or a child scan, validity checks) between two reads of
+# the clock and the cancel flag. Counting nodes instead would let one check slip by seconds on
+# big instances, where a single node scans every eligible job on every machine
+CLOCK_WORK = 10000
+
+def backtracking(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, bound=False, node_limit=None, time_limit=None, order='topological', cancel=None, callback=None, stats=None, dispatch=True, initial=None):
+    if bound:
+        # Branch-and-bound mode: prune against the incumbent makespan
+        best_schedule, best_makespan, _ = branch_and_bound(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, node_limit, time_limit, order, cancel, callback, stats, dispatch=dispatch, initial=initial)
+        return best_schedule, best_makespan
+
+    # Stops at the node / time budget or on cancellation with the best schedule found so far
+    budget = SolveBudget(time_limit, node_limit, cancel, callback)
+    nodes = 0
+    work = 0
+    next_check = 0
+    stopped = False
+    
+    # Propagated domains: allowed machines per job and a latest start that every optimal
+    # schedule respects; raises InfeasibleError before any search when no schedule exists
+    domains = propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    max_start = domains.latest_start
+    allowed = [set(machines) for machines in domains.allowed]
+
+    # Initial incumbent from the dispatching rules (and the propagation's list schedule) or a
+    # given schedule: a branch that cannot finish before it is cut, and the answer is never worse
+    best_schedule, best_makespan = initial_incumbent(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, domains, dispatch, initial)
+    if best_schedule is not None:
+        budget.improved(best_schedule, best_makespan, 0)
+
+    # Predecessors are placed before their successors so min_start sees all of them
+    jobs = branching_order(job_durations, num_resources, precedence_constraints, resource_constraints, order)
+    state = ScheduleState(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+    state.stats = stats
+
+    def out_of_budget():
+        nonlocal next_check
+        due = work >= next_check
+        if due:
+            next_check = work + CLOCK_WORK
+        return budget.exhausted(nodes, due)
+
+    def placements(job):
+        # (start, resource) candidates of a job, read lazily so that every machine sees the
+        # state as it is when its turn comes and the cut uses the current incumbent
+        # Sort resources by current load
+        resources = list(range(num_resources)) if not auto_split else sorted(
+            range(num_resources), 
+            key=lambda r: state.load[r]
+        )
+        
+        # Calculate minimum start time
+        min_start = state.min_start(job)
+        
+        for resource in resources:
+            if resource not in allowed[job]:
+                continue
+            # Try the earliest possible time, then the end of every job already on this resource
+            for start in state.candidate_starts(resource, min_start):
+                if start > max_start[job] or start + job_durations[job] >= best_makespan:
+                    break
+                yield start, resource
+
+    def enter(depth):
+        # Visits the node with the first `depth` jobs placed: the placements of the next job, or
+        # None at a leaf or when the budget is used up
+        nonlocal best_schedule, best_makespan, nodes, work, stopped
+        schedule = state.schedule
+        nodes += 1
+        work += 1
+        if stats is not None:
+            stats.count('nodes')
+            stats.maximum('max_depth', len(schedule))
+        if out_of_budget():
+            stopped = True
+            return None
+        if depth == len(jobs):
+            current_makespan = schedule.makespan() if len(schedule) else float('inf')
+            if current_makespan < best_makespan:
+                best_makespan = current_makespan
+                # Copy-on-write: the search keeps writing to its own arrays, the copy keeps these
+                best_schedule = schedule.copy()
+                budget.improved(best_schedule, best_makespan, nodes)
+            if stats is not None:
+                stats.count('leaves')
+            return None
+        return placements(jobs[depth])
+
+    def search():
+        # Depth-first over an explicit stack of placement iterators, one per job on the current
+        # path, so the depth is not limited by the recursion limit (one level per job)
+        nonlocal work, stopped
+        frame = enter(0)
+        stack = [] if frame is None else [frame]
+        while stack:
+            depth = len(stack) - 1
+            job = jobs[depth]
+            for start, resource in stack[-1]:
+                work += 1
+                if out_of_budget():
+                    stopped = True
+                    return
+                if state.is_valid(job, start, resource):
+                    state.place(job, start, resource)
+                    frame = enter(depth + 1)
+                    if frame is not None:
+                        stack.append(frame)
+                        break
+                    state.remove(job)
+                    if stopped:
+                        return
+            else:
+                # Every placement of this job is tried: back up and move the parent job on
+                stack.pop()
+                if stack:
+                    state.remove(jobs[depth - 1])
+
+    with timed_phase(stats, 'search'):
+        search()
+    if best_schedule is not None:
+        best_schedule = best_schedule.to_dict()
+    else:
+        # Every schedule the fixed job order reaches is longer than the propagation's list
+        # schedule (or the budget ran out first), so that schedule is the best answer
+        best_schedule, best_makespan = dict(domains.schedule), domains.horizon
+        budget.improved(best_schedule, best_makespan, nodes)
+    return best_schedule, best_makespan
+
+def initial_incumbent(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints, domains, dispatch=True, initial=None):
+    # Shortest of the best dispatching rule schedule, the propagation's list schedule (both only
+    # with dispatch) and `initial`, a complete valid schedule e.g. from a cache, as a Schedule.
+    # (None, inf) when there is none
+    candidates = []
+    if dispatch:
+        candidates.append(best_dispatch(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints))
+        candidates.append((domains.schedule, domains.horizon))
+    if initial is not None:
+        candidates.append((initial, max((end for _, end, _ in initial.values()), default=0)))
+    if not candidates:
+        return None, float('inf')
+    schedule, makespan = min(candidates, key=lambda candidate: candidate[1])
+    return Schedule.from_dict(dict(schedule.items()), job_durations), makespan
+
+# ----------------------------
+# Branch and Bound
+# ----------------------------
+
+class BranchAndBound:
+    def __init__(self, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, node_limit=None, time_limit=None, order='longest_tail', cancel=None, callback=None, stats=None, table_size=None, table_policy='lru', dispatch=True, initial=None):
+        self.job_durations = job_durations
+        self.problem = (job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+        self.dispatch = dispatch
+        self.initial = initial
+        self.num_resources = num_resources
+        self.auto_split = auto_split
+        self.temporal_constraints = temporal_constraints
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.cancel = cancel
+        self.callback = callback
+        self.stats = stats
+        self.state = ScheduleState(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+        self.state.stats = stats
+        self.total_capacity = sum(machine_capacities)
+        num_jobs = len(job_durations)
+
+        # The branching order only ranks the children of a node; any eligible job may come next
+        self.rank = [0] * num_jobs
+        for position, job in enumerate(branching_order(job_durations, num_resources, precedence_constraints, resource_constraints, order)):
+            self.rank[job] = position
+        self.topo = topological_order(num_jobs, precedence_constraints)
+        self.tail = job_tails(job_durations, precedence_constraints, self.topo)
+
+        # An optimal schedule starts every job by its latest start and only on allowed machines
+        self.domains = propagate(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints)
+        self.latest_start = self.domains.latest_start
+        self.allowed = [set(machines) for machines in self.domains.allowed]
+
+        # Idle machines with the same capacity and the same forbidden jobs are interchangeable
+        self.machine_signature = [
+            (machine_capacities[r], frozenset(job for job, r2 in self.state.forbidden if r2 == r))
+            for r in range(num_resources)
+        ]
+
+        # Unconstrained jobs with equal durations are interchangeable: place them in index order
+        self.twin = {}
+        last_of_kind = {}
+        for job in range(num_jobs):
+            if self.state.predecessors[job] or self.state.successors[job]:
+                continue
+            kind = (job_durations[job], temporal_constraints.get(job, 0), frozenset(r for j, r in self.state.forbidden if j == job))
+            if kind in last_of_kind:
+                self.twin[job] = last_of_kind[kind]
+            last_of_kind[kind] = job
+
+        self.unplaced_predecessors = [len(self.state.predecessors[job]) for job in range(num_jobs)]
+        # Optional memo of fully searched states, so a state reached again in another order is skipped
+        self.table = TranspositionTable(table_size, table_policy) if table_size else None
+        self.placed_mask = 0
+        self.best_schedule = None
+        self.best_makespan = float('inf')
+        self.nodes = 0
+        self.work = 0
+        self.next_check = 0
+        self.stopped = False
+
+    def lower_bound(self, makespan, last_start):
+        self.work += len(self.topo)
+        state = self.state
+        starts = state.schedule.starts
+        durations = self.job_durations
+        head = {}
+        critical_path = makespan
+        earliest = None
+        remaining_work = 0
+        for job in self.topo:
+            if starts[job] >= 0:
+                continue
+            # Jobs are placed in order of start time, so nothing left starts before last_start
+            h = max(self.temporal_constraints.get(job, 0), last_start)
+            for before in state.predecessors[job]:
+                ready = (starts[before] if starts[before] >= 0 else head[before]) + durations[before]
+                if ready > h:
+                    h = ready
+            head[job] = h
+            if h + self.tail[job] > critical_path:
+                critical_path = h + self.tail[job]
+            if earliest is None or h < earliest:
+                earliest = h
+            remaining_work += durations[job]
+        if earliest is None:
+            return critical_path
+
+        # Remaining work plus the work already committed after `earliest` must fit in the capacity left
+        committed = sum(s + d - max(s, earliest) for s, d in zip(starts, durations) if s >= 0 and s + d > earliest)
+        load_bound = earliest + -(-(remaining_work + committed) // self.total_capacity)
+        return max(critical_path, load_bound)
+
+    def earliest_start(self, job, resource, min_start):
+        for start in self.state.candidate_starts(resource, min_start):
+            if start > self.latest_start[job]:
+                return None
+            self.work += 1
+            if self.state.is_valid(job, start, resource):
+                return start
+        return None
+
+    def children(self, last):
+        # Serial schedule generation: every eligible job goes to the earliest valid start on
+        # each machine. Starts never decrease along a branch (ties broken by job index), which
+        # still reaches every active schedule once
+        state = self.state
+        resources = range(self.num_resources) if not self.auto_split else sorted(
+            range(self.num_resources),
+            key=lambda r: state.load[r]
+        )
+        children = []
+        starts = state.schedule.starts
+        self.work += len(starts)
+        for job in range(len(self.job_durations)):
+            if starts[job] >= 0 or self.unplaced_predecessors[job]:
+                continue
+            twin = self.twin.get(job)
+            if twin is not None and starts[twin] < 0:
+                continue
+            min_start = max(state.min_start(job), last[0])
+            idle_seen = set()
+            for resource in resources:
+                if resource not in self.allowed[job]:
+                    continue
+                if state.load[resource] == 0:
+                    if self.machine_signature[resource] in idle_seen:
+                        continue
+                    idle_seen.add(self.machine_signature[resource])
+                start = self.earliest_start(job, resource, min_start)
+                if start is not None and (start, job) > last:
+                    children.append((start, self.rank[job], job, resource))
+        # Earliest starts first, then the branching heuristic, so good incumbents are found early
+        children.sort()
+        return [(job, start, resource) for start, _, job, resource in children]
+
+    def place(self, job, start, resource):
+        self.state.place(job, start, resource)
+        self.placed_mask |= 1 << job
+        for after in self.state.successors[job]:
+            self.unplaced_predecessors[after] -= 1
+
+    def remove(self, job):
+        self.state.remove(job)
+        self.placed_mask &= ~(1 << job)
+        for after in self.state.successors[job]:
+            self.unplaced_predecessors[after] += 1
+
+    def state_key(self, last):
+        # Everything the subtree below a node depends on. Later starts are >= last[0], so an
+        # interval ending by then can never overlap a later job and one starting earlier
+        # behaves as if it started at last[0]; the same holds for predecessor end times
+        last_start = last[0]
+        schedule = self.state.schedule
+        timelines = [[] for _ in range(self.num_resources)]
+        ready = []
+        for job, (start, end, resource) in schedule.items():
+            if end > last_start:
+                timelines[resource].append((max(start, last_start), end))
+                if self.state.successors[job] and any(after not in schedule for after in self.state.successors[job]):
+                    ready.append((job, end))
+        return (self.placed_mask, last, tuple(tuple(sorted(intervals)) for intervals in timelines), tuple(sorted(ready)))
+
+    def initial_incumbent(self):
+        return initial_incumbent(*self.problem, self.domains, self.dispatch, self.initial)
+
+    def pruned(self, bound):
+        return bound >= self.best_makespan
+
+    def record(self, makespan):
+        self.best_makespan = makespan
+        self.best_schedule = self.state.schedule.copy()
+        self.budget.improved(self.best_schedule, makespan, self.nodes)
+
+    def out_of_budget(self):
+        # The clock is read once per CLOCK_WORK units of work, however few nodes that took
+        due = self.work >= self.next_check
+        if due:
+            self.next_check = self.work + CLOCK_WORK
+        return self.budget.exhausted(self.nodes, due)
+
+    def visit(self, makespan):
+        # Counts the node of the current state; True when its children are to be searched
+        # (neither a leaf nor out of budget)
+        self.nodes += 1
+        stats = self.stats
+        if stats is not None:
+            stats.count('nodes')
+            stats.maximum('max_depth', len(self.state.schedule))
+        if self.out_of_budget():
+            self.stopped = True
+            return False
+        if len(self.state.schedule) == len(self.job_durations):
+            if makespan < self.best_makespan:
+                self.record(makespan)
+            return False
+        return True
+
+    def search(self, last, makespan):
+        # Depth-first over an explicit stack, so the depth (one level per job) is not limited
+        # by the recursion limit. A frame holds a node's remaining children, its makespan and
+        # the placement that led to it with its table key, undone when the frame is left
+        if self.stopped or not self.visit(makespan):
+            return
+        stats = self.stats
+        table = self.table
+        stack = [(iter(self.children(last)), makespan, None, None)]
+        while stack and not self.stopped:
+            children, makespan, _, _ = stack[-1]
+            for job, start, resource in children:
+                # Every child costs a lower bound, so the budget is checked between children too
+                if self.out_of_budget():
+                    self.stopped = True
+                    break
+                self.place(job, start, resource)
+                new_makespan = max(makespan, start + self.job_durations[job])
+                if not self.pruned(self.lower_bound(new_makespan, start)):
+                    key = None
+                    if table is not None and len(self.state.schedule) < len(self.job_durations):
+                        key = self.state_key((start, job))
+                        known = table.get(key)
+                        if known is not None and self.pruned(known):
+                            if stats is not None:
+                                stats.count('table_hits')
+                            self.remove(job)
+                            continue
+                    if stats is not None:
+                        stats.count('expanded')
+                    if self.visit(new_makespan):
+                        stack.append((iter(self.children((start, job))), new_makespan, job, key))
+                        break
+                elif stats is not None:
+                    stats.count('pruned')
+                self.remove(job)
+                if self.stopped:
+                    break
+            else:
+                _, _, job, key = stack.pop()
+                if job is not None:
+                    if key is not None:
+                        # Nothing below beats the incumbent left after searching it
+                        table.store(key, self.best_makespan, len(self.state.schedule))
+                    self.remove(job)
+        # Stopped: undo the placements still on the path
+        for _, _, job, _ in reversed(stack):
+            if job is not None:
+                self.remove(job)
+
+    def solve(self):
+        self.budget = SolveBudget(self.time_limit, self.node_limit, self.cancel, self.callback)
+        root_bound = self.lower_bound(0, 0)
+        # Start from the dispatching rules' (or the given) incumbent: only strictly better schedules are searched for
+        self.best_schedule, self.best_makespan = self.initial_incumbent()
+        if self.best_schedule is not None:
+            self.budget.improved(self.best_schedule, self.best_makespan, 0)
+        with timed_phase(self.stats, 'search'):
+            self.search((-1, -1), 0)
+        if self.best_schedule is None and self.stopped:
+            # Out of budget before the first leaf: the propagation's list schedule is still valid
+            self.best_schedule = self.domains.schedule.copy()
+            self.best_makespan = self.domains.horizon
+            self.budget.improved(self.best_schedule, self.best_makespan, self.nodes)
+        lower_bound = root_bound if self.stopped else self.best_makespan
+        best_schedule = self.best_schedule.to_dict() if self.best_schedule is not None else None
+        return best_schedule, self.best_makespan, lower_bound
+
+def branch_and_bound(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, node_limit=None, time_limit=None, order='longest_tail', cancel=None, callback=None, stats=None, table_size=None, table_policy='lru', dispatch=True, initial=None):
+    # Returns the best schedule, its makespan and a proven lower bound on the optimal makespan.
+    # table_size > 0 enables a transposition table of at most that many states; dispatch=False
+    # starts without the dispatching rules' incumbent, initial adds a known schedule as one
+    solver = BranchAndBound(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, node_limit, time_limit, order, cancel, callback, stats, table_size, table_policy, dispatch, initial)
+    return solver.solve()
@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .api import METHODS, result_to_dict, solve
+from .problem import InfeasibleError, Problem
+
+# ----------------------------
+# Batch Requests
+# ----------------------------
+
+# One request per JSON line: either a bare problem (see Problem.to_dict) or
+# {"id": ..., "problem": {...}, "method": ..., "options": {...}}. Service-wide options such as
+# the time limit reach a line's method only if it takes them (api.solve drops the rest).
+# Lines are shipped to workers unparsed so the parent only pays for reading them
+
+def solve_line(index, line, method, options):
+    # Runs in a worker; every failure becomes an error result so one bad line never stops the stream
+    started = time.perf_counter()
+    request_id = index
+    try:
+        request = json.loads(line)
+        if 'problem' in request:
+            request_id = request.get('id', index)
+            method = request.get('method', method)
+            options = {**options, **request.get('options', {})}
+            request = request['problem']
+        schedule, makespan = solve(Problem.from_dict(request), method, options)
+        result = result_to_dict(schedule, makespan)
+    except InfeasibleError as e:
+        result = {'makespan': None, 'schedule': None, 'error': f"InfeasibleError: {e}", 'certificate': e.certificate}
+    except Exception as e:
+        # Malformed requests and solver failures alike (RecursionError, MemoryError from a
+        # huge instance, ...) would otherwise escape through future.result() and end the batch
+        result = {'makespan': None, 'schedule': None, 'error': f"{type(e).__name__}: {e}"}
+    result['id'] = request_id
+    result['solve_time'] = time.perf_counter() - started
+    return result
+
+def read_lines(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+def solve_stream(lines, method='branch_and_bound', options=None, workers=None, max_in_flight=None, ordered=True, pool=None):
+    # Yields one result per input line. At most max_in_flight lines are read ahead of the
+    # results, so memory stays flat however long the input is. ordered=False yields results
+    # as they complete. latency counts from submission, so it includes time spent queued
+    options = options or {}
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * workers
+    if pool is None and workers <= 1:
+        for index, line in enumerate(lines):
+            submitted = time.perf_counter()
+            result = solve_line(index, line, method, options)
+            result['latency'] = time.perf_counter() - submitted
+            yield result
+        return
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    pending = deque() if ordered else set()
+    submitted = {}
+
+    def finish(future):
+        result = future.result()
+        result['latency'] = time.perf_counter() - submitted.pop(future)
+        return result
+
+    try:
+        for index, line in enumerate(lines):
+            while len(pending) >= max_in_flight:
+                if ordered:
+                    yield finish(pending.popleft())
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield finish(future)
+            future = pool.submit(solve_line, index, line, method, options)
+            submitted[future] = time.perf_counter()
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+        while pending:
+            if ordered:
+                yield finish(pending.popleft())
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield finish(future)
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
+# ----------------------------
+# Throughput Report
+# ----------------------------
+
+class BatchReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.latencies = []
+        self.solve_times = []
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def add(self, result):
+        with self.lock:
+            self.latencies.append(result['latency'])
+            self.solve_times.append(result['solve_time'])
+            if 'error' in result:
+                self.errors += 1
+
+    def to_dict(self):
+        with self.lock:
+            elapsed = time.perf_counter() - self.started
+            latencies = sorted(self.latencies)
+            count = len(latencies)
+            report = {'instances': count, 'errors': self.errors, 'elapsed': elapsed,
+                      'throughput': count / elapsed if elapsed > 0 else None}
+            if count:
+                report['latency_p50'] = latencies[count // 2]
+                report['latency_p95'] = latencies[min(count - 1, int(count * 0.95))]
+                report['latency_max'] = latencies[-1]
+                report['solve_time_mean'] = statistics.fmean(self.solve_times)
+            return report
+
+# ----------------------------
+# HTTP Front End
+# ----------------------------
+
+class SolveHandler(BaseHTTPRequestHandler):
+    # POST /solve takes one request object or a JSON Lines body and answers in kind;
+    # GET /stats returns the running throughput report. The pool lives on the server,
+    # so worker processes (and their imports) stay warm between requests
+    def do_POST(self):
+        if self.path != '/solve':
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+        lines = list(read_lines(body.splitlines()))
+        server = self.server
+        results = list(solve_stream(lines, server.method, server.options, server.workers, ordered=True, pool=server.pool))
+        for result in results:
+            server.report.add(result)
+        if len(lines) == 1:
+            self.reply(200, json.dumps(results[0]), 'application/json')
+        else:
+            self.reply(200, ''.join(json.dumps(result) + '\n' for result in results), 'application/x-ndjson')
+
+    def do_GET(self):
+        if self.path != '/stats':
+            self.send_error(404)
+            return
+        self.reply(200, json.dumps(self.server.report.to_dict()), 'application/json')
+
+    def reply(self, status, text, content_type):
+        data = text.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host='127.0.0.1', port=8080, method='branch_and_bound', options=None, workers=None):
+    server = ThreadingHTTPServer((host, port), SolveHandler)
+    server.method = method
+    server.options = options or {}
+    server.workers = workers or os.cpu_count() or 1
+    server.pool = ProcessPoolExecutor(max_workers=server.workers)
+    server.report = BatchReport()
+    return server
+
+# ----------------------------
+# Command Line
+# ----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many scheduling problems from a JSON Lines stream")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command in ('batch', 'serve'):
+        sub = commands.add_parser(command)
+        sub.add_argument('--method', default='branch_and_bound', choices=list(METHODS))
+        sub.add_argument('--time-limit', type=float, help="per-instance time limit in seconds, for the methods that take one")
+        sub.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    batch = commands.choices['batch']
+    batch.add_argument('--input', default='-', help="JSON Lines file, '-' for stdin")
+    batch.add_argument('--output', default='-', help="JSON Lines file, '-' for stdout")
+    batch.add_argument('--max-in-flight', type=int, help="instances submitted ahead of the output (default: 4 per worker)")
+    batch.add_argument('--unordered', action='store_true', help="write results as they complete instead of in input order")
+    serve = commands.choices['serve']
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+
+    args = parser.parse_args(argv)
+    options = {} if args.time_limit is None else {'time_limit': args.time_limit}
+    if args.command == 'serve':
+        server = make_server(args.host, args.port, args.method, options, args.workers)
+        print(f"Serving on http://{args.host}:{server.server_address[1]}/solve", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            server.pool.shutdown()
+        return 0
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w')
+    report = BatchReport()
+    try:
+        for result in solve_stream(read_lines(source), args.method, options, args.workers, args.max_in_flight, not args.unordered):
+            report.add(result)
+            sink.write(json.dumps(result) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(json.dumps(report.to_dict()), file=sys.stderr)
+    return 1 if report.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+from bisect import bisect_left, bisect_right, insort
+
+from .schedule import Schedule
+
+# ----------------------------
+# Validity Check
+# ----------------------------
+
+def is_valid(schedule, job, start, resource, job_durations, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints):
+    end = start + job_durations[job]
+
+    if job in temporal_constraints:
+        if start < temporal_constraints[job]:
+            return False
+
+    if (job, resource) in resource_constraints:
+        return False
+
+    jobs_on_machine = [(s, e) for j, (s, e, r) in schedule.items() if r == resource and j != job]
+    overlapping_jobs = sum(1 for s, e in jobs_on_machine if not (end <= s or start >= e))
+    if overlapping_jobs >= machine_capacities[resource]:
+        return False
+
+    for before, after in precedence_constraints:
+        if after == job and before in schedule:
+            if start < schedule[before][1]:
+                return False
+        elif before == job and after in schedule:
+            if end > schedule[after][0]:
+                return False
+
+    return True
+
+# ----------------------------
+# Schedule State (indexed timelines)
+# ----------------------------
+
+class ScheduleState:
+    def __init__(self, job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, temporal_constraints):
+        self.job_durations = job_durations
+        self.machine_capacities = machine_capacities
+        self.temporal_constraints = temporal_constraints
+        self.forbidden = set(resource_constraints)
+        # Predecessor / successor adjacency built once from the constraint list
+        self.predecessors = {job: [] for job in range(len(job_durations))}
+        self.successors = {job: [] for job in range(len(job_durations))}
+        for before, after in precedence_constraints:
+            self.predecessors[after].append(before)
+            self.successors[before].append(after)
+        # Sorted start and end times of the jobs placed on each machine
+        self.starts = [[] for _ in range(num_resources)]
+        self.ends = [[] for _ in range(num_resources)]
+        self.load = [0] * num_resources
+        self.schedule = Schedule(job_durations)
+        # Optional SolverStats counting checks and the constraint that rejected a placement
+        self.stats = None
+
+    def place(self, job, start, resource):
+        end = start + self.job_durations[job]
+        self.schedule.place(job, start, resource)
+        insort(self.starts[resource], start)
+        insort(self.ends[resource], end)
+        self.load[resource] += end - start
+
+    def remove(self, job):
+        start, end, resource = self.schedule.pop(job)
+        starts, ends = self.starts[resource], self.ends[resource]
+        del starts[bisect_left(starts, start)]
+        del ends[bisect_left(ends, end)]
+        self.load[resource] -= end - start
+
+    def block(self, resource, start, end):
+        # Machine outage: phantom intervals that use up the machine's whole capacity
+        for _ in range(self.machine_capacities[resource]):
+            insort(self.starts[resource], start)
+            insort(self.ends[resource], end)
+
+    def overlapping(self, start, end, resource):
+        # Jobs with s < end and e > start; every job with e <= start also has s < end
+        return bisect_left(self.starts[resource], end) - bisect_right(self.ends[resource], start)
+
+    def min_start(self, job):
+        ready = self.temporal_constraints.get(job, 0)
+        starts = self.schedule.starts
+        durations = self.job_durations
+        for dep in self.predecessors[job]:
+            if starts[dep] >= 0 and starts[dep] + durations[dep] > ready:
+                ready = starts[dep] + durations[dep]
+        return ready
+
+    def candidate_starts(self, resource, min_start):
+        # Earliest start first, then every end time on the machine from min_start onwards
+        ends = self.ends[resource]
+        return [min_start] + ends[bisect_left(ends, min_start):]
+
+    def is_valid(self, job, start, resource):
+        reason = self.rejection(job, start, resource)
+        if self.stats is not None:
+            self.stats.count('validity_checks')
+            if reason is not None:
+                self.stats.count('rejected_' + reason)
+        return reason is None
+
+    def rejection(self, job, start, resource):
+        # Name of the constraint a placement breaks, or None when it is valid
+        end = start + self.job_durations[job]
+
+        if start < self.temporal_constraints.get(job, 0):
+            return 'temporal'
+
+        if (job, resource) in self.forbidden:
+            return 'resource'
+
+        starts = self.schedule.starts
+        durations = self.job_durations
+        overlapping_jobs = self.overlapping(start, end, resource)
+        placed = starts[job]
+        if placed >= 0 and self.schedule.resources[job] == resource and placed < end and placed + durations[job] > start:
+            overlapping_jobs -= 1
+        if overlapping_jobs >= self.machine_capacities[resource]:
+            return 'capacity'
+
+        for before in self.predecessors[job]:
+            if starts[before] >= 0 and start < starts[before] + durations[before]:
+                return 'precedence'
+        for after in self.successors[job]:
+            if starts[after] >= 0 and end > starts[after]:
+                return 'precedence'
+
+        return None
@@ -0,0 +1,67 @@
+import heapq
+from collections import OrderedDict
+
+# ----------------------------
+# Transposition Table
+# ----------------------------
+
+TABLE_POLICIES = ('lru', 'depth')
+
+class TranspositionTable:
+    # Bounded map from a canonical search state to the best completion bound found below it.
+    # 'lru' evicts the least recently used entry; 'depth' keeps the shallowest states (the
+    # largest subtrees) and evicts the deepest one first
+    def __init__(self, max_entries=100000, policy='lru'):
+        if policy not in TABLE_POLICIES:
+            raise ValueError(f"Unknown table policy '{policy}'. Choose one of: {', '.join(TABLE_POLICIES)}")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.policy = policy
+        self.entries = OrderedDict() if policy == 'lru' else {}
+        self.deepest = []
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if self.policy == 'lru':
+            self.entries.move_to_end(key)
+            return entry
+        return entry[0]
+
+    def store(self, key, value, depth):
+        if self.policy == 'lru':
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            elif len(self.entries) >= self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            self.entries[key] = value
+            self.stores += 1
+            return
+
+        if key not in self.entries and len(self.entries) >= self.max_entries:
+            # Heap entries go stale when a key is stored again; skip those
+            while self.deepest and self.entries.get(self.deepest[0][2], (None, None, None))[2] != self.deepest[0][1]:
+                heapq.heappop(self.deepest)
+            if -self.deepest[0][0] <= depth:
+                return
+            _, _, evicted = heapq.heappop(self.deepest)
+            del self.entries[evicted]
+            self.evictions += 1
+        self.stores += 1
+        self.entries[key] = (value, depth, self.stores)
+        heapq.heappush(self.deepest, (-depth, self.stores, key))
+        if len(self.deepest) > 2 * self.max_entries:
+            self.deepest = [(-depth, seq, key) for key, (_, depth, seq) in self.entries.items()]
+            heapq.heapify(self.deepest)
+
+    def clear(self):
+        self.entries.clear()
+        self.deepest = []
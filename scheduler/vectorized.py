@@ -0,0 +1,115 @@
+import numpy as np
+
+from .ordering import topological_order
+from .problem import InfeasibleError
+
+# ----------------------------
+# Vectorized Genetic Algorithm
+# ----------------------------
+
+def decode_population(keys, machines, durations, release, pred_mask, indegree, capacities, allowed, auto_split):
+    # Serial schedule builder run for the whole population at once: at every step each
+    # individual places its eligible job with the smallest key on the earliest free slot
+    # of a machine (a machine with capacity c has c slots)
+    population_size, num_jobs = keys.shape
+    rows = np.arange(population_size)
+    slot_machine = np.repeat(np.arange(len(capacities)), np.minimum(capacities, num_jobs))
+    slot_allowed = allowed[:, slot_machine]
+    slot_free = np.zeros((population_size, len(slot_machine)), dtype=np.int64)
+    starts = np.zeros((population_size, num_jobs), dtype=np.int64)
+    ends = np.zeros((population_size, num_jobs), dtype=np.int64)
+    used = np.zeros((population_size, num_jobs), dtype=np.int64)
+    waiting = np.repeat(indegree[None, :], population_size, axis=0)
+    placed = np.zeros((population_size, num_jobs), dtype=bool)
+
+    for _ in range(num_jobs):
+        job = np.argmin(np.where((waiting == 0) & ~placed, keys, np.inf), axis=1)
+        ready = np.maximum(release[job], np.max(np.where(pred_mask[:, job].T, ends, 0), axis=1))
+        if auto_split:
+            candidate = np.where(slot_allowed[job], np.maximum(ready[:, None], slot_free), np.iinfo(np.int64).max)
+        else:
+            candidate = np.where(slot_machine[None, :] == machines[rows, job][:, None], slot_free, np.iinfo(np.int64).max)
+        slot = np.argmin(candidate, axis=1)
+        start = np.maximum(ready, slot_free[rows, slot])
+        end = start + durations[job]
+        starts[rows, job] = start
+        ends[rows, job] = end
+        used[rows, job] = slot_machine[slot]
+        slot_free[rows, slot] = end
+        placed[rows, job] = True
+        waiting -= pred_mask[job].astype(np.int64)
+
+    return starts, used, ends.max(axis=1)
+
+def random_machines(rng, allowed):
+    # Uniform choice among the allowed machines of each row of the mask
+    return np.argmax(rng.random(allowed.shape) * allowed, axis=-1)
+
+def vectorized_genetic_algorithm(job_durations, num_resources, precedence_constraints, resource_constraints, machine_capacities, auto_split, temporal_constraints, population_size=1000, generations=200, mutation_rate=0.2, seed=None):
+    num_jobs = len(job_durations)
+    topological_order(num_jobs, precedence_constraints)
+    rng = np.random.default_rng(seed)
+
+    durations = np.asarray(job_durations, dtype=np.int64)
+    capacities = np.asarray(machine_capacities, dtype=np.int64)
+    release = np.array([temporal_constraints.get(job, 0) for job in range(num_jobs)], dtype=np.int64)
+    pred_mask = np.zeros((num_jobs, num_jobs), dtype=bool)
+    for before, after in precedence_constraints:
+        pred_mask[before, after] = True
+    indegree = pred_mask.sum(axis=0)
+    allowed = np.ones((num_jobs, num_resources), dtype=bool)
+    for job, resource in resource_constraints:
+        allowed[job, resource] = False
+    # decode_population gives a machine of capacity 0 no slot to run on
+    allowed[:, capacities == 0] = False
+    if not allowed.any(axis=1).all():
+        job = int(np.argmin(allowed.any(axis=1)))
+        raise InfeasibleError(f"Job {job+1} is forbidden on every machine", {'reason': 'no_machine', 'job': job})
+
+    def decode(keys, machines):
+        return decode_population(keys, machines, durations, release, pred_mask, indegree, capacities, allowed, auto_split)
+
+    keys = rng.random((population_size, num_jobs))
+    machines = random_machines(rng, np.broadcast_to(allowed, (population_size, num_jobs, num_resources)))
+    starts, used, scores = decode(keys, machines)
+
+    # Fitness is computed once per individual and carried along with it
+    best = int(np.argmin(scores))
+    best_starts, best_used, best_score = starts[best].copy(), used[best].copy(), int(scores[best])
+
+    num_elite = max(2, population_size // 2)
+    num_children = population_size - num_elite
+    for _ in range(generations):
+        elite = np.argsort(scores, kind='stable')[:num_elite]
+        keys, machines, starts, used, scores = keys[elite], machines[elite], starts[elite], used[elite], scores[elite]
+        if num_children <= 0:
+            break
+
+        p1 = rng.integers(num_elite, size=num_children)
+        p2 = rng.integers(num_elite, size=num_children)
+        mask = rng.random((num_children, num_jobs)) < 0.5
+        child_keys = np.where(mask, keys[p1], keys[p2])
+        child_machines = np.where(mask, machines[p1], machines[p2])
+
+        # Each mutated child gets one job with a new key and a new allowed machine
+        mutated = np.nonzero(rng.random(num_children) < mutation_rate)[0]
+        jobs = rng.integers(num_jobs, size=len(mutated))
+        child_keys[mutated, jobs] = rng.random(len(mutated))
+        child_machines[mutated, jobs] = random_machines(rng, allowed[jobs])
+
+        child_starts, child_used, child_scores = decode(child_keys, child_machines)
+        keys = np.concatenate([keys, child_keys])
+        machines = np.concatenate([machines, child_machines])
+        starts = np.concatenate([starts, child_starts])
+        used = np.concatenate([used, child_used])
+        scores = np.concatenate([scores, child_scores])
+
+        best = int(np.argmin(scores))
+        if scores[best] < best_score:
+            best_starts, best_used, best_score = starts[best].copy(), used[best].copy(), int(scores[best])
+
+    best_schedule = {
+        job: (int(best_starts[job]), int(best_starts[job]) + job_durations[job], int(best_used[job]))
+        for job in range(num_jobs)
+    }
+    return best_schedule, best_score